@@ -194,6 +194,8 @@ def init(site: str, sites_path: str = ".", new_site: bool = False, force=False)
 	if getattr(local, "initialised", None) and not force:
 		return
 
+	from frappe.monitor import Counters
+
 	local.error_log = []
 	local.message_log = []
 	local.debug_log = []
@@ -241,6 +243,7 @@ def init(site: str, sites_path: str = ".", new_site: bool = False, force=False)
 	local.jenv = None
 	local.jloader = None
 	local.cache = {}
+	local.counters = Counters()
 	local.form_dict = _dict()
 	local.preload_assets = {"style": [], "script": [], "icons": []}
 	local.session = _dict()
@@ -287,7 +290,9 @@ def connect(site: str | None = None, db_name: str | None = None, set_admin_as_us
 		set_user("Administrator")
 
 
-def connect_replica() -> bool:
+def connect_replica(host: str | None = None) -> bool:
+	import random
+
 	from frappe.database import get_db
 
 	if local and hasattr(local, "replica_db") and hasattr(local, "primary_db"):
@@ -301,14 +306,19 @@ def connect_replica() -> bool:
 		user = local.conf.replica_db_name
 		password = local.conf.replica_db_password
 
+	host = host or local.conf.replica_host
+	if isinstance(host, list):
+		host = random.choice(host)
+
 	local.replica_db = get_db(
 		socket=None,
-		host=local.conf.replica_host,
+		host=host,
 		port=port,
 		user=user,
 		password=password,
 		cur_db_name=local.conf.db_name,
 	)
+	local.replica_db.is_replica = True
 
 	# swap db connections
 	local.primary_db = local.db
@@ -881,20 +891,15 @@ def read_only():
 	def innfn(fn):
 		@functools.wraps(fn)
 		def wrapper_fn(*args, **kwargs):
-			# frappe.read_only could be called from nested functions, in such cases don't swap the
-			# connection again.
-			switched_connection = False
-			if conf.read_from_replica:
-				switched_connection = connect_replica()
+			if not conf.read_from_replica:
+				return fn(*args, **get_newargs(fn, kwargs))
 
-			try:
-				retval = fn(*args, **get_newargs(fn, kwargs))
-			finally:
-				if switched_connection and local and hasattr(local, "primary_db"):
-					local.db.close()
-					local.db = local.primary_db
+			from frappe.database.replica import route_reads
 
-			return retval
+			# frappe.read_only could be called from nested functions, route_reads doesn't swap the
+			# connection again in such cases.
+			with route_reads():
+				return fn(*args, **get_newargs(fn, kwargs))
 
 		return wrapper_fn
 
@@ -973,6 +978,7 @@ def clear_cache(user: str | None = None, doctype: str | None = None):
 	:param user: If user is given, only user cache is cleared.
 	:param doctype: If doctype is given, only DocType cache is cleared."""
 	import frappe.cache_manager
+	import frappe.permissions
 	import frappe.utils.caching
 	from frappe.website.router import clear_routing_cache
 
@@ -987,6 +993,7 @@ def clear_cache(user: str | None = None, doctype: str | None = None):
 		for key in frappe.get_hooks("persistent_cache_keys"):
 			keys_to_delete.difference_update(frappe.cache.get_keys(key))
 		frappe.cache.delete_value(list(keys_to_delete), make_keys=False)
+		frappe.permissions.bump_permission_version()
 
 		reset_metadata_version()
 		local.cache = {}
@@ -2008,6 +2015,8 @@ def get_list(doctype, *args, **kwargs):
 	:param order_by: Order By e.g. `modified desc`.
 	:param limit_start: Start results at record #. Default 0.
 	:param limit_page_length: No of records in the page. Default 20.
+	:param after: Page by sort key instead of `limit_start`, "" for the first page. Returns a `Page`
+	        whose `after` is the token of the next page, see `DatabaseQuery.execute`.
 
 	Example usage:
 
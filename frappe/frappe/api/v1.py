@@ -4,6 +4,7 @@ from werkzeug.routing import Rule
 
 import frappe
 from frappe import _
+from frappe.database import replica
 from frappe.utils import attach_expanded_links
 from frappe.utils.data import sbool
 
@@ -28,6 +29,10 @@ def document_list(doctype: str):
 			frappe.form_dict[param] = sbool(param_val)
 
 	# evaluate frappe.get_list
+	if replica.should_route("frappe.client.get_list"):
+		with replica.route_reads():
+			return frappe.call(frappe.client.get_list, doctype, **frappe.form_dict)
+
 	return frappe.call(frappe.client.get_list, doctype, **frappe.form_dict)
 
 
@@ -253,6 +253,9 @@ def process_response(response):
 	if trace_id := frappe.monitor.get_trace_id():
 		response.headers.extend({"X-Frappe-Request-Id": trace_id})
 
+	if counters := frappe.monitor.get_counters():
+		response.headers["Server-Timing"] = counters.server_timing()
+
 	# CORS headers
 	if hasattr(frappe.local, "conf"):
 		set_cors_headers(response)
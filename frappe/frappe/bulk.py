@@ -0,0 +1,125 @@
+# Copyright (c) 2025, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Insert or submit many documents with their controllers, but with batched writes.
+
+`frappe.bulk.insert` runs the same steps as `Document.insert` for every document,
+except that the rows of all parents and children in a chunk are written with one
+multi-row INSERT per table:
+
+1. `before_insert`, naming, `validate` and `before_save`/`before_submit` per document.
+   Naming series numbers are reserved once per series and chunk.
+2. One INSERT per table for all parents and child rows of the chunk.
+3. `after_insert`, `on_update`/`on_submit`, versions and notifications per document.
+
+Since a chunk is written only after all its documents are validated, validations
+that look up earlier documents in the database (duplicate checks, running
+balances) don't see the other documents of the same chunk. A duplicate name
+fails the whole chunk.
+
+>>> import frappe.bulk
+>>> frappe.bulk.insert({"doctype": "ToDo", "description": d} for d in descriptions)
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+
+import frappe
+from frappe import _
+from frappe.model.base_document import DOCTYPES_FOR_DOCTYPE
+from frappe.model.docstatus import DocStatus
+from frappe.model.document import Document
+from frappe.model.naming import reserve_series_numbers
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def insert(
+	docs: Iterable[Document | dict],
+	submit: bool = False,
+	ignore_permissions: bool | None = None,
+	ignore_links: bool | None = None,
+	ignore_mandatory: bool | None = None,
+	chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list[Document]:
+	"""Insert `docs` (documents or dicts) like `Document.insert`, writing each chunk of
+	`chunk_size` documents with one INSERT per table.
+
+	:param submit: Submit the documents, running `before_submit` and `on_submit` too.
+	:param ignore_permissions: Do not check permissions if True.
+	:param ignore_links: Do not check validity of links if True.
+	:param ignore_mandatory: Do not check missing mandatory fields if True.
+	"""
+	inserted = []
+	chunk = []
+
+	for doc in docs:
+		chunk.append(doc)
+		if len(chunk) >= chunk_size:
+			inserted.extend(_insert_chunk(chunk, submit, ignore_permissions, ignore_links, ignore_mandatory))
+			chunk = []
+
+	if chunk:
+		inserted.extend(_insert_chunk(chunk, submit, ignore_permissions, ignore_links, ignore_mandatory))
+
+	return inserted
+
+
+def submit(docs: Iterable[Document | dict], **kwargs) -> list[Document]:
+	"""Insert and submit `docs`, see `insert`."""
+	return insert(docs, submit=True, **kwargs)
+
+
+def _insert_chunk(docs, submit, ignore_permissions, ignore_links, ignore_mandatory):
+	docs = [frappe.get_doc(doc) if isinstance(doc, dict) else doc for doc in docs]
+
+	for doc in docs:
+		if doc.meta.issingle:
+			frappe.throw(_("{0} is a Single DocType and can't be inserted in bulk").format(_(doc.doctype)))
+
+		if submit:
+			if not doc.meta.is_submittable:
+				frappe.throw(_("{0} is not submittable").format(_(doc.doctype)))
+			doc.docstatus = DocStatus.SUBMITTED
+
+	with reserve_series_numbers(len(docs)):
+		for doc in docs:
+			doc._run_before_insert(
+				ignore_permissions=ignore_permissions,
+				ignore_links=ignore_links,
+				ignore_mandatory=ignore_mandatory,
+			)
+
+	_db_insert(docs)
+
+	for doc in docs:
+		doc._run_after_insert()
+
+	return docs
+
+
+def _db_insert(docs):
+	"""INSERT the parents and child rows of `docs` with one query per table."""
+	rows = defaultdict(list)
+	inserted = []
+
+	for doc in docs:
+		for d in (doc, *doc.get_all_children()):
+			if not d.creation:
+				d.creation = d.modified = doc.creation
+				d.owner = d.modified_by = doc.owner
+
+			values = d.get_valid_dict(
+				convert_dates_to_str=True,
+				ignore_nulls=d.doctype in DOCTYPES_FOR_DOCTYPE,
+				ignore_virtual=True,
+			)
+			rows[(d.doctype, tuple(values))].append(tuple(values.values()))
+			inserted.append(d)
+
+	for (doctype, columns), values in rows.items():
+		frappe.db.bulk_insert(doctype, columns, values)
+
+	# like `BaseDocument.db_insert`
+	for d in inserted:
+		d.set("__islocal", False)
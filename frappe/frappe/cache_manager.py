@@ -79,6 +79,7 @@ doctype_cache_keys = (
 
 def clear_user_cache(user=None):
 	from frappe.desk.notifications import clear_notifications
+	from frappe.permissions import clear_permission_version, clear_user_permission_version
 
 	# this will automatically reload the global cache
 	# so it is important to clear this first
@@ -89,11 +90,14 @@ def clear_user_cache(user=None):
 			frappe.cache.hdel(name, user)
 		frappe.cache.delete_keys("user:" + user)
 		clear_defaults_cache(user)
+		# roles may have changed
+		clear_user_permission_version(user)
 	else:
 		for name in user_cache_keys:
 			frappe.cache.delete_key(name)
 		clear_defaults_cache()
 		clear_global_cache()
+		clear_permission_version()
 
 
 def clear_domain_cache(user=None):
@@ -130,6 +134,8 @@ def clear_doctype_cache(doctype=None):
 
 def _clear_doctype_cache_from_redis(doctype: str | None = None):
 	from frappe.desk.notifications import delete_notification_count_for
+	from frappe.model.meta import bump_schema_version
+	from frappe.permissions import bump_permission_version
 
 	for key in ("is_table", "doctype_modules"):
 		frappe.cache.delete_value(key)
@@ -164,6 +170,11 @@ def _clear_doctype_cache_from_redis(doctype: str | None = None):
 			frappe.cache.delete_value(name)
 		frappe.cache.delete_keys("document_cache::")
 
+	# drop Meta objects other processes keep across requests
+	bump_schema_version()
+	# DocPerms, Custom DocPerms or link fields may have changed
+	bump_permission_version()
+
 
 def clear_controller_cache(doctype=None):
 	if not doctype:
@@ -38,6 +38,7 @@ def get_list(
 	as_dict: bool = True,
 	or_filters=None,
 	expand=None,
+	after=None,
 ):
 	"""Returns a list of records by filters, fields, ordering and limit
 
@@ -46,7 +47,9 @@ def get_list(
 	:param filters: filter list by this dict
 	:param order_by: Order by this fieldname
 	:param limit_start: Start at this index
-	:param limit_page_length: Number of records to be returned (default 20)"""
+	:param limit_page_length: Number of records to be returned (default 20)
+	:param after: Page by sort key instead of `limit_start`, empty for the first page, then the
+	        `after` of the previous response"""
 	if frappe.is_table(doctype):
 		check_parent_permission(parent, doctype)
 
@@ -62,11 +65,15 @@ def get_list(
 		limit_page_length=limit_page_length,
 		debug=debug,
 		as_list=not as_dict,
+		after=after,
 	)
 
 	validate_args(args)
 	_list = frappe.get_list(**args)
 
+	if after is not None:
+		frappe.response["after"] = _list.after
+
 	if not expand:
 		return _list
 
@@ -1221,6 +1221,46 @@ def stop_recording(context):
 		raise SiteNotSpecifiedError
 
 
+@click.command("recorder-report")
+@click.option(
+	"--threshold",
+	type=int,
+	help="Flag queries run more than this many times from one place (default 10)",
+)
+@click.option("--fail", is_flag=True, default=False, help="Exit with an error if N+1 queries were found")
+@pass_context
+def recorder_report(context, threshold=None, fail=False):
+	"""Show N+1 queries in requests and jobs captured by the recorder."""
+	import frappe.recorder
+
+	found = False
+	for site in context.sites:
+		frappe.init(site=site)
+		try:
+			report = frappe.recorder.get_n_plus_one_report(threshold or frappe.recorder.N_PLUS_ONE_THRESHOLD)
+		finally:
+			frappe.destroy()
+
+		for request in report:
+			found = True
+			click.secho(f"{site}: {request['path']} ({request['event_type']}, {request['uuid']})", bold=True)
+			for finding in request["n_plus_one"]:
+				click.echo(
+					f"  {finding['count']} queries in {finding['duration']} ms from "
+					f"{finding['call_site'] or 'unknown call site'}"
+				)
+				click.echo(f"    {' '.join(finding['query'].split())[:200]}")
+				click.secho(f"    {finding['suggestion']}", fg="yellow")
+
+	if not context.sites:
+		raise SiteNotSpecifiedError
+
+	if not found:
+		click.secho("No N+1 queries found", fg="green")
+	elif fail:
+		sys.exit(1)
+
+
 @click.command("ngrok")
 @click.option("--bind-tls", is_flag=True, default=False, help="Returns a reference to the https tunnel.")
 @click.option(
@@ -1552,6 +1592,7 @@ commands = [
 	browse,
 	start_recording,
 	stop_recording,
+	recorder_report,
 	add_to_hosts,
 	start_ngrok,
 	build_search_index,
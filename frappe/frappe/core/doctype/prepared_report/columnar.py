@@ -0,0 +1,341 @@
+# Copyright (c) 2025, Frappe Technologies and contributors
+# License: MIT. See LICENSE
+"""
+Columnar storage of Prepared Report results.
+
+A result is stored as a zip archive with:
+
+- `meta.json`: format version, the report result without its rows (columns,
+  message, chart, report summary...), the total row if the report has one, the
+  keys of the row values, the row group size and, for every row group, its row
+  count and the min and max value of each column.
+- `<row group>/<key index>.json`: the values of one column for up to
+  ROW_GROUP_SIZE rows. Columns of strings with few distinct values are
+  dictionary encoded as `{"dict": [...], "codes": [...]}`, others are stored as
+  `{"values": [...]}`. `missing` lists the rows of a group that don't have the key.
+
+Every member is compressed on its own, so a page of rows only reads the row
+groups it needs, sorting reads one column and filtering reads the filtered
+columns of row groups whose min and max don't rule them out.
+
+>>> result = ColumnarResult(path)
+>>> rows, count = result.get_rows(start=0, page_length=100, sort_by="qty", filters=[["item", "=", "X"]])
+"""
+
+import json
+import zipfile
+from collections.abc import Iterable
+from typing import BinaryIO
+
+import frappe
+from frappe import _
+
+FORMAT_VERSION = 1
+ROW_GROUP_SIZE = 10_000
+MAX_DICT_SHARE = 0.5  # dictionary encode string columns with at most this share of distinct values
+FILTER_OPERATORS = ("=", "!=", ">", ">=", "<", "<=", "like", "in", "not in")
+
+
+class ColumnarError(frappe.ValidationError):
+	pass
+
+
+def write_columnar_result(data: dict, file: BinaryIO, total_row: bool = False) -> None:
+	"""Write report result `data` to `file` in columnar format.
+
+	:param total_row: The last row is the total row of the report (see `add_total_row`, always a
+	        list). It is stored apart from the other rows, so it is not paged, sorted or filtered.
+
+	Raises `ColumnarError` if the rows are not all dicts or all lists."""
+	rows = data.get("result") or []
+	total = None
+	if total_row and rows:
+		rows, total = rows[:-1], rows[-1]
+
+	if all(isinstance(row, dict) for row in rows):
+		row_type = "dict"
+		keys = list(dict.fromkeys(key for row in rows for key in row))
+	elif all(isinstance(row, list | tuple) for row in rows):
+		row_type = "list"
+		keys = list(range(max((len(row) for row in rows), default=0)))
+	else:
+		raise ColumnarError(_("Rows of the report result must all be of the same type"))
+
+	meta = {
+		"version": FORMAT_VERSION,
+		"report": {key: value for key, value in data.items() if key != "result"},
+		"total_row": total,
+		"row_type": row_type,
+		"keys": keys,
+		"row_count": len(rows),
+		"row_group_size": ROW_GROUP_SIZE,
+		"row_groups": [],
+	}
+
+	with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+		for group, start in enumerate(range(0, len(rows), ROW_GROUP_SIZE)):
+			group_rows = rows[start : start + ROW_GROUP_SIZE]
+			stats = []
+			for idx, key in enumerate(keys):
+				chunk, column_stats = encode_column(get_column(group_rows, key, row_type))
+				archive.writestr(f"{group}/{idx}.json", chunk)
+				stats.append(column_stats)
+
+			meta["row_groups"].append({"rows": len(group_rows), "stats": stats})
+
+		archive.writestr("meta.json", as_json(meta))
+
+
+def get_column(rows: list, key, row_type: str) -> tuple[list, list[int]]:
+	values, missing = [], []
+	for i, row in enumerate(rows):
+		if (key in row) if row_type == "dict" else (key < len(row)):
+			values.append(row[key])
+		else:
+			values.append(None)
+			missing.append(i)
+
+	return values, missing
+
+
+def encode_column(column: tuple[list, list[int]]) -> tuple[str, list | None]:
+	"""Returns the JSON of a column chunk and the min and max of its values."""
+	values, missing = column
+	# values as they will be read back, e.g. dates as strings
+	values = json.loads(as_json(values))
+
+	chunk = {"values": values}
+	if all(isinstance(value, str | None) for value in values):
+		distinct = list(dict.fromkeys(values))
+		if len(distinct) <= len(values) * MAX_DICT_SHARE:
+			codes = {value: code for code, value in enumerate(distinct)}
+			chunk = {"dict": distinct, "codes": [codes[value] for value in values]}
+
+	if missing:
+		chunk["missing"] = missing
+
+	return as_json(chunk), get_stats(values)
+
+
+def get_stats(values: list) -> list | None:
+	"""Returns min and max of the values if they are all numbers or all strings."""
+	values = [value for value in values if value is not None]
+	if not values:
+		return None
+
+	if all(isinstance(value, str) for value in values) or all(
+		isinstance(value, int | float) and not isinstance(value, bool) for value in values
+	):
+		return [min(values), max(values)]
+
+
+def as_json(obj) -> str:
+	return frappe.as_json(obj, indent=None, separators=(",", ":"))
+
+
+class ColumnarResult:
+	"""A report result stored by `write_columnar_result`, read a column chunk at a time."""
+
+	MISSING = object()
+
+	def __init__(self, file: str | BinaryIO):
+		self.archive = zipfile.ZipFile(file)
+		self.meta = json.loads(self.archive.read("meta.json"))
+		if self.meta.get("version") != FORMAT_VERSION:
+			raise ColumnarError(_("Unsupported prepared report format"))
+
+		self.keys = self.meta["keys"]
+		self.row_type = self.meta["row_type"]
+		self.row_count = self.meta["row_count"]
+		self.row_group_size = self.meta["row_group_size"]
+		self.groups = self.meta["row_groups"]
+
+	def close(self):
+		self.archive.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+	def get_result(self) -> dict:
+		"""Returns the whole report result, like it was passed to `write_columnar_result`."""
+		rows = []
+		for group in range(len(self.groups)):
+			rows.extend(self.read_rows(group))
+
+		if (total_row := self.meta.get("total_row")) is not None:
+			rows.append(total_row)
+
+		return self.meta["report"] | {"result": rows}
+
+	def get_rows(
+		self,
+		start: int = 0,
+		page_length: int | None = None,
+		sort_by=None,
+		sort_order: str = "asc",
+		filters: list | dict | None = None,
+	) -> tuple[list, int]:
+		"""Returns a page of the rows that match `filters`, sorted by the values of key `sort_by`,
+		and the number of matching rows.
+
+		`filters` are `[key, operator, value]` lists or a `{key: value}` dict, see FILTER_OPERATORS.
+		`like` matches substrings, ignoring case."""
+		filters = self.parse_filters(filters)
+		indices = self.filter_rows(filters) if filters else range(self.row_count)
+
+		if sort_by is not None:
+			indices = self.sort_rows(indices, self.get_key_index(sort_by), sort_order == "desc")
+
+		count = len(indices)
+		end = start + page_length if page_length else None
+		return self.read_page(indices[start:end]), count
+
+	def parse_filters(self, filters) -> list[tuple[int, str, object]]:
+		if isinstance(filters, str):
+			filters = json.loads(filters)
+
+		if isinstance(filters, dict):
+			filters = [[key, "=", value] for key, value in filters.items()]
+
+		parsed = []
+		for key, operator, value in filters or []:
+			operator = operator.lower()
+			if operator not in FILTER_OPERATORS:
+				frappe.throw(_("Unsupported operator {0}").format(operator))
+			if operator == "like":
+				value = str(value).strip("%").lower()
+			parsed.append((self.get_key_index(key), operator, value))
+
+		return parsed
+
+	def get_key_index(self, key) -> int:
+		try:
+			return self.keys.index(int(key) if self.row_type == "list" else key)
+		except ValueError:
+			frappe.throw(_("Column {0} is not in the report").format(key))
+
+	def filter_rows(self, filters: list) -> list[int]:
+		indices = []
+		offset = 0
+		for group, meta in enumerate(self.groups):
+			if all(may_match(meta["stats"][idx], operator, value) for idx, operator, value in filters):
+				columns = [self.read_column(group, idx) for idx, _operator, _value in filters]
+				for i in range(meta["rows"]):
+					if all(
+						matches(column[i], operator, value)
+						for column, (_idx, operator, value) in zip(columns, filters, strict=True)
+					):
+						indices.append(offset + i)
+
+			offset += meta["rows"]
+
+		return indices
+
+	def sort_rows(self, indices: Iterable[int], idx: int, reverse: bool) -> list[int]:
+		values = []
+		for group in range(len(self.groups)):
+			values.extend(self.read_column(group, idx))
+
+		def sort_key(i):
+			value = values[i]
+			missing = value is None or value is self.MISSING
+			# rows without a value go last
+			return (missing != reverse, None if missing else value)
+
+		try:
+			return sorted(indices, key=sort_key, reverse=reverse)
+		except TypeError:
+			# values of mixed types
+			return sorted(indices, key=lambda i: (sort_key(i)[0], str(values[i])), reverse=reverse)
+
+	def read_page(self, indices: list[int]) -> list:
+		group_rows = {}
+		rows = []
+		for i in indices:
+			group, offset = divmod(i, self.row_group_size)
+			if group not in group_rows:
+				group_rows[group] = self.read_rows(group)
+			rows.append(group_rows[group][offset])
+
+		return rows
+
+	def read_rows(self, group: int) -> list:
+		if not self.keys:
+			return [{} if self.row_type == "dict" else [] for _i in range(self.groups[group]["rows"])]
+
+		columns = [self.read_column(group, idx) for idx in range(len(self.keys))]
+		if self.row_type == "list":
+			return [
+				[value for value in row if value is not self.MISSING] for row in zip(*columns, strict=True)
+			]
+
+		return [
+			{key: value for key, value in zip(self.keys, row, strict=True) if value is not self.MISSING}
+			for row in zip(*columns, strict=True)
+		]
+
+	def read_column(self, group: int, idx: int) -> list:
+		chunk = json.loads(self.archive.read(f"{group}/{idx}.json"))
+		if "dict" in chunk:
+			distinct = chunk["dict"]
+			values = [distinct[code] for code in chunk["codes"]]
+		else:
+			values = chunk["values"]
+
+		for i in chunk.get("missing", ()):
+			values[i] = self.MISSING
+
+		return values
+
+
+def may_match(stats: list | None, operator: str, value) -> bool:
+	"""Whether a row group with these min and max values can have rows that match."""
+	if not stats or operator not in ("=", ">", ">=", "<", "<="):
+		return True
+
+	low, high = stats
+	try:
+		match operator:
+			case "=":
+				return low <= value <= high
+			case ">":
+				return high > value
+			case ">=":
+				return high >= value
+			case "<":
+				return low < value
+			case "<=":
+				return low <= value
+	except TypeError:
+		return True
+
+
+def matches(cell, operator: str, value) -> bool:
+	if cell is ColumnarResult.MISSING:
+		cell = None
+
+	try:
+		match operator:
+			case "=":
+				return cell == value
+			case "!=":
+				return cell != value
+			case ">":
+				return cell is not None and cell > value
+			case ">=":
+				return cell is not None and cell >= value
+			case "<":
+				return cell is not None and cell < value
+			case "<=":
+				return cell is not None and cell <= value
+			case "like":
+				return cell is not None and value in str(cell).lower()
+			case "in":
+				return cell in value
+			case "not in":
+				return cell not in value
+	except TypeError:
+		return False
@@ -4,22 +4,31 @@ import gzip
 import json
 import resource
 from contextlib import suppress
+from io import BytesIO
 from typing import Any
 
 from rq import get_current_job
 
 import frappe
+from frappe.core.doctype.prepared_report.columnar import (
+	ColumnarError,
+	ColumnarResult,
+	as_json,
+	write_columnar_result,
+)
 from frappe.database.utils import dangerously_reconnect_on_connection_abort
 from frappe.desk.form.load import get_attachments
 from frappe.desk.query_report import generate_report_result
 from frappe.model.document import Document
 from frappe.monitor import add_data_to_monitor
-from frappe.utils import add_to_date, now
+from frappe.utils import add_to_date, cint, now
 from frappe.utils.background_jobs import enqueue
 
 # If prepared report runs for longer than this time it's automatically considered as failed
 FAILURE_THRESHOLD = 6 * 60 * 60
 REPORT_TIMEOUT = 25 * 60
+COLUMNAR_SUFFIX = ".columnar.zip"
+PAGE_LENGTH = 10_000  # rows per page of results too big to send whole
 
 
 class PreparedReport(Document):
@@ -82,19 +91,33 @@ class PreparedReport(Document):
 			enqueue_after_commit=True,
 		)
 
+	def get_result_file(self):
+		"""Returns the attached File with the result, columnar or gzipped JSON."""
+		for f in get_attachments(self.doctype, self.name) or []:
+			if f.file_url.endswith((COLUMNAR_SUFFIX, ".gz")):
+				return frappe.get_doc("File", f.name)
+
+	def get_columnar_result(self) -> ColumnarResult | None:
+		"""Returns the result if it is stored in columnar format, close it after use."""
+		if (attached_file := self.get_result_file()) and attached_file.file_url.endswith(COLUMNAR_SUFFIX):
+			return ColumnarResult(attached_file.get_full_path())
+
 	def get_prepared_data(self, with_file_name=False):
-		if attachments := get_attachments(self.doctype, self.name):
-			attachment = None
-			for f in attachments or []:
-				if f.file_url.endswith(".gz"):
-					attachment = f
-					break
+		"""Returns the result as JSON, and the name of a gzipped JSON file of it if `with_file_name`."""
+		if not (attached_file := self.get_result_file()):
+			return
 
-			attached_file = frappe.get_doc("File", attachment.name)
+		file_name = attached_file.file_name
+		if file_name.endswith(COLUMNAR_SUFFIX):
+			with ColumnarResult(attached_file.get_full_path()) as result:
+				data = frappe.safe_encode(as_json(result.get_result()))
+			file_name = file_name.removesuffix(COLUMNAR_SUFFIX) + ".json.gz"
+		else:
+			data = gzip.decompress(attached_file.get_content())
 
-			if with_file_name:
-				return (gzip.decompress(attached_file.get_content()), attachment.file_name)
-			return gzip.decompress(attached_file.get_content())
+		if with_file_name:
+			return (data, file_name)
+		return data
 
 
 def generate_report(prepared_report):
@@ -118,7 +141,12 @@ def generate_report(prepared_report):
 					report.custom_columns = data["columns"]
 
 		result = generate_report_result(report=report, filters=instance.filters, user=instance.owner)
-		create_json_gz_file(result, instance.doctype, instance.name, instance.report_name)
+		# the same condition `generate_report_result` appends the total row on
+		total_row = bool(cint(report.add_total_row) and result["result"] and not result.get("skip_total_row"))
+		try:
+			create_columnar_file(result, instance.doctype, instance.name, instance.report_name, total_row)
+		except ColumnarError:
+			create_json_gz_file(result, instance.doctype, instance.name, instance.report_name)
 
 		instance.status = "Completed"
 	except Exception:
@@ -257,6 +285,57 @@ def create_json_gz_file(data, dt, dn, report_name):
 	_file.save(ignore_permissions=True)
 
 
+def create_columnar_file(data, dt, dn, report_name, total_row=False):
+	"""Attach the result in columnar format, so that it can be read a page at a time.
+	Raises `ColumnarError` for results it can't store, see `write_columnar_result`."""
+	file_name = "{}_{}{}".format(
+		frappe.scrub(report_name),
+		frappe.utils.data.format_datetime(frappe.utils.now(), "Y-m-d-H-M"),
+		COLUMNAR_SUFFIX,
+	)
+	content = BytesIO()
+	write_columnar_result(data, content, total_row=total_row)
+
+	_file = frappe.get_doc(
+		{
+			"doctype": "File",
+			"file_name": file_name,
+			"attached_to_doctype": dt,
+			"attached_to_name": dn,
+			"content": content.getvalue(),
+			"is_private": 1,
+		}
+	)
+	_file.save(ignore_permissions=True)
+
+
+@frappe.whitelist()
+def get_prepared_report_page(
+	name, start=0, page_length=PAGE_LENGTH, sort_by=None, sort_order="asc", filters=None
+):
+	"""Returns a page of the rows of a prepared report and the number of rows matching `filters`,
+	without loading the whole result. See `ColumnarResult.get_rows` for sorting and filters."""
+	doc = frappe.get_doc("Prepared Report", name)
+	if not doc.has_permission("read"):
+		frappe.throw(frappe._("Insufficient Permission for {0}").format(name), frappe.PermissionError)
+
+	result = doc.get_columnar_result()
+	if not result:
+		frappe.throw(frappe._("This report was prepared in an older format, please rebuild it"))
+
+	start = cint(start)
+	with result:
+		rows, row_count = result.get_rows(
+			start=start,
+			page_length=min(cint(page_length) or PAGE_LENGTH, PAGE_LENGTH),
+			sort_by=sort_by or None,
+			sort_order="desc" if sort_order == "desc" else "asc",
+			filters=filters,
+		)
+
+	return {"result": rows, "row_count": row_count, "start": start}
+
+
 @frappe.whitelist()
 def download_attachment(dn):
 	pr = frappe.get_doc("Prepared Report", dn)
@@ -3,9 +3,12 @@
 import json
 import time
 from contextlib import contextmanager
+from io import BytesIO
+from unittest.mock import patch
 
 import frappe
-from frappe.desk.query_report import generate_report_result, get_report_doc
+from frappe.core.doctype.prepared_report.columnar import ColumnarResult, write_columnar_result
+from frappe.desk.query_report import add_total_row, generate_report_result, get_report_doc
 from frappe.query_builder.utils import db_type_is
 from frappe.tests.test_query_builder import run_only_if
 from frappe.tests.utils import FrappeTestCase, timeout
@@ -63,6 +66,50 @@ class TestPreparedReport(FrappeTestCase):
 		self.assertEqual(len(prepared_data["result"]), len(generated_data["result"]))
 		self.assertEqual(len(prepared_data), len(generated_data))
 
+	def test_columnar_result(self):
+		data = {
+			"columns": [{"fieldname": "item"}, {"fieldname": "qty"}],
+			"message": "done",
+			"result": [{"item": f"Item {i % 3}", "qty": i} for i in range(25)] + [{"item": "No Qty"}],
+		}
+		file = BytesIO()
+		with patch("frappe.core.doctype.prepared_report.columnar.ROW_GROUP_SIZE", 10):
+			write_columnar_result(data, file)
+
+		with ColumnarResult(file) as result:
+			self.assertEqual(result.get_result(), data)
+			self.assertEqual(len(result.groups), 3)
+
+			rows, count = result.get_rows(start=10, page_length=5)
+			self.assertEqual(count, 26)
+			self.assertEqual(rows, data["result"][10:15])
+
+			rows, count = result.get_rows(page_length=3, sort_by="qty", sort_order="desc")
+			self.assertEqual([row["qty"] for row in rows], [24, 23, 22])
+
+			rows, count = result.get_rows(sort_by="qty", filters=[["item", "=", "Item 1"], ["qty", ">", 12]])
+			self.assertEqual(count, 4)
+			self.assertEqual([row["qty"] for row in rows], [13, 16, 19, 22])
+
+			_rows, count = result.get_rows(filters={"item": "No Qty"})
+			self.assertEqual(count, 1)
+
+	def test_columnar_result_with_total_row(self):
+		columns = [{"fieldname": "item", "fieldtype": "Data"}, {"fieldname": "qty", "fieldtype": "Float"}]
+		rows = [{"item": f"Item {i}", "qty": i} for i in range(5)]
+		data = {"columns": columns, "result": add_total_row(rows, columns)}
+		file = BytesIO()
+		write_columnar_result(data, file, total_row=True)
+
+		with ColumnarResult(file) as result:
+			self.assertEqual(result.get_result(), data)
+			self.assertEqual(result.meta["total_row"], ["Total", 10.0])
+
+			# the total row is not one of the rows that are paged, sorted and filtered
+			rows, count = result.get_rows(sort_by="qty", sort_order="desc")
+			self.assertEqual(count, 5)
+			self.assertEqual([row["qty"] for row in rows], [4, 3, 2, 1, 0])
+
 	@run_only_if(db_type_is.MARIADB)
 	def test_start_status_and_kill_jobs(self):
 		with test_report(report_type="Query Report", query="select sleep(10)") as report:
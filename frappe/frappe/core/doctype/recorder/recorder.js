@@ -4,6 +4,7 @@
 frappe.ui.form.on("Recorder", {
 	onload: function (frm) {
 		frm.fields_dict.sql_queries.grid.only_sortable();
+		frm.fields_dict.n_plus_one_queries.grid.only_sortable();
 	},
 	refresh: function (frm) {
 		frm.disable_save();
@@ -22,6 +22,9 @@ class Recorder(Document):
 	from typing import TYPE_CHECKING
 
 	if TYPE_CHECKING:
+		from frappe.core.doctype.recorder_n_plus_one_query.recorder_n_plus_one_query import (
+			RecorderNPlusOneQuery,
+		)
 		from frappe.core.doctype.recorder_query.recorder_query import RecorderQuery
 		from frappe.core.doctype.recorder_suggested_index.recorder_suggested_index import (
 			RecorderSuggestedIndex,
@@ -33,6 +36,7 @@ class Recorder(Document):
 		event_type: DF.Data | None
 		form_dict: DF.Code | None
 		method: DF.Literal["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]
+		n_plus_one_queries: DF.Table[RecorderNPlusOneQuery]
 		number_of_queries: DF.Int
 		path: DF.Data | None
 		profile: DF.Code | None
@@ -110,6 +114,7 @@ def serialize_request(request):
 		form_dict=frappe.as_json(request.get("form_dict"), indent=4),
 		sql_queries=request.get("calls"),
 		suggested_indexes=request.get("suggested_indexes"),
+		n_plus_one_queries=request.get("n_plus_one"),
 		modified=request.get("time"),
 		creation=request.get("time"),
 	)
@@ -0,0 +1,50 @@
+# Copyright (c) 2025, Frappe Technologies and contributors
+# For license information, please see license.txt
+
+# import frappe
+from frappe.model.document import Document
+
+
+class RecorderNPlusOneQuery(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		call_site: DF.Data | None
+		count: DF.Int
+		distinct_queries: DF.Int
+		duration: DF.Float
+		parent: DF.Data
+		parentfield: DF.Data
+		parenttype: DF.Data
+		query: DF.Code | None
+		suggestion: DF.SmallText | None
+	# end: auto-generated types
+
+	def db_insert(self, *args, **kwargs):
+		pass
+
+	def load_from_db(self):
+		pass
+
+	def db_update(self):
+		pass
+
+	@staticmethod
+	def get_list(args):
+		pass
+
+	@staticmethod
+	def get_count(args):
+		pass
+
+	@staticmethod
+	def get_stats(args):
+		pass
+
+	def delete(self):
+		pass
@@ -8,6 +8,7 @@ from frappe import _
 from frappe.core.utils import find
 from frappe.desk.form.linked_with import get_linked_doctypes
 from frappe.model.document import Document
+from frappe.permissions import clear_user_permission_version
 from frappe.utils import cstr
 
 
@@ -35,10 +36,12 @@ class UserPermission(Document):
 
 	def on_update(self):
 		frappe.cache.hdel("user_permissions", self.user)
+		clear_user_permission_version(self.user)
 		frappe.publish_realtime("update_user_permissions", user=self.user, after_commit=True)
 
 	def on_trash(self):
 		frappe.cache.hdel("user_permissions", self.user)
+		clear_user_permission_version(self.user)
 		frappe.publish_realtime("update_user_permissions", user=self.user, after_commit=True)
 
 	def validate_user_permission(self):
@@ -10,7 +10,7 @@ import string
 import traceback
 from collections.abc import Iterable, Sequence
 from contextlib import contextmanager, suppress
-from time import time
+from time import perf_counter, time
 from typing import TYPE_CHECKING, Any, Union
 
 from pypika.dialects import MySQLQueryBuilder, PostgreSQLQueryBuilder
@@ -19,6 +19,7 @@ from pypika.terms import Criterion, NullValue
 import frappe
 import frappe.defaults
 from frappe import _
+from frappe.database.pool import get_pool
 from frappe.database.utils import (
 	DefaultOrderBy,
 	EmptyQueryValues,
@@ -29,7 +30,7 @@ from frappe.database.utils import (
 	is_query_type,
 )
 from frappe.exceptions import DoesNotExistError, ImplicitCommitError
-from frappe.monitor import get_trace_id
+from frappe.monitor import get_counters, get_trace_id
 from frappe.query_builder import Case
 from frappe.query_builder.functions import Count
 from frappe.utils import CallbackManager, cint, get_datetime, get_table_name, getdate, now, sbool
@@ -44,6 +45,8 @@ if TYPE_CHECKING:
 
 
 IFNULL_PATTERN = re.compile(r"ifnull\(", flags=re.IGNORECASE)
+WRITE_QUERY_TYPES = ("insert", "update", "delete", "replace", "create", "alter", "drop", "truncate", "rename")
+LOCKING_READ_PATTERN = re.compile(r"\bfor\s+(update|share)\b", flags=re.IGNORECASE)
 INDEX_PATTERN = re.compile(r"\s*\([^)]+\)\s*")
 SINGLE_WORD_PATTERN = re.compile(r'([`"]?)(tab([A-Z]\w+))\1')
 MULTI_WORD_PATTERN = re.compile(r'([`"])(tab([A-Z]\w+)( [A-Z]\w+)+)\1')
@@ -91,6 +94,7 @@ class Database:
 
 		self.transaction_writes = 0
 		self.auto_commit_on_many_writes = 0
+		self.is_replica = False
 
 		self.value_cache = {}
 		self.logger = frappe.logger("database")
@@ -109,7 +113,10 @@ class Database:
 
 	def connect(self):
 		"""Connects to a database as set in `site_config.json`."""
-		self._conn: MariadbConnection | PostgresConnection = self.get_connection()
+		if pool := get_pool():
+			self._conn: MariadbConnection | PostgresConnection = pool.acquire(self)
+		else:
+			self._conn = self.get_connection()
 		self._cursor: MariadbCursor | PostgresCursor = self._conn.cursor()
 
 		try:
@@ -132,9 +139,22 @@ class Database:
 		"""Returns a Database connection object that conforms with https://peps.python.org/pep-0249/#connection-objects"""
 		raise NotImplementedError
 
+	def is_connection_healthy(self, conn) -> bool:
+		"""Whether an idle pooled connection can still be used."""
+		raise NotImplementedError
+
+	def reset_connection(self, conn) -> None:
+		"""Reset the session of a rolled back connection before it is pooled, dropping session and
+		user variables (e.g. a statement timeout), temporary tables and prepared statements."""
+		raise NotImplementedError
+
 	def get_database_size(self):
 		raise NotImplementedError
 
+	def get_replication_lag(self) -> float | None:
+		"""Seconds the server is behind its primary, 0 if it isn't a replica and None if unknown."""
+		raise NotImplementedError
+
 	def _transform_query(self, query: Query, values: QueryValues) -> tuple:
 		return query, values
 
@@ -200,6 +220,26 @@ class Database:
 		# remove whitespace / indentation from start and end of query
 		query = query.strip()
 
+		if self.is_replica and (
+			is_query_type(query, WRITE_QUERY_TYPES) or LOCKING_READ_PATTERN.search(query)
+		):
+			# a call routed to a replica writes after all, continue it on the primary
+			from frappe.database.replica import switch_to_primary
+
+			return switch_to_primary().sql(
+				query,
+				values,
+				as_dict=as_dict,
+				as_list=as_list,
+				debug=debug,
+				ignore_ddl=ignore_ddl,
+				auto_commit=auto_commit,
+				update=update,
+				explain=explain,
+				pluck=pluck,
+				as_iterator=as_iterator,
+			)
+
 		# replaces ifnull in query with coalesce
 		query = IFNULL_PATTERN.sub("coalesce(", query)
 
@@ -226,6 +266,7 @@ class Database:
 		if trace_id := get_trace_id():
 			query += f" /* FRAPPE_TRACE_ID: {trace_id} */"
 
+		query_start = perf_counter()
 		try:
 			self._cursor.execute(query, values)
 		except Exception as e:
@@ -265,6 +306,10 @@ class Database:
 			):
 				raise
 
+		if counters := get_counters():
+			counters.queries += 1
+			counters.db_time += perf_counter() - query_start
+
 		self.log_query(query, values, debug, explain)
 		if debug:
 			time_end = time()
@@ -280,6 +325,9 @@ class Database:
 			return self._return_as_iterator(pluck=pluck, as_dict=as_dict, as_list=as_list, update=update)
 
 		last_result = self._transform_result(self._cursor.fetchall())
+		if counters:
+			counters.rows += len(last_result)
+
 		if pluck:
 			last_result = [r[0] for r in last_result]
 			self._clean_up()
@@ -300,6 +348,9 @@ class Database:
 
 	def _return_as_iterator(self, *, pluck, as_dict, as_list, update):
 		while result := self._transform_result(self._cursor.fetchmany(SQL_ITERATOR_BATCH_SIZE)):
+			if counters := get_counters():
+				counters.rows += len(result)
+
 			if pluck:
 				for row in result:
 					yield row[0]
@@ -1281,6 +1332,10 @@ class Database:
 		"""Get estimated count of total rows in a table."""
 		raise NotImplementedError
 
+	def estimate_query_count(self, query: str) -> int:
+		"""Get the number of rows the query planner expects `query` to return, from index statistics."""
+		raise NotImplementedError
+
 	@staticmethod
 	def format_date(date):
 		return getdate(date).strftime("%Y-%m-%d")
@@ -1357,7 +1412,11 @@ class Database:
 	def close(self):
 		"""Close database connection."""
 		if self._conn:
-			self._conn.close()
+			if pool := get_pool():
+				self._cursor.close()
+				pool.release(self, self._conn)
+			else:
+				self._conn.close()
 			self._cursor = None
 			self._conn = None
 
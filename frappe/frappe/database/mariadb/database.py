@@ -2,7 +2,7 @@ import re
 from contextlib import contextmanager
 
 import pymysql
-from pymysql.constants import ER, FIELD_TYPE
+from pymysql.constants import COMMAND, ER, FIELD_TYPE
 from pymysql.converters import conversions, escape_string
 
 import frappe
@@ -116,6 +116,23 @@ class MariaDBConnectionUtil:
 	def create_connection(self):
 		return pymysql.connect(**self.get_connection_settings())
 
+	def is_connection_healthy(self, conn) -> bool:
+		try:
+			conn.ping(reconnect=False)
+			return True
+		except pymysql.Error:
+			return False
+
+	def reset_connection(self, conn) -> None:
+		# PyMySQL has no public method for COM_RESET_CONNECTION
+		conn._execute_command(COMMAND.COM_RESET_CONNECTION, "")
+		conn._read_ok_packet()
+
+		# the reset restores server defaults, set up the session like `pymysql.connect` did
+		settings = self.get_connection_settings()
+		conn.set_character_set(settings["charset"], settings["collation"])
+		conn.autocommit(False)
+
 	def set_execution_timeout(self, seconds: int):
 		self.sql("set session max_statement_time = %s", int(seconds))
 
@@ -223,6 +240,20 @@ class MariaDBDatabase(MariaDBConnectionUtil, MariaDBExceptionUtil, Database):
 
 		return db_size[0].get("database_size")
 
+	def get_replication_lag(self):
+		try:
+			status = self.sql("SHOW SLAVE STATUS", as_dict=True)
+		except pymysql.err.OperationalError:
+			# needs the REPLICATION CLIENT / REPLICA MONITOR privilege
+			return None
+
+		if not status:
+			return 0.0
+
+		# NULL while replication is stopped
+		lag = status[0].get("Seconds_Behind_Master")
+		return float("inf") if lag is None else float(lag)
+
 	def log_query(self, query, values, debug, explain):
 		self.last_query = self._cursor._executed
 		self._log_query(self.last_query, debug, explain, query)
@@ -570,3 +601,14 @@ class MariaDBDatabase(MariaDBConnectionUtil, MariaDBExceptionUtil, Database):
 
 		count = self.sql("select table_rows from information_schema.tables where table_name = %s", table)
 		return cint(count[0][0]) if count else 0
+
+	def estimate_query_count(self, query: str) -> int:
+		"""Get the number of rows the query planner expects `query` to return, from index statistics."""
+		from frappe.utils.data import cint, flt
+
+		plan = self.sql(f"explain {query}", as_dict=True)
+		if not plan:
+			return 0
+
+		# first row is the table the query is driven by, `filtered` is the share of its rows kept
+		return cint(flt(plan[0].rows) * flt(plan[0].get("filtered") or 100) / 100)
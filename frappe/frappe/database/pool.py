@@ -0,0 +1,166 @@
+# Copyright (c) 2025, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Process-local database connection pool.
+
+By default every request and job opens a new database connection in
+`Database.connect` and closes it in `frappe.destroy`. With `db_pool_size` set
+in site or common site config, closed connections are rolled back and kept for
+the next `connect` of the same process instead, up to `db_pool_size` idle
+connections per site and database user:
+
+- `db_pool_max_lifetime` (seconds, default 600): connections older than this are
+  closed instead of being reused.
+- `db_pool_health_check_interval` (seconds, default 10): connections idle for
+  longer are pinged before being reused, and replaced if the ping fails.
+
+Released connections are rolled back and their session is reset (see
+`Database.reset_connection`), so that session settings like a statement timeout
+don't carry over to the next request.
+
+Connections are pooled by site database, user and host, so they are never
+shared between sites, and by process id, so forked processes don't inherit the
+pool of their parent. RQ workers that fork a work horse per job only benefit
+with a worker class that runs jobs in the worker process.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+import frappe
+
+if TYPE_CHECKING:
+	from frappe.database.database import Database
+
+DEFAULT_MAX_LIFETIME = 600  # seconds
+DEFAULT_HEALTH_CHECK_INTERVAL = 10  # seconds
+
+
+class ConnectionPool:
+	__slots__ = ("created", "discarded", "hits", "idle", "lock", "misses")
+
+	def __init__(self):
+		# key -> deque of (connection, last used)
+		self.idle: dict[tuple, deque] = {}
+		# id(connection) -> created at, for connections handed out by the pool
+		self.created: dict[int, float] = {}
+		self.lock = threading.Lock()
+		self.hits = self.misses = self.discarded = 0
+
+	def acquire(self, db: "Database"):
+		"""Return an idle healthy connection for `db`, or a new one."""
+		key = get_pool_key(db)
+		max_lifetime = get_max_lifetime()
+		health_check_interval = get_health_check_interval()
+
+		while True:
+			with self.lock:
+				idle = self.idle.get(key)
+				conn, last_used = idle.pop() if idle else (None, None)
+
+			if conn is None:
+				break
+
+			now = time.monotonic()
+			if now - self.created.get(id(conn), 0) > max_lifetime:
+				self.discard(conn)
+			elif now - last_used > health_check_interval and not db.is_connection_healthy(conn):
+				self.discard(conn)
+			else:
+				with self.lock:
+					self.hits += 1
+				return conn
+
+		with self.lock:
+			self.misses += 1
+		conn = db.get_connection()
+		self.created[id(conn)] = time.monotonic()
+		return conn
+
+	def release(self, db: "Database", conn) -> None:
+		"""Roll back and reset `conn` and keep it for reuse, or close it if the pool for `db` is full."""
+		if id(conn) not in self.created:
+			# opened before pooling was enabled
+			conn.close()
+			return
+
+		try:
+			conn.rollback()
+			db.reset_connection(conn)
+		except Exception:
+			self.discard(conn)
+			return
+
+		key = get_pool_key(db)
+		with self.lock:
+			idle = self.idle.setdefault(key, deque())
+			if len(idle) < get_pool_size():
+				idle.append((conn, time.monotonic()))
+				return
+
+		self.discard(conn)
+
+	def discard(self, conn) -> None:
+		self.created.pop(id(conn), None)
+		with self.lock:
+			self.discarded += 1
+		try:
+			conn.close()
+		except Exception:
+			pass
+
+	def clear(self) -> None:
+		"""Close all idle connections."""
+		with self.lock:
+			idle, self.idle = self.idle, {}
+
+		for connections in idle.values():
+			for conn, _last_used in connections:
+				self.discard(conn)
+
+	def info(self) -> dict:
+		return {
+			"idle": sum(len(connections) for connections in self.idle.values()),
+			"open": len(self.created),
+			"hits": self.hits,
+			"misses": self.misses,
+			"discarded": self.discarded,
+		}
+
+
+_pools: dict[int, ConnectionPool] = {}
+
+
+def get_pool() -> ConnectionPool | None:
+	"""The pool of this process, None if pooling is disabled."""
+	if not get_pool_size():
+		return None
+
+	pid = os.getpid()
+	if (pool := _pools.get(pid)) is None:
+		# forked from a process with a pool, its connections belong to the parent
+		_pools.clear()
+		pool = _pools.setdefault(pid, ConnectionPool())
+
+	return pool
+
+
+def get_pool_key(db: "Database") -> tuple:
+	return (type(db).__name__, db.host, db.port, db.socket, db.user, db.cur_db_name)
+
+
+def get_pool_size() -> int:
+	# also called from `Database.close` after frappe.local was released
+	conf = getattr(frappe.local, "conf", None) or {}
+	return conf.get("db_pool_size") or 0
+
+
+def get_max_lifetime() -> int:
+	return frappe.conf.get("db_pool_max_lifetime") or DEFAULT_MAX_LIFETIME
+
+
+def get_health_check_interval() -> int:
+	return frappe.conf.get("db_pool_health_check_interval") or DEFAULT_HEALTH_CHECK_INTERVAL
@@ -1,3 +1,4 @@
+import json
 import re
 
 import psycopg2
@@ -186,6 +187,27 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 
 		return conn
 
+	def is_connection_healthy(self, conn) -> bool:
+		if conn.closed:
+			return False
+
+		try:
+			with conn.cursor() as cursor:
+				cursor.execute("select 1")
+			conn.rollback()
+			return True
+		except psycopg2.Error:
+			return False
+
+	def reset_connection(self, conn) -> None:
+		# DISCARD ALL can't run inside a transaction
+		conn.autocommit = True
+		try:
+			with conn.cursor() as cursor:
+				cursor.execute("discard all")
+		finally:
+			conn.autocommit = False
+
 	def set_execution_timeout(self, seconds: int):
 		# Postgres expects milliseconds as input
 		self.sql("set local statement_timeout = %s", int(seconds) * 1000)
@@ -215,6 +237,19 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 		)
 		return db_size[0].get("database_size")
 
+	def get_replication_lag(self):
+		# the last replayed transaction gets older while the primary is idle,
+		# a replica that replayed everything it received is caught up
+		return float(
+			self.sql(
+				"""select case
+				when not pg_is_in_recovery() then 0
+				when pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() then 0
+				else coalesce(extract(epoch from now() - pg_last_xact_replay_timestamp()), 0)
+				end"""
+			)[0][0]
+		)
+
 	# pylint: disable=W0221
 	def sql(self, query, values=EmptyQueryValues, *args, **kwargs):
 		return super().sql(modify_query(query), modify_values(values), *args, **kwargs)
@@ -437,6 +472,16 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 		count = self.sql("select reltuples from pg_class where relname = %s", table)
 		return cint(count[0][0]) if count else 0
 
+	def estimate_query_count(self, query: str) -> int:
+		"""Get the number of rows the query planner expects `query` to return, from index statistics."""
+		from frappe.utils.data import cint
+
+		plan = self.sql(f"explain (format json) {query}")[0][0]
+		if isinstance(plan, str):
+			plan = json.loads(plan)
+
+		return cint(plan[0]["Plan"]["Plan Rows"])
+
 
 def modify_query(query):
 	""" "Modifies query according to the requirements of postgres"""
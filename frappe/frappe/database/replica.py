@@ -0,0 +1,133 @@
+# Copyright (c) 2025, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Route reads to a read replica.
+
+With `read_from_replica` in site config, methods decorated with `frappe.read_only`
+run on a replica connection. With `route_reads_to_replica` too, so do all
+whitelisted methods called with GET and the list and report methods in
+READ_ONLY_METHODS (extend them with the `replica_read_methods` hook).
+
+`replica_host` can be a list of hosts, one that is at most `replica_max_lag`
+seconds (default 10) behind the primary is picked at random. If none is, the
+call stays on the primary. A replica whose lag can't be measured, e.g. without
+the REPLICATION CLIENT privilege, counts as too far behind unless
+`replica_allow_unknown_lag` is set. A routed call that writes is moved to the
+primary on its first write and stays there, so reads before a write may be up
+to the staleness budget old, reads after it are not.
+"""
+
+import random
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+
+import frappe
+from frappe import _
+
+DEFAULT_MAX_LAG = 10  # seconds
+LAG_CHECK_INTERVAL = 5  # seconds a measured lag is reused for
+
+READ_ONLY_METHODS = {
+	"frappe.client.get_count",
+	"frappe.client.get_list",
+	"frappe.desk.query_report.run",
+	"frappe.desk.reportview.get",
+	"frappe.desk.reportview.get_count",
+	"frappe.desk.reportview.get_count_estimate",
+	"frappe.desk.reportview.get_list",
+}
+
+# (site, host) -> (checked at, lag in seconds or None if it can't be measured)
+_replica_lag: dict[tuple[str, str], tuple[float, float | None]] = {}
+
+
+def should_route(cmd: str, method: Callable | None = None) -> bool:
+	"""Whether a whitelisted method call should run on a replica."""
+	conf = frappe.local.conf
+	if not (conf.read_from_replica and conf.route_reads_to_replica and frappe.request):
+		return False
+
+	if frappe.request.method == "GET" or cmd in READ_ONLY_METHODS:
+		return True
+
+	return cmd in frappe.get_hooks("replica_read_methods")
+
+
+@contextmanager
+def route_reads():
+	"""Run the block on a replica that is within the staleness budget, if there is one."""
+	if getattr(frappe.local, "primary_db", None) or not connect_replica():
+		# already routed, or no replica is recent enough
+		yield
+		return
+
+	try:
+		yield
+	finally:
+		disconnect_replica()
+
+
+def connect_replica() -> bool:
+	hosts = frappe.local.conf.replica_host
+	hosts = random.sample(hosts, len(hosts)) if isinstance(hosts, list) else [hosts]
+	max_lag = frappe.local.conf.replica_max_lag
+	if max_lag is None:
+		max_lag = DEFAULT_MAX_LAG
+
+	for host in hosts:
+		frappe.connect_replica(host=host)
+		lag = get_replication_lag(host)
+		if lag is None:
+			if frappe.local.conf.replica_allow_unknown_lag:
+				return True
+			frappe.logger("database").info(f"Lag of replica {host} can't be measured, not reading from it")
+		elif lag <= max_lag:
+			return True
+		else:
+			frappe.logger("database").info(f"Replica {host} is {lag}s behind, not reading from it")
+
+		disconnect_replica()
+
+	return False
+
+
+def disconnect_replica():
+	local = frappe.local
+	if replica_db := getattr(local, "replica_db", None):
+		replica_db.close()
+
+	if primary_db := getattr(local, "primary_db", None):
+		local.db = primary_db
+
+	for attr in ("replica_db", "primary_db"):
+		if hasattr(local, attr):
+			delattr(local, attr)
+
+
+def switch_to_primary():
+	"""Continue the current call on the primary connection, returns it.
+
+	Called by `Database.sql` when a query that writes is run on a replica.
+	"""
+	local = frappe.local
+	if not frappe.flags.read_only and (primary_db := getattr(local, "primary_db", None)):
+		local.db = primary_db
+		return primary_db
+
+	# in maintenance mode (see `app.setup_read_only_mode`) writes must fail
+	frappe.throw(
+		_("Site is running in read only mode, this action can not be performed right now."),
+		title=_("In Read Only Mode"),
+		exc=frappe.InReadOnlyMode,
+	)
+
+
+def get_replication_lag(host: str) -> float | None:
+	key = (frappe.local.site, str(host))
+	checked_at, lag = _replica_lag.get(key, (0, None))
+	if time.monotonic() - checked_at > LAG_CHECK_INTERVAL:
+		lag = frappe.local.replica_db.get_replication_lag()
+		_replica_lag[key] = (time.monotonic(), lag)
+
+	return lag
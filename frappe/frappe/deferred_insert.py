@@ -1,15 +1,25 @@
 import json
+import time
 from typing import TYPE_CHECKING, Union
 
 import redis
 
 import frappe
-from frappe.utils import cstr
+from frappe.utils import cint, cstr, now
 
 if TYPE_CHECKING:
 	from frappe.model.document import Document
 
 queue_prefix = "insert_queue_for_"
+dead_letter_prefix = "insert_dead_letter_for_"
+metrics_key = "deferred_insert_metrics"
+
+# batch sizes count queue entries, each entry holds one or more records
+MIN_BATCH_SIZE = 50
+MAX_BATCH_SIZE = 5000
+TARGET_BATCH_SECONDS = 1  # batch size is adapted to write a batch in about this long
+MAX_DRAIN_SECONDS = 120  # per run, the queue is picked up again on the next run
+MAX_DEAD_LETTERS = 10_000  # per doctype, oldest are dropped
 
 
 def deferred_insert(doctype: str, records: list[Union[dict, "Document"]] | str):
@@ -26,29 +36,176 @@ def deferred_insert(doctype: str, records: list[Union[dict, "Document"]] | str):
 
 
 def save_to_db():
-	queue_keys = frappe.cache.get_keys(queue_prefix)
-	for key in queue_keys:
-		record_count = 0
-		queue_key = get_key_name(key)
-		doctype = get_doctype_name(key)
-		while frappe.cache.llen(queue_key) > 0 and record_count <= 500:
-			records = frappe.cache.lpop(queue_key)
-			records = json.loads(records.decode("utf-8"))
-			if isinstance(records, dict):
-				record_count += 1
-				insert_record(records, doctype)
-				continue
-			for record in records:
-				record_count += 1
-				insert_record(record, doctype)
-
-
-def insert_record(record: Union[dict, "Document"], doctype: str):
+	"""Drain all deferred insert queues.
+
+	Queue entries are taken in batches with one LRANGE + LTRIM transaction and
+	inserted with `frappe.bulk.insert` (controller hooks per record, one INSERT per
+	table). A batch that fails is retried record by record, records that still fail
+	go to the doctype's dead-letter list. The batch size per doctype grows or shrinks
+	to write a batch in about TARGET_BATCH_SECONDS, and queue lengths, throughput and
+	failures are kept in `deferred_insert_metrics` (see `get_queue_metrics`).
+	"""
+	deadline = time.monotonic() + MAX_DRAIN_SECONDS
+	for key in frappe.cache.get_keys(queue_prefix):
+		drain_queue(get_key_name(key), get_doctype_name(key), deadline)
+
+
+def drain_queue(queue_key: str, doctype: str, deadline: float):
+	metrics = get_doctype_metrics(doctype)
+	batch_size = cint(metrics.get("batch_size")) or MIN_BATCH_SIZE
+	pending_before = frappe.cache.llen(queue_key)
+	inserted = failed = 0
+	started = time.monotonic()
+
+	while time.monotonic() < deadline:
+		records, entry_count = pop_records(queue_key, batch_size)
+		if not entry_count:
+			break
+
+		batch_started = time.monotonic()
+		batch_inserted, batch_failed = insert_records(records, doctype)
+		inserted += batch_inserted
+		failed += batch_failed
+
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
+		batch_size = adapt_batch_size(batch_size, entry_count, time.monotonic() - batch_started)
+
+	metrics.update(
+		{
+			"batch_size": batch_size,
+			"pending_before": pending_before,
+			"pending": frappe.cache.llen(queue_key),
+			"inserted": inserted,
+			"failed": failed,
+			"seconds": round(time.monotonic() - started, 3),
+			"last_run": now(),
+		}
+	)
+	metrics["records_per_second"] = round(inserted / metrics["seconds"], 1) if metrics["seconds"] else 0
+	frappe.cache.hset(metrics_key, doctype, metrics)
+
+	if metrics["pending"] > pending_before:
+		frappe.logger().warning(
+			f"Deferred {doctype} records are queued faster than they are inserted: {metrics}"
+		)
+
+
+def pop_records(queue_key: str, batch_size: int) -> tuple[list[dict], int]:
+	"""Take up to `batch_size` queue entries atomically.
+
+	Returns their records and the number of entries taken."""
+	key = frappe.cache.make_key(queue_key)
+	pipeline = frappe.cache.pipeline()
+	pipeline.lrange(key, 0, batch_size - 1)
+	pipeline.ltrim(key, batch_size, -1)
+	entries, _trimmed = pipeline.execute()
+
+	records = []
+	for entry in entries:
+		entry = json.loads(entry.decode("utf-8"))
+		records.extend([entry] if isinstance(entry, dict) else entry)
+
+	return records, len(entries)
+
+
+def insert_records(records: list[dict], doctype: str) -> tuple[int, int]:
+	"""Insert `records` in bulk, falling back to one at a time if that fails.
+
+	Returns the number of inserted and failed records."""
+	import frappe.bulk
+
+	for record in records:
+		record.update({"doctype": doctype})
+
+	try:
+		frappe.db.savepoint("deferred_insert")
+		frappe.bulk.insert([dict(record) for record in records])
+		return len(records), 0
+	except Exception:
+		frappe.db.rollback(save_point="deferred_insert")
+
+	failed = 0
+	for record in records:
+		if not insert_record(record, doctype):
+			failed += 1
+
+	return len(records) - failed, failed
+
+
+def insert_record(record: Union[dict, "Document"], doctype: str) -> bool:
 	try:
 		record.update({"doctype": doctype})
+		frappe.db.savepoint("deferred_insert_record")
 		frappe.get_doc(record).insert()
+		return True
 	except Exception as e:
+		frappe.db.rollback(save_point="deferred_insert_record")
 		frappe.logger().error(f"Error while inserting deferred {doctype} record: {e}")
+		add_to_dead_letters(record, doctype, e)
+		return False
+
+
+def add_to_dead_letters(record: dict, doctype: str, error: Exception):
+	"""Keep a failed record with its error, up to MAX_DEAD_LETTERS per doctype."""
+	key = frappe.cache.make_key(f"{dead_letter_prefix}{doctype}")
+	entry = json.dumps({"record": record, "error": cstr(error), "failed_at": now()}, default=str)
+
+	try:
+		pipeline = frappe.cache.pipeline()
+		pipeline.rpush(key, entry)
+		pipeline.ltrim(key, -MAX_DEAD_LETTERS, -1)
+		pipeline.execute()
+	except redis.exceptions.ConnectionError:
+		pass
+
+
+def requeue_dead_letters(doctype: str) -> int:
+	"""Move dead-letter records of `doctype` back to its queue, returns how many were moved."""
+	key = frappe.cache.make_key(f"{dead_letter_prefix}{doctype}")
+	pipeline = frappe.cache.pipeline()
+	pipeline.lrange(key, 0, -1)
+	pipeline.delete(key)
+	entries, _deleted = pipeline.execute()
+
+	records = [json.loads(entry)["record"] for entry in entries]
+	if records:
+		deferred_insert(doctype, records)
+
+	return len(records)
+
+
+def adapt_batch_size(batch_size: int, entry_count: int, seconds: float) -> int:
+	"""Grow the batch size while full batches of `entry_count` queue entries are written
+	quickly, shrink it when they are slow."""
+	if seconds > TARGET_BATCH_SECONDS:
+		batch_size //= 2
+	elif seconds < TARGET_BATCH_SECONDS / 2 and entry_count >= batch_size:
+		batch_size *= 2
+
+	return min(max(batch_size, MIN_BATCH_SIZE), MAX_BATCH_SIZE)
+
+
+def get_doctype_metrics(doctype: str) -> dict:
+	return frappe.cache.hget(metrics_key, doctype) or {}
+
+
+def get_queue_metrics() -> dict[str, dict]:
+	"""Returns pending and dead-letter counts and stats of the last drain for each queued doctype."""
+	doctypes = {get_doctype_name(key) for key in frappe.cache.get_keys(queue_prefix)}
+	doctypes.update(
+		cstr(key).split(dead_letter_prefix)[1] for key in frappe.cache.get_keys(dead_letter_prefix)
+	)
+
+	return {
+		doctype: {
+			**get_doctype_metrics(doctype),
+			"pending": frappe.cache.llen(f"{queue_prefix}{doctype}"),
+			"dead_letters": frappe.cache.llen(f"{dead_letter_prefix}{doctype}"),
+		}
+		for doctype in sorted(doctypes)
+	}
 
 
 def get_key_name(key: str) -> str:
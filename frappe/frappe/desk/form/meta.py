@@ -1,5 +1,6 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
+import copy
 import os
 
 import frappe
@@ -49,7 +50,12 @@ def get_meta(doctype, cached=True) -> "FormMeta":
 
 class FormMeta(Meta):
 	def __init__(self, doctype, *, cached=True):
-		self.__dict__.update(frappe.get_meta(doctype, cached=cached).__dict__)
+		meta = frappe.get_meta(doctype, cached=cached)
+		if cached:
+			# cached Meta is shared with other requests, load_assets modifies its fields
+			meta = copy.deepcopy(meta)
+
+		self.__dict__.update(meta.__dict__)
 		self.load_assets()
 
 	def load_assets(self):
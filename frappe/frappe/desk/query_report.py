@@ -2,6 +2,7 @@
 # License: MIT. See LICENSE
 
 import datetime
+import itertools
 import json
 import os
 from datetime import timedelta
@@ -300,7 +301,13 @@ def get_prepared_report_result(report, filters, dn="", user=None):
 	doc = frappe.get_doc("Prepared Report", dn) if dn else None
 	if doc:
 		try:
-			if data := json.loads(doc.get_prepared_data().decode("utf-8")):
+			if columnar_result := doc.get_columnar_result():
+				with columnar_result:
+					data = get_columnar_report_data(columnar_result)
+			else:
+				data = json.loads(doc.get_prepared_data().decode("utf-8"))
+
+			if data:
 				report_data = get_report_data(doc, data)
 		except Exception as e:
 			doc.log_error("Prepared report render failed")
@@ -357,8 +364,7 @@ def run_export_query_job(user_email: str, form_params, csv_params):
 
 
 def _export_query(form_params, csv_params, populate_response=True):
-	from frappe.desk.utils import get_csv_bytes, provide_binary_file
-	from frappe.utils.xlsxutils import handle_html, make_xlsx
+	from frappe.desk.utils import ExportFile, provide_binary_file
 
 	report_name = form_params.report_name
 	file_format_type = form_params.file_format_type
@@ -382,19 +388,22 @@ def _export_query(form_params, csv_params, populate_response=True):
 		return
 
 	format_fields(data)
-	xlsx_data, column_widths = build_xlsx_data(
+	xlsx_rows, column_widths = get_xlsx_rows(
 		data, visible_idx, include_indentation, include_filters=include_filters
 	)
 
-	if file_format_type == "CSV":
-		content = get_csv_bytes(
-			[[handle_html(frappe.as_unicode(v)) if isinstance(v, str) else v for v in r] for r in xlsx_data],
-			csv_params,
-		)
-		file_extension = "csv"
-	elif file_format_type == "Excel":
-		file_extension = "xlsx"
-		content = make_xlsx(xlsx_data, "Query Report", column_widths=column_widths).getvalue()
+	# rows are converted while they are written instead of building the whole table first
+	file_extension = "csv" if file_format_type == "CSV" else "xlsx"
+	export = ExportFile(
+		file_extension,
+		report_name,
+		csv_params=csv_params,
+		column_widths=column_widths,
+		sheet_name="Query Report",
+		total=len(data.result),
+	)
+	export.writerows(xlsx_rows)
+	content = export.get_content()
 
 	if include_filters:
 		for value in (data.filters or {}).values():
@@ -413,6 +422,24 @@ def _export_query(form_params, csv_params, populate_response=True):
 	provide_binary_file(_(report_name), file_extension, content)
 
 
+def get_columnar_report_data(result) -> dict:
+	"""Returns the whole result, or its first page if it has more rows than the browser shows.
+	Other pages are fetched with `get_prepared_report_page`."""
+	from frappe.core.doctype.prepared_report.prepared_report import PAGE_LENGTH
+
+	max_rows = cint(frappe.get_system_settings("max_report_rows")) or 100_000
+	if result.row_count <= max_rows:
+		return result.get_result()
+
+	rows, row_count = result.get_rows(page_length=PAGE_LENGTH)
+	return result.meta["report"] | {
+		"result": rows,
+		"paged": {"start": 0, "page_length": PAGE_LENGTH, "row_count": row_count},
+		# totals of one page would be misleading
+		"skip_total_row": True,
+	}
+
+
 def valid_report_name(report_name, suffix):
 	if len(report_name) + len(suffix) < 200:
 		return True
@@ -434,6 +461,15 @@ def format_fields(data: frappe._dict) -> None:
 
 
 def build_xlsx_data(data, visible_idx, include_indentation, include_filters=False, ignore_visible_idx=False):
+	rows, column_widths = get_xlsx_rows(
+		data, visible_idx, include_indentation, include_filters, ignore_visible_idx
+	)
+	return list(rows), column_widths
+
+
+def get_xlsx_rows(data, visible_idx, include_indentation, include_filters=False, ignore_visible_idx=False):
+	"""Like `build_xlsx_data`, but returns an iterator that converts the rows of the result as they
+	are read."""
 	EXCEL_TYPES = (
 		str,
 		bool,
@@ -482,30 +518,30 @@ def build_xlsx_data(data, visible_idx, include_indentation, include_filters=Fals
 		column_widths.append(column_width)
 	result.append(column_data)
 
-	# build table from result
-	for row_idx, row in enumerate(data.result):
-		# only pick up rows that are visible in the report
-		if ignore_visible_idx or row_idx in visible_idx:
-			row_data = []
-			if isinstance(row, dict):
-				for col_idx, column in enumerate(data.columns):
-					if column.get("hidden"):
-						continue
-					label = column.get("label")
-					fieldname = column.get("fieldname")
-					cell_value = row.get(fieldname, row.get(label, ""))
-					if not isinstance(cell_value, EXCEL_TYPES):
-						cell_value = cstr(cell_value)
-
-					if cint(include_indentation) and "indent" in row and col_idx == 0:
-						cell_value = ("    " * cint(row["indent"])) + cstr(cell_value)
-					row_data.append(cell_value)
-			elif row:
-				row_data = row
-
-			result.append(row_data)
-
-	return result, column_widths
+	def get_result_rows():
+		for row_idx, row in enumerate(data.result):
+			# only pick up rows that are visible in the report
+			if ignore_visible_idx or row_idx in visible_idx:
+				row_data = []
+				if isinstance(row, dict):
+					for col_idx, column in enumerate(data.columns):
+						if column.get("hidden"):
+							continue
+						label = column.get("label")
+						fieldname = column.get("fieldname")
+						cell_value = row.get(fieldname, row.get(label, ""))
+						if not isinstance(cell_value, EXCEL_TYPES):
+							cell_value = cstr(cell_value)
+
+						if cint(include_indentation) and "indent" in row and col_idx == 0:
+							cell_value = ("    " * cint(row["indent"])) + cstr(cell_value)
+						row_data.append(cell_value)
+				elif row:
+					row_data = row
+
+				yield row_data
+
+	return itertools.chain(result, get_result_rows()), column_widths
 
 
 def add_total_row(result, columns, meta=None, is_tree=False, parent_field=None):
@@ -3,6 +3,8 @@
 
 """build query for doclistview and return results"""
 
+import contextlib
+import hashlib
 import json
 from functools import lru_cache
 
@@ -14,11 +16,15 @@ from frappe import _
 from frappe.core.doctype.access_log.access_log import make_access_log
 from frappe.model import child_table_fields, default_fields, get_permitted_fields, optional_fields
 from frappe.model.base_document import get_controller
-from frappe.model.db_query import DatabaseQuery
+from frappe.model.db_query import DatabaseQuery, Page
 from frappe.model.utils import is_virtual_doctype
 from frappe.utils import add_user_info, cint, format_duration
 from frappe.utils.data import sbool
 
+COUNT_CACHE_KEY = "list_count"
+COUNT_CACHE_TTL = 5 * 60  # seconds
+EXACT_COUNT_THRESHOLD = 100_000  # tables estimated to have fewer rows are counted right away
+
 DISALLOWED_PARAMS = ("cmd", "data", "ignore_permissions", "view", "user", "csrf_token", "join")
 
 
@@ -31,7 +37,10 @@ def get():
 		controller = get_controller(args.doctype)
 		data = compress(controller.get_list(args))
 	else:
-		data = compress(execute(**args), args=args)
+		result = execute(**args)
+		data = compress(result, args=args)
+		if data and isinstance(result, Page):
+			data["after"] = result.after
 	return data
 
 
@@ -59,19 +68,100 @@ def get_count() -> int:
 		controller = get_controller(args.doctype)
 		count = controller.get_count(args)
 	else:
-		args.distinct = sbool(args.distinct)
-		distinct = "distinct " if args.distinct else ""
-		args.limit = cint(args.limit)
-		fieldname = f"{distinct}`tab{args.doctype}`.name"
-		args.order_by = None
-
-		args.fields = [fieldname]
-		partial_query = execute(**args, run=0)
+		partial_query = get_count_query(args)
 		count = frappe.db.sql(f"""select count(*) from ( {partial_query} ) p""")[0][0]
 
 	return count
 
 
+@frappe.whitelist()
+@frappe.read_only()
+def get_count_estimate() -> dict:
+	"""Like `get_count`, but without waiting for an exact count of large tables.
+
+	Returns `{"count": ..., "estimated": False}` if the exact count is cached or the
+	table is small enough to count right away. Otherwise returns the row estimate of
+	the query plan with `"estimated": True` and a `key`, and counts in a background
+	job. The exact count is then published to every user who asked for it while it
+	was being counted as a `list_count` realtime event with the same `key`, and
+	cached for COUNT_CACHE_TTL.
+	"""
+	args = get_form_params()
+
+	if is_virtual_doctype(args.doctype):
+		return {"count": get_controller(args.doctype).get_count(args), "estimated": False}
+
+	partial_query = get_count_query(args)
+	# the query includes permission conditions, so users with the same permissions share counts
+	key = hashlib.sha256(partial_query.encode()).hexdigest()
+
+	count = frappe.cache.get_value(f"{COUNT_CACHE_KEY}:{key}")
+	if count is not None:
+		return {"count": count, "estimated": False}
+
+	estimate = frappe.db.estimate_count(args.doctype)
+	if estimate < EXACT_COUNT_THRESHOLD:
+		return {"count": count_rows(partial_query, key), "estimated": False}
+
+	estimate = min(estimate, frappe.db.estimate_query_count(partial_query))
+	if args.limit:
+		estimate = min(estimate, args.limit)
+
+	# the job is deduplicated, it publishes the count to every user waiting for it
+	users_key = f"{COUNT_CACHE_KEY}:{key}:users"
+	frappe.cache.sadd(users_key, frappe.session.user)
+	frappe.cache.expire(frappe.cache.make_key(users_key), COUNT_CACHE_TTL)
+
+	# counted since the cache was checked, the job may have published before this user was added
+	count = frappe.cache.get_value(f"{COUNT_CACHE_KEY}:{key}")
+	if count is not None:
+		return {"count": count, "estimated": False}
+
+	frappe.enqueue(
+		"frappe.desk.reportview.update_count",
+		queue="short",
+		job_id=f"{COUNT_CACHE_KEY}::{key}",
+		deduplicate=True,
+		partial_query=partial_query,
+		key=key,
+	)
+
+	return {"count": estimate, "estimated": True, "key": key}
+
+
+def get_count_query(args) -> str:
+	"""Returns the query of all names matching `args`, with permission conditions."""
+	args.distinct = sbool(args.distinct)
+	distinct = "distinct " if args.distinct else ""
+	args.limit = cint(args.limit)
+	fieldname = f"{distinct}`tab{args.doctype}`.name"
+	args.order_by = None
+
+	args.fields = [fieldname]
+	args.pop("after", None)
+	return execute(**args, run=0)
+
+
+def count_rows(partial_query: str, key: str) -> int:
+	count = frappe.db.sql(f"""select count(*) from ( {partial_query} ) p""")[0][0]
+	frappe.cache.set_value(f"{COUNT_CACHE_KEY}:{key}", count, expires_in_sec=COUNT_CACHE_TTL)
+	return count
+
+
+def update_count(partial_query: str, key: str):
+	"""Background job, counts the rows of a query estimated by `get_count_estimate`."""
+	count = count_rows(partial_query, key)
+
+	users_key = frappe.cache.make_key(f"{COUNT_CACHE_KEY}:{key}:users")
+	pipeline = frappe.cache.pipeline()
+	pipeline.smembers(users_key)
+	pipeline.delete(users_key)
+	users, _deleted = pipeline.execute()
+
+	for user in sorted(users):
+		frappe.publish_realtime(COUNT_CACHE_KEY, {"key": key, "count": count}, user=user.decode())
+
+
 def execute(doctype, *args, **kwargs):
 	return DatabaseQuery(doctype).execute(*args, **kwargs)
 
@@ -384,8 +474,9 @@ def run_report_view_export_job(user_email, form_params, csv_params):
 
 
 def _export_query(form_params, csv_params, populate_response=True):
-	from frappe.desk.utils import get_csv_bytes, provide_binary_file
-	from frappe.utils.xlsxutils import handle_html, make_xlsx
+	"""Write the rows of a report view to a CSV or XLSX file as they are read from the database,
+	see `ExportFile`."""
+	from frappe.desk.utils import ExportFile, provide_binary_file
 
 	doctype = form_params.pop("doctype")
 	if isinstance(form_params["fields"], list):
@@ -407,51 +498,61 @@ def _export_query(form_params, csv_params, populate_response=True):
 		filters=form_params.filters,
 	)
 
-	db_query = DatabaseQuery(doctype)
-	ret = db_query.execute(**form_params)
-
+	only_own_rows = False
 	if not frappe.permissions.can_export(doctype):
 		if frappe.permissions.can_export(doctype, is_owner=True):
-			for row in ret:
-				if row[-1] != frappe.session.user:
-					raise frappe.PermissionError(
-						_("You are not allowed to export {} doctype").format(doctype)
-					)
+			only_own_rows = True
 		else:
 			raise frappe.PermissionError(_("You are not allowed to export {} doctype").format(doctype))
 
-	if add_totals_row:
-		ret = append_totals_row(ret)
+	db_query = DatabaseQuery(doctype)
+	query = db_query.execute(**form_params, run=0)
 
 	fields_info = get_field_info(db_query.fields, doctype)
-
 	labels = [info["label"] for info in fields_info]
-	data = [[_("Sr"), *labels]]
-	processed_data = []
-
-	if frappe.local.lang == "en" or not translate_values:
-		data.extend([i + 1, *list(row)] for i, row in enumerate(ret))
-	elif translate_values:
+	translatable_fields = None
+	if frappe.local.lang != "en" and translate_values:
 		translatable_fields = [field["translatable"] for field in fields_info]
-		processed_data = []
-		for i, row in enumerate(ret):
-			processed_row = [i + 1] + [
-				_(value) if translatable_fields[idx] else value for idx, value in enumerate(row)
-			]
-			processed_data.append(processed_row)
-		data.extend(processed_data)
-
-	data = handle_duration_fieldtype_values(doctype, data, db_query.fields)
-
-	if file_format_type == "CSV":
-		file_extension = "csv"
-		content = get_csv_bytes(
-			[[handle_html(frappe.as_unicode(v)) if isinstance(v, str) else v for v in r] for r in data],
-			csv_params,
-		)
-	elif file_format_type == "Excel":
-		file_extension = "xlsx"
-		content = make_xlsx(data, doctype).getvalue()
+	duration_fields = get_duration_fields(doctype, db_query.fields)
+
+	file_extension = "csv" if file_format_type == "CSV" else "xlsx"
+	export = ExportFile(
+		file_extension,
+		title,
+		csv_params=csv_params,
+		sheet_name=doctype,
+		total=frappe.db.estimate_query_count(query),
+	)
+	export.writerow([_("Sr"), *labels])
+	totals = [""] * len(labels) if add_totals_row else None
+
+	def write_row(row):
+		if translatable_fields:
+			row = [_(value) if translatable_fields[idx] else value for idx, value in enumerate(row)]
+
+		for idx, hide_days in duration_fields:
+			if row[idx]:
+				row[idx] = format_duration(row[idx], hide_days)
+
+		export.writerow([export.rows, *row])
+
+	# rows are read one at a time, nothing else may query the database until all are read
+	with get_unbuffered_cursor():
+		for row in frappe.db.sql(query, as_list=True, as_iterator=True):
+			if only_own_rows and row[-1] != frappe.session.user:
+				raise frappe.PermissionError(_("You are not allowed to export {} doctype").format(doctype))
+
+			if totals:
+				add_to_totals(totals, row)
+
+			write_row(row)
+
+	if totals and export.rows > 1:
+		if not isinstance(totals[0], int | float):
+			totals[0] = "Total"
+		write_row(totals)
+
+	content = export.get_content()
 
 	if not populate_response:
 		return title, file_extension, content
@@ -459,6 +560,35 @@ def _export_query(form_params, csv_params, populate_response=True):
 	provide_binary_file(_(title), file_extension, content)
 
 
+def get_unbuffered_cursor():
+	if frappe.db.db_type == "mariadb":
+		return frappe.db.unbuffered_cursor()
+
+	return contextlib.nullcontext()
+
+
+def add_to_totals(totals: list, row: list) -> None:
+	for i, value in enumerate(row):
+		if isinstance(value, float | int):
+			totals[i] = (totals[i] or 0) + value
+
+
+def get_duration_fields(doctype: str, fields: list) -> list[tuple[int, bool]]:
+	"""Returns index and `hide_days` of the Duration fields among `fields`."""
+	duration_fields = []
+	for idx, field in enumerate(fields):
+		try:
+			parenttype, fieldname = parse_field(field)
+		except ValueError:
+			continue
+
+		df = frappe.get_meta(parenttype or doctype).get_field(fieldname)
+		if df and df.fieldtype == "Duration":
+			duration_fields.append((idx, df.hide_days))
+
+	return duration_fields
+
+
 def append_totals_row(data):
 	if not data:
 		return data
@@ -530,26 +660,6 @@ def get_field_info(fields, doctype):
 	return field_info
 
 
-def handle_duration_fieldtype_values(doctype, data, fields):
-	for field in fields:
-		try:
-			parenttype, fieldname = parse_field(field)
-		except ValueError:
-			continue
-
-		parenttype = parenttype or doctype
-		df = frappe.get_meta(parenttype).get_field(fieldname)
-
-		if df and df.fieldtype == "Duration":
-			index = fields.index(field) + 1
-			for i in range(1, len(data)):
-				val_in_seconds = data[i][index]
-				if val_in_seconds:
-					duration_val = format_duration(val_in_seconds, df.hide_days)
-					data[i][index] = duration_val
-	return data
-
-
 def parse_field(field: str) -> tuple[str | None, str]:
 	"""Parse a field into parenttype and fieldname."""
 	key = field.split(" as ", 1)[0]
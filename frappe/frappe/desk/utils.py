@@ -1,9 +1,16 @@
 # Copyright (c) 2020, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+import csv
+import tempfile
+from io import StringIO
+from typing import BinaryIO
+
 import frappe
 
 EXPORTED_REPORT_FOLDER_PATH = "Home/Exported Reports"
+EXPORT_SPOOL_SIZE = 5 * 1024 * 1024  # bytes of an export kept in memory before it goes to a temporary file
+EXPORT_PROGRESS_INTERVAL = 10_000  # rows
 
 
 def validate_route_conflict(doctype, name):
@@ -53,8 +60,112 @@ def get_csv_bytes(data: list[list], csv_params: dict) -> bytes:
 	return file.getvalue().encode("utf-8")
 
 
-def provide_binary_file(filename: str, extension: str, content: bytes) -> None:
-	"""Provide a binary file to the client."""
+class ExportFile:
+	"""CSV or XLSX file that the rows of an export are written to one at a time.
+
+	The file stays in memory up to EXPORT_SPOOL_SIZE and is moved to a temporary
+	file after that, XLSX is written with a write-only workbook. Progress is
+	published to the user every EXPORT_PROGRESS_INTERVAL rows, as a percentage of
+	`total` if given.
+
+	>>> export = ExportFile("csv", "ToDo", csv_params)
+	>>> export.writerows(rows)
+	>>> provide_binary_file("ToDo", "csv", export.get_content())
+	"""
+
+	def __init__(
+		self,
+		file_extension: str,
+		title: str,
+		csv_params: dict | None = None,
+		column_widths: list | None = None,
+		sheet_name: str | None = None,
+		total: int | None = None,
+	):
+		self.file_extension = file_extension
+		self.title = title
+		self.total = total
+		self.rows = 0
+		self.file = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE)
+
+		if file_extension == "csv":
+			self.buffer = StringIO()
+			self.csv_writer = csv.writer(self.buffer, **(csv_params or {}))
+		else:
+			import openpyxl
+
+			from frappe.utils.xlsxutils import add_sheet, get_excel_date_format
+
+			self.sheet_name = sheet_name or title
+			self.workbook = openpyxl.Workbook(write_only=True)
+			self.sheet = add_sheet(self.workbook, self.sheet_name, column_widths)
+			self.date_format, self.time_format = get_excel_date_format()
+
+	def writerow(self, row: list) -> None:
+		from frappe.utils.xlsxutils import get_xlsx_row, handle_html
+
+		if self.file_extension == "csv":
+			self.csv_writer.writerow(
+				[handle_html(frappe.as_unicode(v)) if isinstance(v, str) else v for v in row]
+			)
+			if self.buffer.tell() > 64 * 1024:
+				self.flush_csv()
+		else:
+			self.sheet.append(
+				get_xlsx_row(self.sheet, row, self.sheet_name, self.date_format, self.time_format)
+			)
+
+		self.rows += 1
+		if not self.rows % EXPORT_PROGRESS_INTERVAL:
+			self.publish_progress()
+
+	def writerows(self, rows) -> None:
+		for row in rows:
+			self.writerow(row)
+
+	def flush_csv(self) -> None:
+		self.file.write(self.buffer.getvalue().encode("utf-8"))
+		self.buffer.seek(0)
+		self.buffer.truncate()
+
+	def publish_progress(self, percent: float | None = None) -> None:
+		from frappe import _
+
+		if not self.total:
+			return
+
+		if percent is None:
+			# `total` may be an estimate
+			percent = min(self.rows * 100 / self.total, 99)
+
+		frappe.publish_progress(
+			percent,
+			title=_("Exporting {0}").format(_(self.title)),
+			description=_("{0} rows written").format(self.rows),
+		)
+
+	def get_content(self) -> bytes | BinaryIO:
+		"""Finish the file, returns its content if it is still in memory, else the open temporary file."""
+		if self.file_extension == "csv":
+			self.flush_csv()
+		else:
+			self.workbook.save(self.file)
+
+		if self.rows >= EXPORT_PROGRESS_INTERVAL:
+			self.publish_progress(100)
+
+		if self.file.tell() <= EXPORT_SPOOL_SIZE:
+			self.file.seek(0)
+			content = self.file.read()
+			self.file.close()
+			return content
+
+		self.file.seek(0)
+		return self.file
+
+
+def provide_binary_file(filename: str, extension: str, content: bytes | BinaryIO) -> None:
+	"""Provide a binary file to the client, `content` can be an open file to stream."""
 	from frappe import _
 
 	frappe.response["type"] = "binary"
@@ -63,8 +174,12 @@ def provide_binary_file(filename: str, extension: str, content: bytes) -> None:
 
 
 def send_report_email(
-	user_email: str, report_name: str, file_extension: str, content: bytes, attached_to_name: str
+	user_email: str, report_name: str, file_extension: str, content: bytes | BinaryIO, attached_to_name: str
 ):
+	if not isinstance(content, bytes):
+		with content:
+			content = content.read()
+
 	create_exported_report_folder_if_not_exists()
 	_file = frappe.get_doc(
 		{
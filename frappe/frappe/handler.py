@@ -13,6 +13,7 @@ import frappe.utils
 from frappe import _, is_whitelisted, ping
 from frappe.core.doctype.file.utils import find_file_by_url
 from frappe.core.doctype.server_script.server_script_utils import get_server_script_map
+from frappe.database import replica
 from frappe.monitor import add_data_to_monitor
 from frappe.permissions import check_doctype_permission
 from frappe.utils import cint
@@ -82,6 +83,10 @@ def execute_cmd(cmd, from_async=False):
 		is_whitelisted(method)
 		is_valid_http_method(method)
 
+	if replica.should_route(cmd, method):
+		with replica.route_reads():
+			return frappe.call(method, **frappe.form_dict)
+
 	return frappe.call(method, **frappe.form_dict)
 
 
@@ -781,8 +781,11 @@ class BaseDocument:
 
 		return missing
 
-	def get_invalid_links(self, is_submittable=False):
-		"""Returns list of invalid links and also updates fetch values if not set"""
+	def get_invalid_links(self, is_submittable=False, link_values=None):
+		"""Returns list of invalid links and also updates fetch values if not set
+
+		`link_values` are the linked documents prefetched by `prefetch_link_values`,
+		links not found in them are queried one by one."""
 
 		def get_msg(df, docname):
 			# check if parentfield exists (only applicable for child table doctype)
@@ -815,13 +818,11 @@ class BaseDocument:
 				# Readonly or Data or Text type fields
 
 				meta = frappe.get_meta(doctype)
-				fields_to_fetch = [
-					_df
-					for _df in self.meta.get_fields_to_fetch(df.fieldname)
-					if not _df.get("fetch_if_empty")
-					or (_df.get("fetch_if_empty") and not self.get(_df.fieldname))
-				]
-				if not meta.get("is_virtual"):
+				fields_to_fetch = self._get_fields_to_fetch(df)
+				prefetched = get_prefetched_link_value(link_values, doctype, docname, fields_to_fetch)
+				if prefetched:
+					values = prefetched
+				elif not meta.get("is_virtual"):
 					if not fields_to_fetch:
 						# cache a single value type
 						values = _dict(name=frappe.db.get_value(doctype, docname, "name", cache=True))
@@ -857,12 +858,24 @@ class BaseDocument:
 						df.fieldname != "amended_from"
 						and (is_submittable or self.meta.is_submittable)
 						and frappe.get_meta(doctype).is_submittable
-						and DocStatus(frappe.db.get_value(doctype, docname, "docstatus") or 0).is_cancelled()
+						and DocStatus(
+							prefetched.docstatus
+							if prefetched
+							else frappe.db.get_value(doctype, docname, "docstatus") or 0
+						).is_cancelled()
 					):
 						cancelled_links.append((df.fieldname, docname, get_msg(df, docname)))
 
 		return invalid_links, cancelled_links
 
+	def _get_fields_to_fetch(self, df):
+		"""Returns fields fetched from link field `df` that have to be (re)set on this document"""
+		return [
+			_df
+			for _df in self.meta.get_fields_to_fetch(df.fieldname)
+			if not _df.get("fetch_if_empty") or (_df.get("fetch_if_empty") and not self.get(_df.fieldname))
+		]
+
 	def set_fetch_from_value(self, doctype, df, values):
 		fetch_from_fieldname = df.fetch_from.split(".")[-1]
 		value = values[fetch_from_fieldname]
@@ -1304,6 +1317,61 @@ class BaseDocument:
 				extract_images_from_doc(self, df.fieldname)
 
 
+def prefetch_link_values(docs):
+	"""Fetch the documents linked from `docs` with one query per linked DocType.
+
+	Link values of all `docs` (usually a document and its children) are grouped by
+	target DocType and read along with `docstatus` and every column fetched into the
+	documents. Returns `{doctype: (columns, {name: row})}` for `BaseDocument.get_invalid_links`.
+	Single and virtual DocTypes are left to the per link queries of `get_invalid_links`.
+	"""
+	names, columns = {}, {}
+
+	for doc in docs:
+		for df in doc.meta.get_link_fields() + doc.meta.get("fields", {"fieldtype": ("=", "Dynamic Link")}):
+			docname = doc.get(df.fieldname)
+			doctype = df.options if df.fieldtype == "Link" else doc.get(df.options)
+			if not (docname and doctype):
+				continue
+
+			if doctype not in names:
+				meta = frappe.get_meta(doctype)
+				if meta.issingle or meta.get("is_virtual"):
+					continue
+
+				names[doctype] = set()
+				columns[doctype] = {"name", "docstatus"} if meta.is_submittable else {"name"}
+
+			names[doctype].add(docname)
+			columns[doctype].update(_df.fetch_from.split(".")[-1] for _df in doc._get_fields_to_fetch(df))
+
+	link_values = {}
+	for doctype, doctype_names in names.items():
+		valid_columns = set(frappe.get_meta(doctype).get_valid_columns())
+		# unknown columns are left out, their links fall back to (and fail like) a query of their own
+		doctype_columns = sorted(c for c in columns[doctype] if c in valid_columns)
+
+		rows = frappe.db.get_values(
+			doctype, {"name": ("in", list(doctype_names))}, doctype_columns, as_dict=True
+		)
+		link_values[doctype] = (frozenset(doctype_columns), {cstr(row.name): row for row in rows})
+
+	return link_values
+
+
+def get_prefetched_link_value(link_values, doctype, docname, fields_to_fetch):
+	"""Returns a copy of the prefetched row of `docname` if it has every column needed, else None"""
+	if not link_values or doctype not in link_values:
+		return None
+
+	columns, rows = link_values[doctype]
+	row = rows.get(cstr(docname))
+	if not row or not all(_df.fetch_from.split(".")[-1] in columns for _df in fields_to_fetch):
+		return None
+
+	return _dict(row)
+
+
 def _filter(data, filters, limit=None):
 	"""pass filters as:
 	{"key": "val", "key": ["!=", "val"],
@@ -2,11 +2,14 @@
 # License: MIT. See LICENSE
 """build query for doclistview and return results"""
 
+import base64
+import binascii
 import copy
 import datetime
 import json
 import re
-from collections import Counter
+import threading
+from collections import Counter, OrderedDict
 from functools import lru_cache
 
 import sqlparse
@@ -58,6 +61,8 @@ FUNC_IFNULL_PATTERN = re.compile(r"(strpos|ifnull|coalesce)\(\s*[`\"]?name[`\"]?
 CAST_VARCHAR_PATTERN = re.compile(r"([`\"]?tab[\w`\" -]+\.[`\"]?name[`\"]?)(?!\w)", flags=re.IGNORECASE)
 ORDER_BY_PATTERN = re.compile(r"\ order\ by\ |\ asc|\ ASC|\ desc|\ DESC", flags=re.IGNORECASE)
 SUB_QUERY_PATTERN = re.compile("^.*[,();@].*", flags=re.DOTALL)
+MATCH_CONDITIONS_CACHE_SIZE = 5000  # (user, doctype) entries per site and process
+KEYSET_FIELDS = ("_after_value", "_after_name")
 IS_QUERY_PATTERN = re.compile(r"^(select|delete|update|drop|create)\s")
 IS_QUERY_PREDICATE_PATTERN = re.compile(r"\s*[0-9a-zA-z]*\s*( from | group by | order by | where | join )")
 FIELD_QUOTE_PATTERN = re.compile(r"[0-9a-zA-Z]+\s*'")
@@ -68,6 +73,16 @@ ORDER_GROUP_PATTERN = re.compile(r".*[^a-z0-9-_ ,`'\"\.\(\)].*")
 SPECIAL_FIELD_CHARS = frozenset(("(", "`", ".", "'", '"', "*"))
 
 
+class Page(list):
+	"""Rows of a query paged with `after`.
+
+	`after` is the token of the next page, None if this is the last one."""
+
+	def __init__(self, rows, after: str | None = None):
+		super().__init__(rows)
+		self.after = after
+
+
 class DatabaseQuery:
 	def __init__(self, doctype, user=None):
 		self.doctype = doctype
@@ -130,7 +145,15 @@ class DatabaseQuery:
 		ignore_ddl=False,
 		*,
 		parent_doctype=None,
+		after=None,
 	) -> list:
+		"""Returns the rows of `doctype` matching the filters that the user can read.
+
+		Pass `after` to page by the sort key instead of `limit_start`: an empty string for
+		the first page, then the `after` attribute of the returned `Page`. Deep pages are
+		as fast as the first one, but `order_by` can have only one column, optionally
+		followed by `name`, and no `group_by`.
+		"""
 		if not ignore_permissions:
 			self.check_read_permission(self.doctype, parent_doctype=parent_doctype)
 
@@ -177,6 +200,8 @@ class DatabaseQuery:
 		self.strict = strict
 		self.ignore_ddl = ignore_ddl
 		self.parent_doctype = parent_doctype
+		self.after = after
+		self.next_after = None
 
 		# for contextual user permission check
 		# to determine which user permission is applicable on link field of specific doctype
@@ -219,7 +244,10 @@ class DatabaseQuery:
 			self.update_user_settings()
 
 		if pluck:
-			return [d[pluck] for d in result]
+			result = [d[pluck] for d in result]
+
+		if self.after is not None and self.run:
+			return Page(result, after=self.next_after)
 
 		return result
 
@@ -252,7 +280,7 @@ from {tables}
 {order_by}
 {limit}""".format(**args)
 
-		return frappe.db.sql(
+		result = frappe.db.sql(
 			query,
 			as_dict=not self.as_list,
 			debug=self.debug,
@@ -261,6 +289,11 @@ from {tables}
 			run=self.run,
 		)
 
+		if self.after is not None and self.run:
+			result = self.pop_keyset_values(result)
+
+		return result
+
 	def prepare_args(self):
 		self.parse_args()
 		self.sanitize_fields()
@@ -325,6 +358,8 @@ from {tables}
 		args.fields = ", ".join(fields)
 
 		self.set_order_by(args)
+		if self.after is not None:
+			self.set_keyset_pagination(args)
 
 		self.validate_order_by_and_group_by(args.order_by)
 		args.order_by = (args.order_by and (" order by " + args.order_by)) or ""
@@ -992,14 +1027,8 @@ from {tables}
 		if not self.tables:
 			self.extract_tables()
 
-		role_permissions = frappe.permissions.get_role_permissions(self.doctype_meta, user=self.user)
-		if (
-			not self.doctype_meta.istable
-			and not (role_permissions.get("select") or role_permissions.get("read"))
-			and not self.flags.ignore_permissions
-			and not has_any_user_permission_for_doctype(self.doctype, self.user, self.reference_doctype)
-		):
-			only_if_shared = True
+		only_if_shared = self.compile_match_conditions()
+		if only_if_shared:
 			self.shared = frappe.share.get_shared(self.doctype, self.user)
 			if not self.shared:
 				frappe.throw(_("No permission to read {0}").format(_(self.doctype)), frappe.PermissionError)
@@ -1007,19 +1036,6 @@ from {tables}
 				self.conditions.append(self.get_share_condition())
 
 		else:
-			# skip user perm check if owner constraint is required
-			if requires_owner_constraint(role_permissions):
-				self._fetch_shared_documents = True
-				self.match_conditions.append(
-					f"`tab{self.doctype}`.`owner` = {frappe.db.escape(self.user, percent=False)}"
-				)
-
-			# add user permission only if role has read perm
-			elif role_permissions.get("read") or role_permissions.get("select"):
-				# get user permissions
-				user_permissions = frappe.permissions.get_user_permissions(self.user)
-				self.add_user_permissions(user_permissions)
-
 			# Only when full read access is not present fetch shared docuemnts.
 			# This is done to avoid extra query.
 			# Only following cases can require explicit addition of shared documents.
@@ -1047,6 +1063,68 @@ from {tables}
 		else:
 			return self.match_filters
 
+	def compile_match_conditions(self) -> bool:
+		"""Set match conditions and filters from role and user permissions, returns True if only
+		shared documents can be read.
+
+		The result is kept per user and doctype in the process until the permission version of the site
+		or the user changes, see `MatchConditionsCache`."""
+		cache = get_match_conditions_cache()
+		user_version = cache and frappe.permissions.get_user_permission_version(self.user)
+		if user_version is None:
+			cache = None
+
+		key = (
+			self.user,
+			user_version,
+			self.doctype,
+			self.reference_doctype,
+			bool(self.flags.ignore_permissions),
+			bool(frappe.get_system_settings("apply_strict_user_permissions")),
+		)
+
+		if cache and (cached := cache.get(key)):
+			match_conditions, match_filters, self._fetch_shared_documents, only_if_shared = cached
+			self.match_conditions = list(match_conditions)
+			self.match_filters = copy.deepcopy(match_filters)
+			return only_if_shared
+
+		only_if_shared = False
+		role_permissions = frappe.permissions.get_role_permissions(self.doctype_meta, user=self.user)
+		if (
+			not self.doctype_meta.istable
+			and not (role_permissions.get("select") or role_permissions.get("read"))
+			and not self.flags.ignore_permissions
+			and not has_any_user_permission_for_doctype(self.doctype, self.user, self.reference_doctype)
+		):
+			only_if_shared = True
+
+		# skip user perm check if owner constraint is required
+		elif requires_owner_constraint(role_permissions):
+			self._fetch_shared_documents = True
+			self.match_conditions.append(
+				f"`tab{self.doctype}`.`owner` = {frappe.db.escape(self.user, percent=False)}"
+			)
+
+		# add user permission only if role has read perm
+		elif role_permissions.get("read") or role_permissions.get("select"):
+			# get user permissions
+			user_permissions = frappe.permissions.get_user_permissions(self.user)
+			self.add_user_permissions(user_permissions)
+
+		if cache:
+			cache.set(
+				key,
+				(
+					tuple(self.match_conditions),
+					copy.deepcopy(self.match_filters),
+					self._fetch_shared_documents,
+					only_if_shared,
+				),
+			)
+
+		return only_if_shared
+
 	def get_share_condition(self):
 		return (
 			cast_name(f"`tab{self.doctype}`.name")
@@ -1224,6 +1302,75 @@ from {tables}
 				if re.search(r"\b" + re.escape(func) + r"\W*\(", field.lower()):
 					frappe.throw(_("Cannot use {0} in order/group by").format(field))
 
+	def set_keyset_pagination(self, args):
+		"""Order by the sort column and `name`, select both to make the token of the next page and
+		replace the offset by a condition on the sort key of the last row of the previous page."""
+		if self.group_by:
+			frappe.throw(_("Cannot page with {0} when grouping").format("after"))
+
+		# the sort key is selected too, so distinct rows wouldn't be distinct in the requested fields
+		if self.distinct:
+			frappe.throw(_("Cannot page with {0} when selecting distinct rows").format("after"))
+
+		sort_column, sort_order = self.get_keyset_order(args.order_by)
+		name = f"`tab{self.doctype}`.`name`"
+		column = f"`tab{self.doctype}`.`{sort_column}`"
+
+		args.order_by = f"{column} {sort_order}"
+		if sort_column != "name":
+			args.order_by += f", {name} {sort_order}"
+		args.fields += f", {column} as {KEYSET_FIELDS[0]}, {name} as {KEYSET_FIELDS[1]}"
+		self.limit_start = 0
+		self.keyset_column = sort_column
+
+		if not self.after:
+			return
+
+		value, last_name = decode_after(self.after, sort_column)
+		operator = ">" if sort_order == "asc" else "<"
+		last_name = frappe.db.escape(cstr(last_name))
+		if sort_column == "name":
+			condition = f"{name} {operator} {last_name}"
+		else:
+			value = frappe.db.escape(cstr(value))
+			condition = (
+				f"({column} {operator} {value} or ({column} = {value} and {name} {operator} {last_name}))"
+			)
+
+		args.conditions = f"({args.conditions}) and {condition}" if args.conditions else condition
+
+	def get_keyset_order(self, order_by: str) -> tuple[str, str]:
+		"""Returns column and direction of an order by on one column of this doctype and `name`."""
+		keys = []
+		for key in (order_by or "name asc").split(","):
+			column, _, direction = key.strip().partition(" ")
+			column = column.replace(f"`tab{self.doctype}`.", "").strip("`")
+			keys.append((column, direction.strip().lower() or "asc"))
+
+		column, direction = keys[0]
+		if (
+			column not in self.columns
+			or direction not in ("asc", "desc")
+			or keys[1:] not in ([], [("name", direction)])
+		):
+			frappe.throw(_("Cannot page with {0} when sorting by {1}").format("after", order_by))
+
+		return column, direction
+
+	def pop_keyset_values(self, result: list) -> list:
+		"""Remove the selected sort keys from `result` and keep the token of the next page."""
+		if self.as_list:
+			keys = [row[-2:] for row in result]
+			result = [row[:-2] for row in result]
+		else:
+			keys = [tuple(row.pop(field) for field in KEYSET_FIELDS) for row in result]
+
+		# a short page is the last one
+		if keys and self.limit_page_length and len(keys) == self.limit_page_length:
+			self.next_after = encode_after(self.keyset_column, *keys[-1])
+
+		return result
+
 	def add_limit(self):
 		if self.limit_page_length:
 			return f"limit {self.limit_page_length} offset {self.limit_start}"
@@ -1332,6 +1479,104 @@ def get_order_by(doctype, meta):
 	return order_by
 
 
+def encode_after(column: str, value, name: str) -> str:
+	"""Returns the opaque token of the page after the row with sort `value` and `name`."""
+	return base64.urlsafe_b64encode(json.dumps([column, value, name], default=str).encode()).decode()
+
+
+def decode_after(after: str, column: str) -> tuple:
+	try:
+		token_column, value, name = json.loads(base64.urlsafe_b64decode(after.encode()))
+	except (binascii.Error, ValueError, TypeError):
+		frappe.throw(_("Invalid value for {0}: {1}").format("after", after))
+
+	if token_column != column:
+		frappe.throw(_("Cannot use {0} of a list sorted by {1}").format("after", token_column))
+
+	if value is None:
+		frappe.throw(_("Cannot page by {0} after a row without it").format(column))
+
+	return value, name
+
+
+class MatchConditionsCache:
+	"""LRU of match conditions compiled by `DatabaseQuery.compile_match_conditions`, shared by all
+	requests a process serves for one site.
+
+	Entries belong to one permission version (see `frappe.permissions.get_permission_version`)
+	and are dropped once a request sees another one. Keys include the permission version of their
+	user, so entries of a user whose roles or user permissions changed are no longer used and age
+	out of the LRU.
+	"""
+
+	__slots__ = ("entries", "hits", "lock", "misses", "version")
+
+	def __init__(self):
+		self.entries = OrderedDict()
+		self.version = None
+		self.hits = self.misses = 0
+		self.lock = threading.Lock()
+
+	def validate(self, version: int):
+		with self.lock:
+			if version != self.version:
+				self.entries.clear()
+				self.version = version
+
+	def get(self, key):
+		with self.lock:
+			if (value := self.entries.get(key)) is None:
+				self.misses += 1
+				return None
+
+			self.entries.move_to_end(key)
+			self.hits += 1
+			return value
+
+	def set(self, key, value):
+		with self.lock:
+			self.entries[key] = value
+			if len(self.entries) > MATCH_CONDITIONS_CACHE_SIZE:
+				self.entries.popitem(last=False)
+
+	def get_info(self) -> dict:
+		lookups = self.hits + self.misses
+		return {
+			"entries": len(self.entries),
+			"version": self.version,
+			"hits": self.hits,
+			"misses": self.misses,
+			"hit_rate": round(self.hits / lookups, 3) if lookups else None,
+		}
+
+
+_match_conditions_cache: dict[str, MatchConditionsCache] = {}
+
+
+def get_match_conditions_cache() -> MatchConditionsCache | None:
+	"""Returns this site's cache of match conditions, checked against the permission version once per
+	request. None while installing or migrating and when Redis is unreachable."""
+	if frappe.flags.in_install or frappe.flags.in_migrate:
+		return None
+
+	version = frappe.permissions.get_permission_version()
+	if version is None:
+		return None
+
+	site = frappe.local.site
+	if (cache := _match_conditions_cache.get(site)) is None:
+		cache = _match_conditions_cache.setdefault(site, MatchConditionsCache())
+
+	cache.validate(version)
+	return cache
+
+
+def get_match_conditions_cache_info() -> dict | None:
+	"""Returns entry count and hit rate of this site's cache of match conditions."""
+	if cache := _match_conditions_cache.get(frappe.local.site):
+		return cache.get_info()
+
+
 def has_any_user_permission_for_doctype(doctype, user, applicable_for):
 	user_permissions = frappe.permissions.get_user_permissions(user=user)
 	doctype_user_permissions = user_permissions.get(doctype, [])
@@ -15,7 +15,7 @@ from frappe.core.doctype.server_script.server_script_utils import run_server_scr
 from frappe.desk.form.document_follow import follow_document
 from frappe.integrations.doctype.webhook import run_webhooks
 from frappe.model import optional_fields, table_fields
-from frappe.model.base_document import BaseDocument, get_controller
+from frappe.model.base_document import BaseDocument, get_controller, prefetch_link_values
 from frappe.model.docstatus import DocStatus
 from frappe.model.naming import set_new_name, validate_name
 from frappe.model.utils import is_virtual_doctype
@@ -281,6 +281,37 @@ class Document(BaseDocument):
 		if self.flags.in_print:
 			return self
 
+		self._run_before_insert(
+			ignore_permissions=ignore_permissions,
+			ignore_links=ignore_links,
+			ignore_mandatory=ignore_mandatory,
+			set_name=set_name,
+			set_child_names=set_child_names,
+		)
+
+		# parent
+		if getattr(self.meta, "issingle", 0):
+			self.update_single(self.get_valid_dict())
+		else:
+			self.db_insert(ignore_if_duplicate=ignore_if_duplicate)
+
+		# children
+		for d in self.get_all_children():
+			d.db_insert()
+
+		self._run_after_insert()
+		return self
+
+	def _run_before_insert(
+		self,
+		ignore_permissions=None,
+		ignore_links=None,
+		ignore_mandatory=None,
+		set_name=None,
+		set_child_names=True,
+	):
+		"""Run everything `insert` does before writing the document: defaults, naming,
+		permission checks, `before_insert`, `validate` and `before_save`/`before_submit`."""
 		self.flags.notifications_executed = []
 
 		if ignore_permissions is not None:
@@ -311,18 +342,9 @@ class Document(BaseDocument):
 		self.set_docstatus()
 		self.flags.in_insert = False
 
-		# run validate, on update etc.
-
-		# parent
-		if getattr(self.meta, "issingle", 0):
-			self.update_single(self.get_valid_dict())
-		else:
-			self.db_insert(ignore_if_duplicate=ignore_if_duplicate)
-
-		# children
-		for d in self.get_all_children():
-			d.db_insert()
-
+	def _run_after_insert(self):
+		"""Run everything `insert` does after writing the document: `after_insert`,
+		`on_update`/`on_submit`, versions and notifications."""
 		self.run_method("after_insert")
 		self.flags.in_insert = True
 
@@ -345,7 +367,6 @@ class Document(BaseDocument):
 		if not (frappe.flags.in_migrate or frappe.local.flags.in_install or frappe.flags.in_setup_wizard):
 			if frappe.get_cached_value("User", frappe.session.user, "follow_created_documents"):
 				follow_document(self.doctype, self.name, frappe.session.user)
-		return self
 
 	def check_if_locked(self):
 		if not self.creation or not self.is_locked:
@@ -967,10 +988,12 @@ class Document(BaseDocument):
 		if self.flags.ignore_links or self._action == "cancel":
 			return
 
-		invalid_links, cancelled_links = self.get_invalid_links()
+		children = self.get_all_children()
+		link_values = prefetch_link_values([self, *children])
+		invalid_links, cancelled_links = self.get_invalid_links(link_values=link_values)
 
-		for d in self.get_all_children():
-			result = d.get_invalid_links(is_submittable=self.meta.is_submittable)
+		for d in children:
+			result = d.get_invalid_links(is_submittable=self.meta.is_submittable, link_values=link_values)
 			invalid_links.extend(result[0])
 			cancelled_links.extend(result[1])
 
@@ -17,9 +17,13 @@ Example:
 
 import json
 import os
+import pickle
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
 import click
+import redis
 
 import frappe
 from frappe import _, _lt
@@ -63,16 +67,158 @@ LARGE_TABLE_SIZE_THRESHOLD = 100_000
 LARGE_TABLE_RECENCY_THRESHOLD = 30  # days
 
 
+DEFAULT_PROCESS_CACHE_SIZE = 500  # Meta objects per site
+DEFAULT_PROCESS_CACHE_MEMORY = 64  # MB per site
+SCHEMA_VERSION_KEY = "doctype_meta_version"
+
+# Meta objects reused by this process across requests, {site: MetaProcessCache}
+_process_cache: dict[str, "MetaProcessCache"] = {}
+
+
 def get_meta(doctype, cached=True) -> "Meta":
 	cached = cached and isinstance(doctype, str)
-	if cached and (meta := frappe.cache.hget("doctype_meta", doctype)):
+	if not cached:
+		meta = Meta(doctype)
+		frappe.cache.hset("doctype_meta", meta.name, meta)
 		return meta
 
-	meta = Meta(doctype)
-	frappe.cache.hset("doctype_meta", meta.name, meta)
+	process_cache = get_process_cache()
+	if process_cache and (meta := process_cache.get(doctype)):
+		return meta
+
+	if not (meta := frappe.cache.hget("doctype_meta", doctype)):
+		meta = Meta(doctype)
+		frappe.cache.hset("doctype_meta", meta.name, meta)
+
+	if process_cache:
+		process_cache.set(doctype, meta)
+
 	return meta
 
 
+class MetaProcessCache:
+	"""LRU of Meta objects shared by all requests a process serves for one site.
+
+	The same Meta object is returned to every request, so treat it as read-only
+	and copy it before modifying it, as FormMeta does. Entries belong to one
+	schema version, the counter at `SCHEMA_VERSION_KEY` in Redis that
+	`clear_doctype_cache` increments. The counter is read once per request and
+	the whole cache is dropped when it moved, so a process only goes back to
+	Redis after a schema change. Entries are evicted least recently used first
+	once the cache holds more than `max_entries` objects or more than
+	`max_memory` bytes, measured by the pickled size of each Meta.
+	"""
+
+	def __init__(self, max_entries, max_memory):
+		self.max_entries = max_entries
+		self.max_memory = max_memory
+		self.version = None
+		self.entries = OrderedDict()  # doctype: (meta, pickled size)
+		self.memory = 0
+		self.hits = self.misses = self.evictions = 0
+		self.lock = threading.Lock()
+
+	def validate(self, version):
+		with self.lock:
+			if version != self.version:
+				self.clear()
+				self.version = version
+
+	def get(self, doctype) -> "Meta | None":
+		with self.lock:
+			if entry := self.entries.get(doctype):
+				self.entries.move_to_end(doctype)
+				self.hits += 1
+				return entry[0]
+
+			self.misses += 1
+
+	def set(self, doctype, meta):
+		size = len(pickle.dumps(meta, protocol=pickle.HIGHEST_PROTOCOL))
+
+		with self.lock:
+			if previous := self.entries.pop(doctype, None):
+				self.memory -= previous[1]
+
+			self.entries[doctype] = (meta, size)
+			self.memory += size
+
+			while self.entries and (len(self.entries) > self.max_entries or self.memory > self.max_memory):
+				_doctype, (_meta, evicted_size) = self.entries.popitem(last=False)
+				self.memory -= evicted_size
+				self.evictions += 1
+
+	def clear(self):
+		self.entries.clear()
+		self.memory = 0
+
+	def get_info(self):
+		return {
+			"version": self.version,
+			"entries": len(self.entries),
+			"memory": self.memory,
+			"max_entries": self.max_entries,
+			"max_memory": self.max_memory,
+			"hits": self.hits,
+			"misses": self.misses,
+			"evictions": self.evictions,
+		}
+
+
+def get_process_cache() -> MetaProcessCache | None:
+	"""Returns this site's process cache of Meta objects, checked against the schema version once per request.
+
+	Disabled by setting `meta_process_cache_size` to 0 in site config."""
+	if not getattr(frappe.local, "site", None) or frappe.flags.in_install or frappe.flags.in_migrate:
+		return None
+
+	conf = frappe.local.conf
+	max_entries = cint(conf.get("meta_process_cache_size", DEFAULT_PROCESS_CACHE_SIZE))
+	if max_entries <= 0:
+		return None
+
+	process_cache = _process_cache.get(frappe.local.site)
+	if not process_cache:
+		max_memory = cint(conf.get("meta_process_cache_memory", DEFAULT_PROCESS_CACHE_MEMORY)) * 1024 * 1024
+		process_cache = _process_cache.setdefault(
+			frappe.local.site, MetaProcessCache(max_entries, max_memory)
+		)
+
+	if getattr(frappe.local, "meta_schema_version", None) is None:
+		try:
+			version = frappe.cache.get(frappe.cache.make_key(SCHEMA_VERSION_KEY))
+		except redis.exceptions.ConnectionError:
+			# without the version there is no telling whether cached Meta is current
+			return None
+
+		frappe.local.meta_schema_version = cint(version.decode() if version else 0)
+		process_cache.validate(frappe.local.meta_schema_version)
+
+	return process_cache
+
+
+def bump_schema_version():
+	"""Invalidate Meta objects cached by every process of this site."""
+	if process_cache := _process_cache.get(frappe.local.site):
+		with process_cache.lock:
+			process_cache.clear()
+
+	try:
+		frappe.local.meta_schema_version = frappe.cache.incr(frappe.cache.make_key(SCHEMA_VERSION_KEY))
+	except redis.exceptions.ConnectionError:
+		frappe.local.meta_schema_version = None
+		return
+
+	if process_cache:
+		process_cache.validate(frappe.local.meta_schema_version)
+
+
+def get_process_cache_info() -> dict | None:
+	"""Returns entry count, memory use and hit rate of this site's process cache of Meta objects."""
+	if process_cache := _process_cache.get(frappe.local.site):
+		return process_cache.get_info()
+
+
 def load_meta(doctype):
 	return Meta(doctype)
 
@@ -3,9 +3,13 @@
 
 import base64
 import datetime
+import os
 import re
+import threading
 import time
 from collections.abc import Callable
+from contextlib import contextmanager
+from functools import partial
 from typing import TYPE_CHECKING, Optional
 
 import frappe
@@ -23,6 +27,10 @@ if TYPE_CHECKING:
 NAMING_SERIES_PATTERN = re.compile(r"^[\w\- \/.#{}]+$", re.UNICODE)
 BRACED_PARAMS_PATTERN = re.compile(r"(\{[\w | #]+\})")
 
+# series numbers reserved by this process, {(pid, site, series): [next, last]}
+_series_blocks: dict[tuple[int, str, str], list[int]] = {}
+_series_blocks_lock = threading.Lock()
+
 
 # Types that can be using in naming series fields
 NAMING_SERIES_PART_TYPES = (
@@ -329,7 +337,7 @@ def parse_naming_series(
 		parts = parts.split(".")
 
 	if not number_generator:
-		number_generator = getseries
+		number_generator = get_series_generator(doctype or getattr(doc, "doctype", None))
 
 	series_set = False
 	today = now_datetime()
@@ -389,7 +397,94 @@ def determine_consecutive_week_number(datetime):
 	return w
 
 
+def get_series_generator(doctype: str | None) -> Callable[[str, int], str]:
+	"""Returns the counter backend for series numbers of `doctype`"""
+	if block_size := get_series_block_size(doctype):
+		return partial(getseries_from_block, block_size=block_size)
+
+	return getseries
+
+
+def get_series_block_size(doctype: str | None) -> int:
+	"""Returns how many series numbers a process reserves at a time for `doctype`, 0 if it doesn't.
+
+	Configured with the `naming_series_block_size` hook or site config key, e.g.
+	`{"Employee Checkin": 100}`. The site config takes precedence.
+	"""
+	if not doctype:
+		return 0
+
+	if doctype in (site_sizes := frappe.conf.get("naming_series_block_size") or {}):
+		return cint(site_sizes[doctype])
+
+	sizes = frappe.get_hooks("naming_series_block_size", {}).get(doctype)
+	return cint(sizes[-1]) if sizes else 0
+
+
+def getseries_from_block(key, digits, block_size):
+	"""Hand out numbers of series `key` from a block reserved by this process.
+
+	A block of `block_size` numbers is reserved in a transaction of its own, so
+	concurrent inserts don't wait for each other's `tabSeries` row lock. Numbers are
+	unique but not gap free: numbers of rolled back inserts and blocks left over when
+	a process exits are never used, and names of different processes interleave. Only
+	configure this for DocTypes that can live with that, and don't share their series
+	with other DocTypes.
+	"""
+	block_key = (os.getpid(), frappe.local.site, key)
+
+	with _series_blocks_lock:
+		block = _series_blocks.get(block_key)
+		if not block or block[0] > block[1]:
+			first = _reserve_series_block(key, block_size)
+			block = _series_blocks[block_key] = [first, first + block_size - 1]
+
+		current = block[0]
+		block[0] += 1
+
+	return ("%0" + str(digits) + "d") % current
+
+
+def _reserve_series_block(key, block_size):
+	from frappe.database import get_db
+
+	conf = frappe.local.conf
+	db = get_db(
+		socket=conf.db_socket,
+		host=conf.db_host,
+		port=conf.db_port,
+		user=conf.db_name,
+		password=conf.db_password,
+		cur_db_name=conf.db_name,
+	)
+
+	try:
+		current = db.sql("SELECT `current` FROM `tabSeries` WHERE `name`=%s FOR UPDATE", (key,))
+		if current and current[0][0] is not None:
+			db.sql("UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name`=%s", (block_size, key))
+			first = cint(current[0][0]) + 1
+		else:
+			db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (key, block_size))
+			first = 1
+		db.commit()
+	finally:
+		db.close()
+
+	return first
+
+
 def getseries(key, digits):
+	reservations = getattr(frappe.local, "series_reservations", None)
+	if reservations is not None:
+		current = _get_reserved_number(reservations, key)
+	else:
+		current = _increment_series(key, 1)
+
+	return ("%0" + str(digits) + "d") % current
+
+
+def _increment_series(key, count):
+	"""Move the counter of series `key` ahead by `count` and return the first new number"""
 	# series created ?
 	# Using frappe.qb as frappe.get_values does not allow order_by=None
 	series = DocType("Series")
@@ -398,13 +493,52 @@ def getseries(key, digits):
 	if current and current[0][0] is not None:
 		current = current[0][0]
 		# yes, update it
-		frappe.db.sql("UPDATE `tabSeries` SET `current` = `current` + 1 WHERE `name`=%s", (key,))
-		current = cint(current) + 1
+		frappe.db.sql("UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name`=%s", (count, key))
+		return cint(current) + 1
 	else:
 		# no, create it
-		frappe.db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, 1)", (key,))
-		current = 1
-	return ("%0" + str(digits) + "d") % current
+		frappe.db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (key, count))
+		return 1
+
+
+def _get_reserved_number(reservations, key):
+	reservation = reservations["series"].get(key)
+	if not reservation or reservation[0] > reservation[1]:
+		first = _increment_series(key, reservations["count"])
+		reservation = reservations["series"][key] = [first, first + reservations["count"] - 1]
+
+	current = reservation[0]
+	reservation[0] += 1
+	return current
+
+
+@contextmanager
+def reserve_series_numbers(count: int):
+	"""Hand out the numbers of every naming series used within this block in blocks of `count`.
+
+	The first name of a series moves its counter ahead by `count` with one UPDATE and
+	later names are served from memory. The UPDATE keeps the series row locked until
+	the transaction ends, so numbers still unused when the block exits are given back
+	and no gaps are left.
+
+	Usage:
+	        with reserve_series_numbers(len(docs)):
+	                for doc in docs:
+	                        set_new_name(doc)
+	"""
+	previous = getattr(frappe.local, "series_reservations", None)
+	reservations = frappe.local.series_reservations = {"count": max(cint(count), 1), "series": {}}
+
+	try:
+		yield
+	finally:
+		frappe.local.series_reservations = previous
+		for key, (next_number, last_number) in reservations["series"].items():
+			if next_number <= last_number:
+				frappe.db.sql(
+					"UPDATE `tabSeries` SET `current` = %s WHERE `name`=%s AND `current` = %s",
+					(next_number - 1, key, last_number),
+				)
 
 
 def revert_series_if_last(key, name, doc=None):
@@ -432,6 +566,10 @@ def revert_series_if_last(key, name, doc=None):
 	                * prefix = #### and hashes = 2021 (hash doesn't exist)
 	                * will search hash in key then accordingly get prefix = ""
 	"""
+	if doc and get_series_block_size(doc.doctype):
+		# other processes may still hand out numbers below the counter
+		return
+
 	if ".#" in key:
 		prefix, hashes = key.rsplit(".", 1)
 		if "#" not in hashes:
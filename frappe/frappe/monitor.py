@@ -2,13 +2,17 @@
 # License: MIT. See LICENSE
 
 import datetime
+import hmac
 import json
 import os
+import threading
+import time
 import traceback
 import uuid
 
 import pytz
 import rq
+from werkzeug.wrappers import Response
 
 import frappe
 from frappe.utils.data import cint
@@ -17,8 +21,32 @@ from frappe.utils.synchronization import filelock
 MONITOR_REDIS_KEY = "monitor-transactions"
 MONITOR_MAX_ENTRIES = 1000000
 
+AGGREGATE_REDIS_KEY = "monitor-aggregates"
+AGGREGATE_FLUSH_INTERVAL = 30  # seconds
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+# label of requests for methods, doctypes and pages that don't exist, so that they can't add series
+OTHER_ENDPOINT = "other"
+METRICS_TOKEN_HEADER = "X-Frappe-Monitor-Token"
+
+# histogram name: (monitor field, scale to unit, buckets, help)
+AGGREGATE_METRICS = {
+	"duration_seconds": ("duration", 1e-6, SECONDS_BUCKETS, "Time taken by the transaction"),
+	"db_seconds": ("db_time", 1e-6, SECONDS_BUCKETS, "Time spent in database queries"),
+	"queries": ("queries", 1, COUNT_BUCKETS, "Number of database queries"),
+	"redis_seconds": ("redis_time", 1e-6, SECONDS_BUCKETS, "Time spent in Redis commands"),
+}
+
 
 def start(transaction_type="request", method=None, kwargs=None):
+	"""Start monitoring the current request or job if `monitor` is set in site config.
+
+	By default every transaction is pushed to Redis and written to
+	logs/monitor.json.log by `flush`. With `"monitor": "aggregate"` only
+	histograms per endpoint / job method are kept in the process and added to
+	Redis every AGGREGATE_FLUSH_INTERVAL seconds, see `metrics`. Any other value
+	is the dotted path of a function that is called with each transaction's data.
+	"""
 	if frappe.conf.monitor:
 		frappe.local.monitor = Monitor(transaction_type, method, kwargs)
 
@@ -28,6 +56,57 @@ def stop(response=None):
 		frappe.local.monitor.dump(response)
 
 
+class Counters:
+	"""Query, row and Redis counters of the current request or job.
+
+	Unlike the recorder these only add a few integers per query, so they are always
+	kept on `frappe.local.counters`. They are sent as a `Server-Timing` header and
+	added to the monitor log.
+	"""
+
+	__slots__ = (
+		"cache_hits",
+		"cache_misses",
+		"db_time",
+		"queries",
+		"redis_calls",
+		"redis_time",
+		"rows",
+		"start",
+	)
+
+	def __init__(self):
+		self.start = time.perf_counter()
+		self.queries = self.rows = self.redis_calls = self.cache_hits = self.cache_misses = 0
+		self.db_time = self.redis_time = 0.0
+
+	def as_dict(self) -> dict:
+		"""Counters for the monitor log, times in microseconds like `duration`."""
+		return {
+			"queries": self.queries,
+			"db_time": int(self.db_time * 1000000),
+			"rows": self.rows,
+			"redis_calls": self.redis_calls,
+			"redis_time": int(self.redis_time * 1000000),
+			"cache_hits": self.cache_hits,
+			"cache_misses": self.cache_misses,
+		}
+
+	def server_timing(self) -> str:
+		return ", ".join(
+			(
+				f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries, {self.rows} rows"',
+				f'redis;dur={self.redis_time * 1000:.1f};desc="{self.redis_calls} calls, '
+				f'{self.cache_hits} hits, {self.cache_misses} misses"',
+				f"total;dur={(time.perf_counter() - self.start) * 1000:.1f}",
+			)
+		)
+
+
+def get_counters() -> Counters | None:
+	return getattr(frappe.local, "counters", None)
+
+
 def add_data_to_monitor(**kwargs) -> None:
 	"""Add additional custom key-value pairs along with monitor log.
 	Note: Key-value pairs should be simple JSON exportable types."""
@@ -98,6 +177,8 @@ class Monitor:
 			timediff = datetime.datetime.now(pytz.UTC) - self.data.timestamp
 			# Obtain duration in microseconds
 			self.data.duration = int(timediff.total_seconds() * 1000000)
+			if counters := get_counters():
+				self.data.update(counters.as_dict())
 
 			if self.data.transaction_type == "request":
 				if response:
@@ -112,10 +193,34 @@ class Monitor:
 					if limiter.rejected:
 						self.data.request.reset = limiter.reset
 
-			self.store()
+			mode = frappe.conf.monitor
+			if mode == "aggregate":
+				get_aggregator().add(self)
+			elif isinstance(mode, str) and "." in mode:
+				frappe.get_attr(mode)(self.data)
+			else:
+				self.store()
 		except Exception:
 			traceback.print_exc()
 
+	def get_endpoint(self) -> str:
+		"""Name to aggregate the transaction by, with document names left out to keep the series few."""
+		if self.data.transaction_type != "request":
+			return self.data.job.method
+
+		if self.data.request.get("status_code") == 404:
+			return OTHER_ENDPOINT
+
+		path = self.data.request.path.rstrip("/") or "/"
+		parts = path.split("/")
+		if path.startswith("/api/method/"):
+			return f"/api/method/{parts[3]}" if is_whitelisted_method(parts[3]) else OTHER_ENDPOINT
+		if path.startswith("/api/resource/"):
+			return "/".join(parts[:4]) if frappe.db.table_exists(parts[3]) else OTHER_ENDPOINT
+		if path.startswith("/api/"):
+			return "/".join(parts[:4])
+		return "/".join(parts[:2]) or "/"
+
 	def store(self):
 		serialized = json.dumps(self.data, sort_keys=True, default=str, separators=(",", ":"))
 		length = frappe.cache.rpush(MONITOR_REDIS_KEY, serialized)
@@ -123,6 +228,13 @@ class Monitor:
 			frappe.cache.ltrim(MONITOR_REDIS_KEY, 1, -1)
 
 
+def is_whitelisted_method(method: str) -> bool:
+	try:
+		return frappe.get_attr(frappe.override_whitelisted_method(method)) in frappe.whitelisted
+	except Exception:
+		return False
+
+
 def flush():
 	logs = frappe.cache.lrange(MONITOR_REDIS_KEY, 0, -1)
 	if not logs:
@@ -136,3 +248,140 @@ def flush():
 
 	# Remove fetched entries from cache
 	frappe.cache.ltrim(MONITOR_REDIS_KEY, len(logs) - 1, -1)
+
+
+class Aggregator:
+	"""Histograms of the monitored transactions of one site in this process.
+
+	Buckets are added to a Redis hash every AGGREGATE_FLUSH_INTERVAL seconds, so
+	the histograms of all workers add up and survive restarts of a worker.
+	"""
+
+	__slots__ = ("histograms", "last_flush", "lock")
+
+	def __init__(self):
+		# (transaction type, endpoint, histogram) -> [count per bucket..., count above, sum]
+		self.histograms: dict[tuple, list] = {}
+		self.last_flush = time.monotonic()
+		self.lock = threading.Lock()
+
+	def add(self, monitor: Monitor):
+		data, endpoint = monitor.data, monitor.get_endpoint()
+
+		with self.lock:
+			for name, (field, scale, buckets, _help) in AGGREGATE_METRICS.items():
+				value = (data.get(field) or 0) * scale
+				key = (data.transaction_type, endpoint, name)
+				histogram = self.histograms.get(key)
+				if histogram is None:
+					histogram = self.histograms[key] = [0] * (len(buckets) + 2)
+
+				histogram[get_bucket(buckets, value)] += 1
+				histogram[-1] += value
+
+			due = time.monotonic() - self.last_flush >= AGGREGATE_FLUSH_INTERVAL
+
+		if due:
+			self.flush()
+
+	def flush(self):
+		with self.lock:
+			histograms, self.histograms = self.histograms, {}
+			self.last_flush = time.monotonic()
+
+		if not histograms:
+			return
+
+		key = frappe.cache.make_key(AGGREGATE_REDIS_KEY)
+		pipeline = frappe.cache.pipeline()
+		for (transaction_type, endpoint, name), histogram in histograms.items():
+			for i, count in enumerate(histogram[:-1]):
+				if count:
+					pipeline.hincrby(key, json.dumps([transaction_type, endpoint, name, i]), count)
+			pipeline.hincrbyfloat(key, json.dumps([transaction_type, endpoint, name, "sum"]), histogram[-1])
+		pipeline.execute()
+
+
+_aggregators: dict[str, Aggregator] = {}
+
+
+def get_aggregator() -> Aggregator:
+	site = frappe.local.site
+	if (aggregator := _aggregators.get(site)) is None:
+		aggregator = _aggregators.setdefault(site, Aggregator())
+	return aggregator
+
+
+def get_bucket(buckets, value) -> int:
+	for i, upper_bound in enumerate(buckets):
+		if value <= upper_bound:
+			return i
+	return len(buckets)
+
+
+def get_prometheus_metrics() -> str:
+	"""Aggregated histograms of the current site in Prometheus' text exposition format."""
+	# counters are stored unpickled, so not read with RedisWrapper.hgetall
+	pipeline = frappe.cache.pipeline()
+	pipeline.hgetall(frappe.cache.make_key(AGGREGATE_REDIS_KEY))
+	(fields,) = pipeline.execute()
+
+	histograms = {}
+	for field, value in fields.items():
+		transaction_type, endpoint, name, bucket = json.loads(field)
+		if name not in AGGREGATE_METRICS:
+			continue
+
+		histogram = histograms.setdefault(
+			(name, transaction_type, endpoint), [0] * (len(AGGREGATE_METRICS[name][2]) + 2)
+		)
+		histogram[-1 if bucket == "sum" else bucket] = float(value) if bucket == "sum" else int(value)
+
+	lines = []
+	for name, (_field, _scale, buckets, help) in AGGREGATE_METRICS.items():
+		metric = f"frappe_transaction_{name}"
+		lines.append(f"# HELP {metric} {help}")
+		lines.append(f"# TYPE {metric} histogram")
+
+		for (histogram_name, transaction_type, endpoint), histogram in sorted(histograms.items()):
+			if histogram_name != name:
+				continue
+
+			labels = ",".join(
+				(
+					f'site="{escape_label(frappe.local.site)}"',
+					f'type="{transaction_type}"',
+					f'endpoint="{escape_label(endpoint)}"',
+				)
+			)
+			count = 0
+			for upper_bound, bucket_count in zip((*buckets, "+Inf"), histogram[:-1], strict=True):
+				count += bucket_count
+				lines.append(f'{metric}_bucket{{{labels},le="{upper_bound}"}} {count}')
+			lines.append(f"{metric}_sum{{{labels}}} {histogram[-1]}")
+			lines.append(f"{metric}_count{{{labels}}} {count}")
+
+	return "\n".join(lines) + "\n"
+
+
+def escape_label(value: str) -> str:
+	return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def metrics():
+	"""Prometheus scrape endpoint for `"monitor": "aggregate"`.
+
+	Authenticate with an `X-Frappe-Monitor-Token: <monitor_metrics_token>` header,
+	token from site config, or as a System Manager. Not with an Authorization
+	header, as `frappe.auth.validate_auth` rejects tokens it doesn't know.
+	"""
+	token = frappe.conf.monitor_metrics_token
+	header = frappe.get_request_header(METRICS_TOKEN_HEADER) or ""
+	if not (token and hmac.compare_digest(header.encode(), token.encode())):
+		frappe.only_for("System Manager")
+
+	if aggregator := _aggregators.get(frappe.local.site):
+		aggregator.flush()
+
+	return Response(get_prometheus_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
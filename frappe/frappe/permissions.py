@@ -3,6 +3,8 @@
 import copy
 import functools
 
+import redis
+
 import frappe
 import frappe.share
 from frappe import _, msgprint
@@ -36,6 +38,11 @@ ADMIN_ROLE = "Administrator"
 # These roles are automatically assigned based on user type
 AUTOMATIC_ROLES = (GUEST_ROLE, ALL_USER_ROLE, SYSTEM_USER_ROLE, ADMIN_ROLE)
 
+# counter bumped whenever permissions may have changed, see `get_permission_version`
+PERMISSION_VERSION_KEY = "permission_version"
+# counter per user, bumped when the roles or user permissions of that user change
+USER_PERMISSION_VERSION_KEY = "user_permission_version"
+
 
 def print_has_permission_check_logs(func):
 	@functools.wraps(func)
@@ -317,6 +324,79 @@ def get_user_permissions(user):
 	return get_user_permissions(user)
 
 
+def get_permission_version() -> int | None:
+	"""Returns the site's permission version, read from Redis once per request.
+
+	Caches of data derived from permissions (like the match conditions of
+	`DatabaseQuery`) are valid as long as this doesn't change. None if Redis is
+	unreachable."""
+	if getattr(frappe.local, "permission_version", None) is None:
+		try:
+			version = frappe.cache.get(frappe.cache.make_key(PERMISSION_VERSION_KEY))
+		except redis.exceptions.ConnectionError:
+			return None
+
+		frappe.local.permission_version = cint(version.decode() if version else 0)
+
+	return frappe.local.permission_version
+
+
+def bump_permission_version():
+	"""Invalidate data derived from permissions in every process of this site."""
+	try:
+		frappe.local.permission_version = frappe.cache.incr(frappe.cache.make_key(PERMISSION_VERSION_KEY))
+	except redis.exceptions.ConnectionError:
+		frappe.local.permission_version = None
+
+
+def clear_permission_version():
+	"""Bump the permission version now and again after commit, so no process keeps data it derived
+	from the permissions before this transaction."""
+	bump_permission_version()
+	if hasattr(frappe.db, "after_commit"):
+		frappe.db.after_commit.add(bump_permission_version)
+
+
+def get_user_permission_version(user: str) -> int | None:
+	"""Returns the permission version of `user`, read from Redis once per request.
+
+	Like `get_permission_version`, but only changes with the roles and user
+	permissions of `user`. None if Redis is unreachable."""
+	versions = get_local_user_permission_versions()
+	if versions.get(user) is None:
+		try:
+			version = frappe.cache.get(frappe.cache.make_key(f"{USER_PERMISSION_VERSION_KEY}:{user}"))
+		except redis.exceptions.ConnectionError:
+			return None
+
+		versions[user] = cint(version.decode() if version else 0)
+
+	return versions[user]
+
+
+def get_local_user_permission_versions() -> dict[str, int | None]:
+	if (versions := getattr(frappe.local, "user_permission_versions", None)) is None:
+		versions = frappe.local.user_permission_versions = {}
+
+	return versions
+
+
+def bump_user_permission_version(user: str):
+	"""Invalidate data derived from the permissions of `user` in every process of this site."""
+	versions = get_local_user_permission_versions()
+	try:
+		versions[user] = frappe.cache.incr(frappe.cache.make_key(f"{USER_PERMISSION_VERSION_KEY}:{user}"))
+	except redis.exceptions.ConnectionError:
+		versions[user] = None
+
+
+def clear_user_permission_version(user: str):
+	"""Like `clear_permission_version`, for the permissions of `user` only."""
+	bump_user_permission_version(user)
+	if hasattr(frappe.db, "after_commit"):
+		frappe.db.after_commit.add(functools.partial(bump_user_permission_version, user))
+
+
 def has_user_permission(doc, user=None, debug=False, ptype=None):
 	"""Return True if User is allowed to view considering User Permissions."""
 	from frappe.core.doctype.user_permission.user_permission import get_user_permissions
@@ -1,3 +1,5 @@
+import copy
+
 import frappe
 
 
@@ -16,6 +18,8 @@ def get_print_settings_to_show(doctype, docname):
 		df = print_settings.meta.get_field(fieldname)
 		if not df:
 			continue
+		# don't modify the cached Meta
+		df = copy.copy(df)
 		df.default = print_settings.get(fieldname)
 		print_settings_fields.append(df)
 
@@ -115,6 +115,36 @@ frappe.db = {
 			limit,
 		});
 	},
+	count_estimate: function (doctype, args = {}, on_exact_count) {
+		// resolves with {count, estimated}, for an estimate `on_exact_count` is
+		// called with the exact count once the background job has counted
+		let filters = args.filters || {};
+		const distinct =
+			Array.isArray(filters) &&
+			filters.some((filter) => {
+				return filter[0] !== doctype;
+			});
+
+		return frappe
+			.xcall("frappe.desk.reportview.get_count_estimate", {
+				doctype,
+				filters,
+				fields: [],
+				distinct,
+				limit: args.limit,
+			})
+			.then((r) => {
+				if (r.estimated && on_exact_count) {
+					const handler = (data) => {
+						if (data.key !== r.key) return;
+						frappe.realtime.off("list_count", handler);
+						on_exact_count(data.count);
+					};
+					frappe.realtime.on("list_count", handler);
+				}
+				return r;
+			});
+	},
 	get_link_options(doctype, txt = "", filters = {}) {
 		return new Promise((resolve) => {
 			frappe.call({
@@ -995,37 +995,66 @@ frappe.views.ListView = class ListView extends frappe.views.BaseList {
 		return html;
 	}
 
+	get_total_count() {
+		if (this.count_upper_bound) {
+			return frappe.db.count(this.doctype, {
+				filters: this.get_filters_for_args(),
+				limit: this.count_upper_bound,
+			});
+		}
+
+		// large tables are estimated first, the exact count follows from a background job
+		const request = (this.count_request = {});
+		return frappe.db
+			.count_estimate(this.doctype, { filters: this.get_filters_for_args() }, (count) => {
+				// skip if the list was counted again since
+				if (this.count_request !== request) return;
+				this.exact_count = count;
+				this.render_count();
+			})
+			.then((r) => {
+				this.count_is_estimated = r.estimated;
+				return r.count;
+			});
+	}
+
 	get_count_str() {
 		let current_count = this.data.length;
 		let count_without_children = this.data.uniqBy((d) => d.name).length;
 
-		return frappe.db
-			.count(this.doctype, {
-				filters: this.get_filters_for_args(),
-				limit: this.count_upper_bound,
-			})
-			.then((total_count) => {
-				this.total_count = total_count || current_count;
-				this.count_without_children =
-					count_without_children !== current_count ? count_without_children : undefined;
-
-				let count_str;
-				if (this.total_count === this.count_upper_bound) {
-					count_str = `${format_number(this.total_count - 1, null, 0)}+`;
-				} else {
-					count_str = format_number(this.total_count, null, 0);
-				}
+		let total_count;
+		if (this.exact_count != null) {
+			total_count = Promise.resolve(this.exact_count);
+			this.exact_count = null;
+			this.count_is_estimated = false;
+		} else {
+			total_count = this.get_total_count();
+		}
 
-				let str = __("{0} of {1}", [format_number(current_count, null, 0), count_str]);
-				if (this.count_without_children) {
-					str = __("{0} of {1} ({2} rows with children)", [
-						count_without_children,
-						count_str,
-						current_count,
-					]);
-				}
-				return str;
-			});
+		return total_count.then((total_count) => {
+			this.total_count = total_count || current_count;
+			this.count_without_children =
+				count_without_children !== current_count ? count_without_children : undefined;
+
+			let count_str;
+			if (this.total_count === this.count_upper_bound) {
+				count_str = `${format_number(this.total_count - 1, null, 0)}+`;
+			} else if (this.count_is_estimated) {
+				count_str = `~${format_number(this.total_count, null, 0)}`;
+			} else {
+				count_str = format_number(this.total_count, null, 0);
+			}
+
+			let str = __("{0} of {1}", [format_number(current_count, null, 0), count_str]);
+			if (this.count_without_children) {
+				str = __("{0} of {1} ({2} rows with children)", [
+					count_without_children,
+					count_str,
+					current_count,
+				]);
+			}
+			return str;
+		});
 	}
 
 	get_form_link(doc) {
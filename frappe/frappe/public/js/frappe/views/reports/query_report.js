@@ -682,6 +682,9 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 					this.previous_filters = data.custom_filters;
 				}
 
+				// results of big prepared reports come a page at a time
+				this.paged = data.paged;
+
 				if (data.prepared_report) {
 					this.prepared_report = true;
 					this.prepared_report_document = data.doc;
@@ -2035,6 +2038,55 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 		this.$report_footer.append(`<div class="col-md-12">
 			<span">${message}</span><span class="pull-right">${execution_time_msg}</span>
 		</div>`);
+
+		if (this.paged) {
+			this.render_prepared_report_pager();
+		}
+	}
+
+	render_prepared_report_pager() {
+		const { start, page_length, row_count } = this.paged;
+		const end = Math.min(start + page_length, row_count);
+		const $pager = $(`<div class="col-md-12 prepared-report-pager">
+			<span>${__("Rows {0} to {1} of {2}", [
+				format_number(start + 1, null, 0),
+				format_number(end, null, 0),
+				format_number(row_count, null, 0),
+			])}</span>
+			<span class="pull-right">
+				<button class="btn btn-xs btn-default" data-action="previous_page">
+					${__("Previous")}</button>
+				<button class="btn btn-xs btn-default" data-action="next_page">
+					${__("Next")}</button>
+			</span>
+		</div>`).appendTo(this.$report_footer);
+
+		$pager
+			.find("[data-action=previous_page]")
+			.prop("disabled", start <= 0)
+			.on("click", () => this.load_prepared_report_page(Math.max(start - page_length, 0)));
+		$pager
+			.find("[data-action=next_page]")
+			.prop("disabled", end >= row_count)
+			.on("click", () => this.load_prepared_report_page(start + page_length));
+	}
+
+	load_prepared_report_page(start) {
+		return frappe
+			.xcall(
+				"frappe.core.doctype.prepared_report.prepared_report.get_prepared_report_page",
+				{
+					name: this.prepared_report_document.name,
+					start: start,
+					page_length: this.paged.page_length,
+				}
+			)
+			.then((page) => {
+				this.paged = { ...this.paged, start: page.start, row_count: page.row_count };
+				this.prepare_report_data({ ...this.raw_data, result: page.result });
+				this.render_datatable();
+				this.show_footer_message();
+			});
 	}
 
 	expand_all_rows() {
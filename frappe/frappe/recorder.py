@@ -9,7 +9,7 @@ import pstats
 import re
 import time
 import typing
-from collections import Counter
+from collections import Counter, defaultdict
 from collections.abc import Callable
 from dataclasses import dataclass
 
@@ -26,6 +26,19 @@ RECORDER_REQUEST_SPARSE_HASH = "recorder-requests-sparse"
 RECORDER_REQUEST_HASH = "recorder-requests"
 TRACEBACK_PATH_PATTERN = re.compile(".*/apps/")
 RECORDER_AUTO_DISABLE = 5 * 60
+N_PLUS_ONE_THRESHOLD = 10  # same query shape run more often than this from one place is flagged
+
+# frames in these files run queries on behalf of their callers, the call site is the caller
+DATA_ACCESS_FILES = (
+	"frappe/frappe/__init__.py",
+	"frappe/frappe/database/",
+	"frappe/frappe/model/",
+	"frappe/frappe/query_builder/",
+	"frappe/frappe/utils/caching.py",
+	"frappe/frappe/recorder.py",
+)
+TABLE_PATTERN = re.compile(r"\b(?:FROM|UPDATE|INTO)\s+`?tab([^`\s]+)`?", re.IGNORECASE)
+EQUALITY_PATTERN = re.compile(r"`?(\w+)`?\s*=\s*\?")
 
 
 if typing.TYPE_CHECKING:
@@ -110,6 +123,7 @@ def post_process():
 	        - `EXPLAIN` output of queries.
 	        - SQLParse reformatting of queries
 	        - Mark duplicates
+	        - Find N+1 queries
 	"""
 	frappe.db.rollback()
 	frappe.db.begin(read_only=True)  # Explicitly start read only transaction
@@ -132,6 +146,7 @@ def post_process():
 				except Exception:
 					pass
 		mark_duplicates(request)
+		request["n_plus_one"] = find_n_plus_one(request)
 		frappe.cache.hset(RECORDER_REQUEST_HASH, request["uuid"], request)
 
 	config.delete()
@@ -151,6 +166,91 @@ def mark_duplicates(request):
 		call["normalized_copies"] = normalized_duplicates[call["normalized_query"]]
 
 
+def find_n_plus_one(request, threshold: int = N_PLUS_ONE_THRESHOLD) -> list[dict]:
+	"""Find queries of the same shape run more than `threshold` times with different values from
+	one call site, typically a query per row of a loop, and suggest how to batch them.
+
+	Without captured stacks all queries of a request count as one call site.
+	"""
+	if request["calls"] and "normalized_query" not in request["calls"][0]:
+		mark_duplicates(request)
+
+	groups = defaultdict(list)
+	for call in request["calls"]:
+		groups[(call["normalized_query"], get_call_site(call.get("stack")))].append(call)
+
+	findings = []
+	for (normalized_query, call_site), calls in groups.items():
+		distinct_queries = len({call["query"] for call in calls})
+		if len(calls) <= threshold or distinct_queries < 2:
+			continue
+
+		findings.append(
+			{
+				"call_site": call_site,
+				"query": normalized_query,
+				"count": len(calls),
+				"distinct_queries": distinct_queries,
+				"duration": float(f"{sum(call['duration'] for call in calls):.3f}"),
+				"suggestion": suggest_batched_query(normalized_query),
+			}
+		)
+
+	return sorted(findings, key=lambda finding: finding["duration"], reverse=True)
+
+
+def get_call_site(stack) -> str | None:
+	"""`file:line in function` of the innermost frame that isn't framework data access code."""
+	if not stack:
+		return None
+
+	frame = next((f for f in reversed(stack) if not f["filename"].startswith(DATA_ACCESS_FILES)), stack[-1])
+	return f"{frame['filename']}:{frame['lineno']} in {frame['function']}"
+
+
+def suggest_batched_query(normalized_query: str) -> str:
+	table = TABLE_PATTERN.search(normalized_query)
+	doctype = table.group(1) if table else None
+	columns = list(dict.fromkeys(EQUALITY_PATTERN.findall(normalized_query)))
+
+	if not is_query_type(normalized_query, "select"):
+		return (
+			"Collect the values in the loop and write them with one query after it, "
+			"e.g. frappe.db.bulk_insert or an UPDATE with an IN filter."
+		)
+
+	if doctype and len(columns) == 1:
+		return (
+			f'Fetch all rows before the loop with one query, e.g. frappe.get_all("{doctype}", '
+			f'filters={{"{columns[0]}": ("in", values)}}, fields=[...]), and look them up in a dict.'
+		)
+
+	if doctype and columns:
+		return (
+			f"Join `tab{doctype}` on {', '.join(columns)} in the query the loop iterates over, "
+			"or fetch all rows before the loop with an IN filter."
+		)
+
+	return "Fetch the rows for all iterations with one query before the loop, using an IN list or a join."
+
+
+def get_n_plus_one_report(threshold: int = N_PLUS_ONE_THRESHOLD) -> list[dict]:
+	"""Recorded requests and jobs with their N+1 queries, for `bench recorder-report`."""
+	report = []
+	for request in frappe.cache.hgetall(RECORDER_REQUEST_HASH).values():
+		if findings := find_n_plus_one(request, threshold):
+			report.append(
+				{
+					"uuid": request["uuid"],
+					"path": request.get("path"),
+					"event_type": request.get("event_type"),
+					"n_plus_one": findings,
+				}
+			)
+
+	return report
+
+
 def normalize_query(query: str) -> str:
 	"""Attempt to normalize query by removing variables.
 	This gives a different view of similar duplicate queries.
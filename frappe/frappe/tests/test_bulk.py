@@ -0,0 +1,73 @@
+# Copyright (c) 2025, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+
+from unittest.mock import patch
+
+import frappe
+import frappe.bulk
+from frappe.core.doctype.doctype.test_doctype import new_doctype
+from frappe.desk.doctype.todo.todo import ToDo
+from frappe.tests.utils import FrappeTestCase
+
+
+class TestBulkInsert(FrappeTestCase):
+	def test_hooks_are_run(self):
+		descriptions = [frappe.generate_hash() for i in range(20)]
+
+		with (
+			patch.object(ToDo, "validate", autospec=True) as validate,
+			patch.object(ToDo, "on_update", autospec=True) as on_update,
+		):
+			docs = frappe.bulk.insert(
+				({"doctype": "ToDo", "description": d} for d in descriptions), chunk_size=7
+			)
+
+		self.assertEqual(validate.call_count, 20)
+		self.assertEqual(on_update.call_count, 20)
+		self.assertEqual(
+			sorted(frappe.get_all("ToDo", {"description": ("in", descriptions)}, pluck="name")),
+			sorted(doc.name for doc in docs),
+		)
+		self.assertTrue(all(not doc.is_new() for doc in docs))
+
+	def test_docs_are_not_new_after_insert(self):
+		is_new = []
+
+		def after_insert(doc):
+			is_new.append(doc.is_new())
+
+		with patch.object(ToDo, "after_insert", after_insert, create=True):
+			frappe.bulk.insert({"doctype": "ToDo", "description": str(i)} for i in range(3))
+
+		self.assertEqual(is_new, [False] * 3)
+
+	def test_children_and_naming_series(self):
+		child = new_doctype(istable=1).insert()
+		doctype = new_doctype(
+			autoname="TEST-BULK-.#####",
+			fields=[
+				{"fieldname": "some_fieldname", "fieldtype": "Data"},
+				{"fieldname": "rows", "fieldtype": "Table", "options": child.name},
+			],
+		).insert()
+
+		docs = frappe.bulk.insert(
+			{"doctype": doctype.name, "some_fieldname": str(i), "rows": [{"some_fieldname": "a"}] * 3}
+			for i in range(50)
+		)
+
+		first = int(docs[0].name.rsplit("-", 1)[1])
+		self.assertEqual([doc.name for doc in docs], [f"TEST-BULK-{first + i:05d}" for i in range(50)])
+		self.assertEqual(frappe.db.get_value("Series", "TEST-BULK-", "current"), first + 49)
+
+		self.assertEqual(frappe.db.count(child.name, {"parenttype": doctype.name}), 150)
+		doc = frappe.get_doc(doctype.name, docs[10].name)
+		self.assertEqual([row.idx for row in doc.rows], [1, 2, 3])
+
+	def test_queries_per_chunk(self):
+		doctype = new_doctype().insert()
+		frappe.bulk.insert({"doctype": doctype.name, "some_fieldname": "warm up"} for i in range(2))
+
+		# one INSERT for the whole chunk, no queries per document
+		with self.assertQueryCount(20):
+			frappe.bulk.insert({"doctype": doctype.name, "some_fieldname": str(i)} for i in range(100))
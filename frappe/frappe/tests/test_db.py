@@ -2,6 +2,7 @@
 # License: MIT. See LICENSE
 
 import datetime
+import time
 from math import ceil
 from random import choice
 from unittest.mock import patch
@@ -9,7 +10,7 @@ from unittest.mock import patch
 import frappe
 from frappe.core.utils import find
 from frappe.custom.doctype.custom_field.custom_field import create_custom_field
-from frappe.database import savepoint
+from frappe.database import pool, replica, savepoint
 from frappe.database.database import get_query_execution_timeout
 from frappe.database.utils import FallBackDateTimeStr
 from frappe.query_builder import Field
@@ -997,10 +998,14 @@ class TestTransactionManagement(FrappeTestCase):
 		self.assertEqual(_get_transaction_id(), _get_transaction_id())
 
 
-# Treat same DB as replica for tests, a separate connection will be opened
+# Treat same DB as replica for tests, a separate connection will be opened. The lag of
+# the same DB can't be measured without the REPLICATION CLIENT privilege.
+REPLICA_CONF = {"read_from_replica": 1, "replica_host": "127.0.0.1", "replica_allow_unknown_lag": 1}
+
+
 class TestReplicaConnections(FrappeTestCase):
 	def test_switching_to_replica(self):
-		with patch.dict(frappe.local.conf, {"read_from_replica": 1, "replica_host": "127.0.0.1"}):
+		with patch.dict(frappe.local.conf, REPLICA_CONF):
 
 			def db_id():
 				return id(frappe.local.db)
@@ -1027,6 +1032,128 @@ class TestReplicaConnections(FrappeTestCase):
 			outer()
 			self.assertEqual(write_connection, db_id())
 
+	def test_write_falls_back_to_primary(self):
+		with patch.dict(frappe.local.conf, REPLICA_CONF):
+			primary = frappe.local.db
+
+			@frappe.read_only()
+			def read_then_write():
+				self.assertTrue(frappe.db.is_replica)
+				frappe.db.get_value("User", "Administrator", "name")
+				frappe.db.set_value("User", "Administrator", "last_active", now())
+				self.assertIs(frappe.local.db, primary)
+				frappe.db.get_value("User", "Administrator", "name")
+				self.assertIs(frappe.local.db, primary)
+
+			read_then_write()
+			self.assertIs(frappe.local.db, primary)
+			self.assertFalse(hasattr(frappe.local, "replica_db"))
+
+	def test_lagging_replica_is_skipped(self):
+		conf = {"read_from_replica": 1, "replica_host": "127.0.0.1", "replica_max_lag": 5}
+		with patch.dict(frappe.local.conf, conf):
+			primary = frappe.local.db
+
+			@frappe.read_only()
+			def read():
+				return frappe.local.db
+
+			with patch.object(replica, "get_replication_lag", return_value=30):
+				self.assertIs(read(), primary)
+
+			with patch.object(replica, "get_replication_lag", return_value=1):
+				self.assertIsNot(read(), primary)
+
+			# lag that can't be measured counts as too much, unless allowed
+			with patch.object(replica, "get_replication_lag", return_value=None):
+				self.assertIs(read(), primary)
+				with patch.dict(frappe.local.conf, {"replica_allow_unknown_lag": 1}):
+					self.assertIsNot(read(), primary)
+
+
+class TestConnectionPool(FrappeTestCase):
+	def setUp(self):
+		conf = patch.dict(frappe.local.conf, {"db_pool_size": 1})
+		conf.start()
+		self.addCleanup(conf.stop)
+		self.addCleanup(pool.get_pool().clear)
+
+	def get_db(self):
+		from frappe.database import get_db
+
+		return get_db(
+			socket=frappe.conf.db_socket,
+			host=frappe.conf.db_host,
+			port=frappe.conf.db_port,
+			user=frappe.conf.db_name,
+			password=frappe.conf.db_password,
+			cur_db_name=frappe.conf.db_name,
+		)
+
+	def test_connections_are_reused(self):
+		db = self.get_db()
+		db.sql("select 1")
+		conn = db._conn
+		db.close()
+
+		db = self.get_db()
+		db.sql("select 1")
+		self.assertIs(db._conn, conn)
+
+		# the pool keeps one idle connection, the second one is closed
+		other_db = self.get_db()
+		other_db.sql("select 1")
+		db.close()
+		other_db.close()
+		self.assertEqual(pool.get_pool().info()["idle"], 1)
+
+	def test_max_lifetime(self):
+		db = self.get_db()
+		db.sql("select 1")
+		conn = db._conn
+		db.close()
+
+		with patch.dict(frappe.local.conf, {"db_pool_max_lifetime": 0.001}):
+			time.sleep(0.01)
+			db = self.get_db()
+			db.sql("select 1")
+			self.assertIsNot(db._conn, conn)
+			db.close()
+
+	def test_unhealthy_connections_are_replaced(self):
+		db = self.get_db()
+		db.sql("select 1")
+		conn = db._conn
+		db.close()
+		conn.close()
+
+		with patch.dict(frappe.local.conf, {"db_pool_health_check_interval": 0.001}):
+			time.sleep(0.01)
+			db = self.get_db()
+			self.assertEqual(db.sql("select 1")[0][0], 1)
+			self.assertIsNot(db._conn, conn)
+			db.close()
+
+	@run_only_if(db_type_is.MARIADB)
+	def test_session_is_reset(self):
+		db = self.get_db()
+		db.set_execution_timeout(1)
+		db.sql("set @pool_test = 1")
+		conn = db._conn
+		db.close()
+
+		db = self.get_db()
+		db.sql("select 1")
+		self.assertIs(db._conn, conn)
+		self.assertIsNone(db.sql("select @pool_test")[0][0])
+		self.assertEqual(
+			db.sql("select @@session.max_statement_time")[0][0],
+			db.sql("select @@global.max_statement_time")[0][0],
+		)
+		self.assertEqual(db.sql("select @@session.autocommit")[0][0], 0)
+		self.assertEqual(db.sql("select @@session.character_set_client")[0][0], "utf8mb4")
+		db.close()
+
 
 class TestConcurrency(FrappeTestCase):
 	@timeout(5, "There shouldn't be any lock wait")
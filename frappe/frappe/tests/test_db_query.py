@@ -11,7 +11,11 @@ from frappe.custom.doctype.property_setter.property_setter import make_property_
 from frappe.database.utils import DefaultOrderBy
 from frappe.desk.reportview import get_filters_cond
 from frappe.handler import execute_cmd
-from frappe.model.db_query import DatabaseQuery, get_between_date_filter
+from frappe.model.db_query import (
+	DatabaseQuery,
+	get_between_date_filter,
+	get_match_conditions_cache_info,
+)
 from frappe.permissions import add_user_permission, clear_user_permissions_for_doctype
 from frappe.query_builder import Column
 from frappe.tests.test_query_builder import db_type_is, run_only_if
@@ -225,6 +229,56 @@ class TestDBQuery(FrappeTestCase):
 
 		frappe.set_user("Administrator")
 
+	def test_match_conditions_cache(self):
+		clear_user_permissions_for_doctype("Blog Post", "test2@example.com")
+		frappe.get_doc("User", "test2@example.com").add_roles("Blogger")
+		frappe.set_user("test2@example.com")
+		self.addCleanup(frappe.set_user, "Administrator")
+
+		DatabaseQuery("Blog Post").build_match_conditions()
+		hits = get_match_conditions_cache_info()["hits"]
+
+		# same user and doctype, compiled conditions are reused
+		self.assertEqual(DatabaseQuery("Blog Post").build_match_conditions(), "")
+		self.assertEqual(get_match_conditions_cache_info()["hits"], hits + 1)
+
+		# clearing another user's cache (e.g. on login) keeps them
+		frappe.clear_cache(user="test1@example.com")
+		frappe.db.after_commit.run()
+		DatabaseQuery("Blog Post").build_match_conditions()
+		self.assertEqual(get_match_conditions_cache_info()["hits"], hits + 2)
+
+		# a new user permission changes the permission version and drops compiled conditions
+		add_user_permission("Blog Post", "-test-blog-post", "test2@example.com", True)
+		self.assertIn("-test-blog-post", DatabaseQuery("Blog Post").build_match_conditions())
+		self.assertEqual(get_match_conditions_cache_info()["hits"], hits + 2)
+
+	def test_keyset_pagination(self):
+		for order_by in ("modified desc", "name asc", "`tabDocType`.`creation` asc, `tabDocType`.name asc"):
+			# keyset pagination breaks ties by name
+			tiebreak = "" if "name" in order_by else f", name {order_by.split()[-1]}"
+			expected = frappe.get_all("DocType", order_by=order_by + tiebreak, pluck="name")
+
+			pages, after = [], ""
+			while after is not None:
+				page = frappe.get_all("DocType", order_by=order_by, limit=50, pluck="name", after=after)
+				pages.extend(page)
+				after = page.after
+
+			self.assertEqual(pages, expected)
+
+		page = frappe.get_all("DocType", fields=["name", "module"], limit=2, after="", as_list=True)
+		self.assertEqual(len(page[0]), 2)
+		page = frappe.get_all("DocType", fields=["name", "module"], limit=2, after=page.after)
+		self.assertEqual(list(page[0]), ["name", "module"])
+
+		with self.assertRaises(frappe.ValidationError):
+			frappe.get_all("DocType", order_by="module asc, modified desc", after="")
+		with self.assertRaises(frappe.ValidationError):
+			frappe.get_all("DocType", order_by="name asc", after=page.after)
+		with self.assertRaises(frappe.ValidationError):
+			frappe.get_all("DocType", fields=["module"], distinct=True, after="")
+
 	def test_fields(self):
 		self.assertTrue(
 			{"name": "DocType", "issingle": 0}
@@ -1327,6 +1381,46 @@ class TestReportView(FrappeTestCase):
 		self.assertIsInstance(count, int)
 		self.assertLessEqual(count, limit)
 
+	def test_get_count_estimate(self):
+		from frappe.desk import reportview
+
+		frappe.local.form_dict = frappe._dict(
+			{"doctype": "DocType", "filters": {"istable": 1}, "fields": [], "distinct": "false"}
+		)
+		exact_count = frappe.db.count("DocType", {"istable": 1})
+
+		# large table: estimate now, exact count from the background job
+		with (
+			patch.object(reportview, "EXACT_COUNT_THRESHOLD", 0),
+			patch("frappe.enqueue") as enqueue,
+			patch("frappe.publish_realtime") as publish_realtime,
+		):
+			response = execute_cmd("frappe.desk.reportview.get_count_estimate")
+			self.assertTrue(response["estimated"])
+			self.assertIsInstance(response["count"], int)
+
+			# another user with the same query waits for the same job
+			frappe.set_user("test@example.com")
+			self.addCleanup(frappe.set_user, "Administrator")
+			frappe.get_doc("User", "test@example.com").add_roles("System Manager")
+			self.assertEqual(execute_cmd("frappe.desk.reportview.get_count_estimate")["key"], response["key"])
+
+			job = enqueue.call_args.kwargs
+			self.assertEqual(job["key"], response["key"])
+			reportview.update_count(job["partial_query"], job["key"])
+			self.assertEqual(
+				[call.kwargs["user"] for call in publish_realtime.call_args_list],
+				["Administrator", "test@example.com"],
+			)
+			publish_realtime.assert_called_with(
+				"list_count", {"key": response["key"], "count": exact_count}, user="test@example.com"
+			)
+
+		# exact count is cached
+		response = execute_cmd("frappe.desk.reportview.get_count_estimate")
+		self.assertEqual(response, {"count": exact_count, "estimated": False})
+		frappe.cache.delete_value(f"list_count:{job['key']}")
+
 	def test_reportview_get(self):
 		user = frappe.get_doc("User", "test@example.com")
 		add_child_table_to_blog_post()
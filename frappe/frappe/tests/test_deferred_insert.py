@@ -1,5 +1,13 @@
 import frappe
-from frappe.deferred_insert import deferred_insert, save_to_db
+from frappe.deferred_insert import (
+	MIN_BATCH_SIZE,
+	adapt_batch_size,
+	deferred_insert,
+	get_queue_metrics,
+	pop_records,
+	requeue_dead_letters,
+	save_to_db,
+)
 from frappe.tests.utils import FrappeTestCase
 
 
@@ -16,3 +24,52 @@ class TestDeferredInsert(FrappeTestCase):
 		frappe.clear_cache()  # deferred_insert cache keys are supposed to be persistent
 		save_to_db()
 		self.assertTrue(frappe.db.exists("Route History", route_history))
+
+	def test_batched_drain(self):
+		routes = [{"route": frappe.generate_hash(), "user": "Administrator"} for i in range(120)]
+		for i in range(0, 120, 10):
+			deferred_insert("Route History", routes[i : i + 10])
+
+		save_to_db()
+		names = [r["route"] for r in routes]
+		self.assertEqual(frappe.db.count("Route History", {"route": ("in", names)}), 120)
+
+		metrics = get_queue_metrics()["Route History"]
+		self.assertEqual(metrics["pending"], 0)
+		self.assertGreaterEqual(metrics["inserted"], 120)
+
+	def test_dead_letters(self):
+		good = {"route": frappe.generate_hash(), "user": "Administrator"}
+		bad = {"route": frappe.generate_hash(), "user": "_Test Missing User"}
+		frappe.cache.delete_value("insert_dead_letter_for_Route History")
+
+		deferred_insert("Route History", [good, bad])
+		save_to_db()
+
+		# the batch failed on the invalid link, the valid record was inserted on its own
+		self.assertTrue(frappe.db.exists("Route History", {"route": good["route"]}))
+		self.assertFalse(frappe.db.exists("Route History", {"route": bad["route"]}))
+		self.assertEqual(get_queue_metrics()["Route History"]["dead_letters"], 1)
+
+		self.assertEqual(requeue_dead_letters("Route History"), 1)
+		self.assertEqual(get_queue_metrics()["Route History"]["dead_letters"], 0)
+		frappe.cache.delete_value("insert_queue_for_Route History")
+
+	def test_adaptive_batch_size(self):
+		self.assertEqual(adapt_batch_size(100, 100, 0.1), 200)
+		self.assertEqual(adapt_batch_size(100, 20, 0.1), 100)  # queue ran dry
+		self.assertEqual(adapt_batch_size(400, 400, 5), 200)
+		self.assertEqual(adapt_batch_size(MIN_BATCH_SIZE, MIN_BATCH_SIZE, 5), MIN_BATCH_SIZE)
+
+	def test_batch_size_counts_entries(self):
+		frappe.cache.delete_value("insert_queue_for_Route History")
+		for i in range(3):
+			deferred_insert("Route History", [{"route": str(i), "user": "Administrator"}] * 10)
+
+		records, entry_count = pop_records("insert_queue_for_Route History", 2)
+		self.assertEqual((len(records), entry_count), (20, 2))
+		records, entry_count = pop_records("insert_queue_for_Route History", 2)
+		self.assertEqual((len(records), entry_count), (10, 1))
+
+		# an almost empty queue doesn't grow the batch, however many records its entries hold
+		self.assertEqual(adapt_batch_size(100, 1, 0.1), 100)
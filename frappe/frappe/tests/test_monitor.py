@@ -2,8 +2,9 @@
 # License: MIT. See LICENSE
 
 import frappe
+import frappe.app
 import frappe.monitor
-from frappe.monitor import MONITOR_REDIS_KEY, get_trace_id
+from frappe.monitor import AGGREGATE_REDIS_KEY, MONITOR_REDIS_KEY, Counters, get_trace_id
 from frappe.tests.utils import FrappeTestCase
 from frappe.utils import set_request
 from frappe.utils.response import build_response
@@ -88,3 +89,95 @@ class TestMonitor(FrappeTestCase):
 		frappe.db.sql("select 1")
 		self.assertIn(get_trace_id(), str(frappe.db.last_query))
 		frappe.monitor.stop(response)
+
+	def test_aggregate(self):
+		frappe.conf.monitor = "aggregate"
+		frappe.cache.delete_value(AGGREGATE_REDIS_KEY)
+		self.addCleanup(frappe.cache.delete_value, AGGREGATE_REDIS_KEY)
+
+		for path in ("/api/resource/ToDo/todo-1", "/api/resource/ToDo/todo-2"):
+			set_request(method="GET", path=path)
+			frappe.monitor.start()
+			frappe.db.sql("select 1")
+			frappe.cache.get_value("monitor-test")
+			frappe.monitor.stop(build_response("json"))
+
+		self.assertFalse(frappe.cache.lrange(MONITOR_REDIS_KEY, 0, -1))
+
+		frappe.monitor.get_aggregator().flush()
+		metrics = frappe.monitor.get_prometheus_metrics()
+
+		labels = f'site="{frappe.local.site}",type="request",endpoint="/api/resource/ToDo"'
+		self.assertIn(f"frappe_transaction_duration_seconds_count{{{labels}}} 2", metrics)
+		self.assertIn(f'frappe_transaction_queries_bucket{{{labels},le="+Inf"}} 2', metrics)
+		self.assertIn("# TYPE frappe_transaction_redis_seconds histogram", metrics)
+		self.assertNotIn("todo-1", metrics)
+
+	def test_aggregate_unknown_endpoints(self):
+		frappe.conf.monitor = "aggregate"
+		frappe.cache.delete_value(AGGREGATE_REDIS_KEY)
+		self.addCleanup(frappe.cache.delete_value, AGGREGATE_REDIS_KEY)
+
+		for path in (
+			"/api/method/frappe.ping",
+			"/api/method/no.such.method",
+			"/api/resource/No Such DocType",
+		):
+			set_request(method="GET", path=path)
+			frappe.monitor.start()
+			frappe.monitor.stop(build_response("json"))
+
+		frappe.monitor.get_aggregator().flush()
+		metrics = frappe.monitor.get_prometheus_metrics()
+		self.assertIn('endpoint="/api/method/frappe.ping"', metrics)
+		self.assertIn(f'endpoint="{frappe.monitor.OTHER_ENDPOINT}"', metrics)
+		self.assertNotIn("no.such.method", metrics)
+		self.assertNotIn("No Such DocType", metrics)
+
+	def test_metrics_token(self):
+		frappe.conf.monitor = "aggregate"
+		frappe.conf.monitor_metrics_token = "metrics-secret"
+		self.addCleanup(frappe.conf.pop, "monitor_metrics_token")
+		self.addCleanup(frappe.set_user, "Administrator")
+		frappe.set_user("Guest")
+
+		set_request(
+			method="GET",
+			path="/api/method/frappe.monitor.metrics",
+			headers={frappe.monitor.METRICS_TOKEN_HEADER: "metrics-secret"},
+		)
+		self.assertEqual(frappe.monitor.metrics().status_code, 200)
+
+		set_request(
+			method="GET",
+			path="/api/method/frappe.monitor.metrics",
+			headers={frappe.monitor.METRICS_TOKEN_HEADER: "wrong"},
+		)
+		self.assertRaises(frappe.PermissionError, frappe.monitor.metrics)
+
+	def test_counters(self):
+		set_request(method="GET", path="/api/method/frappe.ping")
+		frappe.local.counters = Counters()
+		frappe.monitor.start()
+		frappe.db.sql("select 1 union select 2")
+		frappe.cache.get_value("monitor-test")
+		frappe.monitor.stop(build_response("json"))
+
+		log = frappe.parse_json(frappe.cache.lrange(MONITOR_REDIS_KEY, 0, -1)[0].decode())
+		self.assertGreaterEqual(log.queries, 1)
+		self.assertGreaterEqual(log.rows, 2)
+		self.assertGreaterEqual(log.cache_misses, 1)
+		self.assertTrue(log.db_time)
+		self.assertTrue(log.redis_time)
+
+	def test_server_timing_header(self):
+		set_request(method="GET", path="/api/method/frappe.ping")
+		frappe.local.counters = Counters()
+		frappe.db.sql("select 1")
+		response = build_response("json")
+		frappe.app.process_response(response)
+
+		server_timing = response.headers["Server-Timing"]
+		self.assertIn("db;dur=", server_timing)
+		self.assertIn("redis;dur=", server_timing)
+		self.assertIn("total;dur=", server_timing)
@@ -3,6 +3,8 @@
 
 import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_full_jitter
 
@@ -14,14 +16,16 @@ from frappe.model.naming import (
 	append_number_if_name_exists,
 	determine_consecutive_week_number,
 	getseries,
+	getseries_from_block,
 	make_autoname,
 	parse_naming_series,
+	reserve_series_numbers,
 	revert_series_if_last,
 )
 from frappe.query_builder.utils import db_type_is
 from frappe.tests.test_query_builder import run_only_if
 from frappe.tests.utils import FrappeTestCase, patch_hooks
-from frappe.utils import now_datetime, nowdate, nowtime
+from frappe.utils import cint, now_datetime, nowdate, nowtime
 
 
 class TestNaming(FrappeTestCase):
@@ -146,6 +150,58 @@ class TestNaming(FrappeTestCase):
 
 		self.assertEqual(todo.name, f"TODO-{week}-{series}")
 
+	def test_reserve_series_numbers(self):
+		series = f"TEST-RESERVE-{frappe.generate_hash(length=6)}-"
+		getseries(series, 3)
+
+		with reserve_series_numbers(10):
+			with self.assertQueryCount(2):  # read and move the counter once
+				numbers = [getseries(series, 3) for i in range(4)]
+
+			self.assertEqual(frappe.db.get_value("Series", series, "current"), 11)
+
+		self.assertEqual(numbers, ["002", "003", "004", "005"])
+		# unused numbers are given back
+		self.assertEqual(frappe.db.get_value("Series", series, "current"), 5)
+		self.assertEqual(getseries(series, 3), "006")
+
+	def test_series_block_allocation(self):
+		series = f"TEST-BLOCK-{frappe.generate_hash(length=6)}-"
+		doctype = new_doctype(autoname=f"{series}.#####").insert()
+		start = cint(frappe.db.get_value("Series", series, "current"))
+
+		with patch.dict(frappe.conf, {"naming_series_block_size": {doctype.name: 10}}):
+			names = [frappe.get_doc({"doctype": doctype.name}).insert().name for i in range(3)]
+
+			self.assertEqual(names, [f"{series}{start + i:05d}" for i in range(1, 4)])
+			# the block was reserved and committed in a transaction of its own
+			self.assertEqual(get_current(series), start + 10)
+
+			# the counter isn't reverted while blocks may be in use
+			doc = frappe.get_doc({"doctype": doctype.name}).insert()
+			doc.delete()
+			self.assertEqual(get_current(series), start + 10)
+
+	def test_series_block_contention(self):
+		"""16 parallel inserters get unique numbers and only lock the series once per block"""
+		series = f"TEST-CONTENTION-{frappe.generate_hash(length=6)}-"
+		site = frappe.local.site
+
+		def insert_names(count):
+			frappe.init(site=site)
+			frappe.connect()
+			try:
+				return [getseries_from_block(series, 5, block_size=25) for i in range(count)]
+			finally:
+				frappe.destroy()
+
+		with ThreadPoolExecutor(16) as executor:
+			numbers = [n for names in executor.map(insert_names, [50] * 16) for n in names]
+
+		self.assertEqual(len(numbers), 800)
+		self.assertEqual(len(set(numbers)), 800)
+		self.assertEqual(get_current(series), 800)
+
 	def test_revert_series(self):
 		from datetime import datetime
 
@@ -427,3 +483,8 @@ def parse_naming_series_variable(doc, variable):
 
 def make_invalid_todo():
 	frappe.get_doc({"doctype": "ToDo", "description": "Test"}).insert(set_name="ToDo")
+
+
+def get_current(series):
+	# a locking read sees numbers reserved by other connections
+	return cint(frappe.db.get_value("Series", series, "current", for_update=True))
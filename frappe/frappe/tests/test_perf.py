@@ -4,6 +4,7 @@ This file contains multiple primitive tests for avoiding performance regressions
 - Time bound tests: Benchmarks are done on GHA before adding numbers
 - Query count tests: More than expected # of queries for any action is frequent source of
   performance issues. This guards against such problems.
+- Benchmarks: Compare timings of two implementations, only run with FRAPPE_BENCHMARK=1.
 
 
 E.g. We know get_controller is supposed to be cached and hence shouldn't make query post first
@@ -18,8 +19,10 @@ query. This test can be written like this.
 """
 
 import gc
+import os
 import sys
 import time
+import unittest
 from unittest.mock import patch
 
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
@@ -36,6 +39,8 @@ from frappe.website.path_resolver import PathResolver
 
 TEST_USER = "test@example.com"
 
+benchmark = unittest.skipUnless(os.environ.get("FRAPPE_BENCHMARK"), "set FRAPPE_BENCHMARK=1 to run")
+
 
 @run_only_if(db_type_is.MARIADB)
 class TestPerformance(FrappeTestCase):
@@ -59,6 +64,48 @@ class TestPerformance(FrappeTestCase):
 		with self.assertQueryCount(0):
 			frappe.get_meta("User")
 
+	def test_meta_process_cache(self):
+		"""A warm worker reuses Meta across requests with a single Redis call per request"""
+		from frappe.desk.form.meta import FormMeta
+		from frappe.model.meta import get_process_cache, get_process_cache_info
+
+		def new_request():
+			frappe.destroy()
+			frappe.init(site=self.TEST_SITE)
+			frappe.connect()
+
+		frappe.get_meta("User")
+		get_process_cache().clear()
+
+		# cold worker, Meta is unpickled from redis
+		new_request()
+		with self.assertRedisCallCounts(2), self.assertQueryCount(0):
+			user_meta = frappe.get_meta("User")
+
+		# warm worker, only the schema version is read and the same Meta is returned
+		new_request()
+		with (
+			self.assertRedisCallCounts(1),
+			self.assertQueryCount(0),
+			patch("frappe.model.meta.pickle.loads") as loads,
+		):
+			self.assertIs(frappe.get_meta("User"), user_meta)
+			self.assertIs(frappe.get_meta("User"), user_meta)
+		loads.assert_not_called()
+
+		info = get_process_cache_info()
+		self.assertGreater(info["memory"], 0)
+		self.assertGreaterEqual(info["hits"], 2)
+
+		# FormMeta (built per request in developer mode) modifies its own copy
+		form_meta = FormMeta("User")
+		self.assertIsNot(form_meta.get_field("email"), user_meta.get_field("email"))
+		self.assertIsNone(user_meta.get("__assets_loaded"))
+
+		# schema changes drop the cached Meta
+		frappe.clear_cache(doctype="User")
+		self.assertIsNot(frappe.get_meta("User"), user_meta)
+
 	def test_permitted_fieldnames(self):
 		frappe.clear_cache()
 
@@ -120,6 +167,22 @@ class TestPerformance(FrappeTestCase):
 		with self.assertQueryCount(0):
 			doc.get_invalid_links()
 
+	def test_batched_link_validation(self):
+		"""Links of a document and all its rows are validated with one query per linked DocType"""
+		roles = frappe.get_all("Role", pluck="name", limit=50)
+		doc = frappe.new_doc("Role Profile")
+		doc._action = "save"
+		for i in range(200):
+			doc.append("roles", {"role": roles[i % len(roles)]})
+
+		doc._validate_links()  # Warm up code
+		with self.assertQueryCount(1):
+			doc._validate_links()
+
+		doc.append("roles", {"role": "_Test Missing Role"})
+		with self.assertRaisesRegex(frappe.LinkValidationError, "_Test Missing Role"):
+			doc._validate_links()
+
 	@retry(
 		retry=retry_if_exception_type(AssertionError),
 		stop=stop_after_attempt(3),
@@ -150,6 +213,67 @@ class TestPerformance(FrappeTestCase):
 			"Possible performance regression in basic /api/Resource list  requests",
 		)
 
+	@benchmark
+	def test_connection_pool_rps(self):
+		"""Benchmark of request setup and teardown with and without the connection pool"""
+		from frappe.database import pool
+
+		def requests_per_second(count=200):
+			start = time.perf_counter()
+			for _ in range(count):
+				frappe.destroy()
+				frappe.init(site=self.TEST_SITE)
+				frappe.connect()
+				frappe.db.sql("select 1")
+			return count / (time.perf_counter() - start)
+
+		without_pool = requests_per_second()
+		with patch.object(pool, "get_pool_size", return_value=4):
+			requests_per_second(10)  # warm up the pool
+			with_pool = requests_per_second()
+			pool.get_pool().clear()
+
+		self.assertGreater(with_pool, without_pool)
+
+	@benchmark
+	def test_keyset_pagination(self):
+		"""Benchmark of page times at increasing depth with offset and keyset pagination"""
+		rows, page_length = 20_000, 100
+		now = frappe.utils.now_datetime()
+		frappe.db.bulk_insert(
+			"ToDo",
+			["name", "description", "status", "creation", "modified"],
+			[
+				(f"keyset-{i}", "keyset benchmark", "Open", now, frappe.utils.add_to_date(now, seconds=i))
+				for i in range(rows)
+			],
+		)
+		self.addCleanup(frappe.db.delete, "ToDo", {"description": "keyset benchmark"})
+
+		def offset_page_times():
+			times = []
+			for start in range(0, rows, page_length):
+				started = time.perf_counter()
+				frappe.get_all("ToDo", order_by="modified desc", limit=page_length, start=start)
+				times.append(time.perf_counter() - started)
+			return times
+
+		def keyset_page_times():
+			times, after = [], ""
+			while after is not None:
+				started = time.perf_counter()
+				after = frappe.get_all("ToDo", order_by="modified desc", limit=page_length, after=after).after
+				times.append(time.perf_counter() - started)
+			return times
+
+		def ms(times):
+			return 1000 * sum(times) / len(times)
+
+		offset, keyset = offset_page_times(), keyset_page_times()
+		self.assertLess(ms(keyset[-10:]), ms(offset[-10:]))
+		# deep keyset pages are about as fast as the first ones
+		self.assertLess(ms(keyset[-10:]), 3 * ms(keyset[:10]))
+
 	def test_homepage_resolver(self):
 		paths = ["/", "/app"]
 		for path in paths:
@@ -138,6 +138,26 @@ class TestRecorder(FrappeTestCase):
 		for query, call in zip(queries, request["calls"], strict=False):
 			self.assertEqual(call["exact_copies"], query[1])
 
+	def test_n_plus_one(self):
+		for i in range(frappe.recorder.N_PLUS_ONE_THRESHOLD + 2):
+			frappe.db.sql("select email from tabUser where name = %s", f"user-{i}")
+		for _i in range(3):
+			frappe.db.sql("select count(*) from tabDocType")
+
+		self.stop_recording()
+
+		requests = frappe.recorder.get()
+		request = frappe.recorder.get(requests[0]["uuid"])
+
+		self.assertEqual(len(request["n_plus_one"]), 1)
+		finding = request["n_plus_one"][0]
+		self.assertEqual(finding["count"], frappe.recorder.N_PLUS_ONE_THRESHOLD + 2)
+		self.assertIn("test_recorder.py", finding["call_site"])
+		self.assertIn('frappe.get_all("User", filters={"name": ("in", values)}', finding["suggestion"])
+
+		report = frappe.recorder.get_n_plus_one_report()
+		self.assertEqual(report[0]["n_plus_one"][0]["call_site"], finding["call_site"])
+
 	def test_error_page_rendering(self):
 		content = get_response_content("error")
 		self.assertIn("Error", content)
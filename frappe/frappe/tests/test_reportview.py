@@ -33,6 +33,29 @@ class TestReportview(FrappeTestCase):
 						self.assertEqual(int(row["Is Single"]), 1)
 						self.assertEqual(row["Module"], "Core")
 
+	def test_large_export_is_streamed(self):
+		from unittest.mock import patch
+
+		from frappe.desk import utils
+
+		frappe.local.form_dict = frappe._dict(
+			doctype="DocType",
+			file_format_type="CSV",
+			fields=("name", "module"),
+			filters={"module": "Core"},
+		)
+
+		export_query()
+		content = frappe.response["filecontent"]
+		self.assertIsInstance(content, bytes)
+
+		# past the spool size the export is written to a temporary file that is sent as it is read
+		with patch.object(utils, "EXPORT_SPOOL_SIZE", 100):
+			export_query()
+
+		with frappe.response["filecontent"] as file:
+			self.assertEqual(file.read(), content)
+
 	def test_extract_fieldname(self):
 		self.assertEqual(
 			extract_fieldnames("count(distinct `tabPhoto`.name) as total_count")[0], "tabPhoto.name"
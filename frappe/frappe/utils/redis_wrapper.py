@@ -2,6 +2,7 @@
 # License: MIT. See LICENSE
 import pickle
 import re
+from time import perf_counter
 
 import redis
 from redis.commands.search import Search
@@ -34,6 +35,17 @@ class RedisWrapper(redis.Redis):
 		except redis.exceptions.ConnectionError:
 			return False
 
+	def execute_command(self, *args, **options):
+		if not (counters := getattr(frappe.local, "counters", None)):
+			return super().execute_command(*args, **options)
+
+		start = perf_counter()
+		try:
+			return super().execute_command(*args, **options)
+		finally:
+			counters.redis_calls += 1
+			counters.redis_time += perf_counter() - start
+
 	def __call__(self):
 		"""WARNING: Added for backward compatibility to support frappe.cache().method(...)"""
 		return self
@@ -96,6 +108,12 @@ class RedisWrapper(redis.Redis):
 			if val is not None:
 				val = pickle.loads(val)
 
+			if counters := getattr(frappe.local, "counters", None):
+				if val is None:
+					counters.cache_misses += 1
+				else:
+					counters.cache_hits += 1
+
 			if not expires:
 				if val is None and generator:
 					val = generator()
@@ -234,6 +252,12 @@ class RedisWrapper(redis.Redis):
 		except redis.exceptions.ConnectionError:
 			pass
 
+		if counters := getattr(frappe.local, "counters", None):
+			if value is None:
+				counters.cache_misses += 1
+			else:
+				counters.cache_hits += 1
+
 		if value is not None:
 			value = pickle.loads(value)
 			local_cache[_name][key] = value
@@ -15,6 +15,7 @@ import werkzeug.utils
 from werkzeug.exceptions import Forbidden, NotFound
 from werkzeug.local import LocalProxy
 from werkzeug.wrappers import Response
+from werkzeug.wsgi import wrap_file
 
 import frappe
 import frappe.model.document
@@ -157,7 +158,15 @@ def as_binary():
 	filename = frappe.response["filename"]
 	filename = filename.encode("utf-8").decode("unicode-escape", "ignore")
 	response.headers.add("Content-Disposition", None, filename=filename)
-	response.data = frappe.response["filecontent"]
+
+	content = frappe.response["filecontent"]
+	if hasattr(content, "read"):
+		# large exports are streamed from a temporary file, closed once sent
+		response.response = wrap_file(frappe.local.request.environ, content)
+		response.direct_passthrough = True
+	else:
+		response.data = content
+
 	return response
 
 
@@ -32,50 +32,59 @@ def get_excel_date_format():
 
 # return xlsx file object
 def make_xlsx(data, sheet_name, wb=None, column_widths=None):
-	column_widths = column_widths or []
 	if wb is None:
 		wb = openpyxl.Workbook(write_only=True)
 
+	ws = add_sheet(wb, sheet_name, column_widths)
+	date_format, time_format = get_excel_date_format()
+
+	for row in data:
+		ws.append(get_xlsx_row(ws, row, sheet_name, date_format, time_format))
+
+	xlsx_file = BytesIO()
+	wb.save(xlsx_file)
+	return xlsx_file
+
+
+def add_sheet(wb, sheet_name, column_widths=None):
 	sheet_name_sanitized = INVALID_TITLE_REGEX.sub(" ", sheet_name)
 	ws = wb.create_sheet(sheet_name_sanitized, 0)
 
-	for i, column_width in enumerate(column_widths):
+	for i, column_width in enumerate(column_widths or []):
 		if column_width:
 			ws.column_dimensions[get_column_letter(i + 1)].width = column_width
 
 	row1 = ws.row_dimensions[1]
 	row1.font = Font(name="Calibri", bold=True)
 
-	date_format, time_format = get_excel_date_format()
+	return ws
 
-	for row in data:
-		clean_row = []
-		for item in row:
-			if isinstance(item, str) and (sheet_name not in ["Data Import Template", "Data Export"]):
-				value = handle_html(item)
-			else:
-				value = item
-
-			if isinstance(item, str) and next(ILLEGAL_CHARACTERS_RE.finditer(value), None):
-				# Remove illegal characters from the string
-				value = ILLEGAL_CHARACTERS_RE.sub("", value)
-
-			if isinstance(value, datetime.date | datetime.datetime):
-				number_format = date_format
-				if isinstance(value, datetime.datetime):
-					number_format = f"{date_format} {time_format}"
-
-				cell = WriteOnlyCell(ws, value=value)
-				cell.number_format = number_format
-				clean_row.append(cell)
-			else:
-				clean_row.append(value)
-
-		ws.append(clean_row)
 
-	xlsx_file = BytesIO()
-	wb.save(xlsx_file)
-	return xlsx_file
+def get_xlsx_row(ws, row, sheet_name, date_format, time_format):
+	"""Returns `row` with HTML and illegal characters removed and dates formatted, to append to `ws`."""
+	clean_row = []
+	for item in row:
+		if isinstance(item, str) and (sheet_name not in ["Data Import Template", "Data Export"]):
+			value = handle_html(item)
+		else:
+			value = item
+
+		if isinstance(item, str) and next(ILLEGAL_CHARACTERS_RE.finditer(value), None):
+			# Remove illegal characters from the string
+			value = ILLEGAL_CHARACTERS_RE.sub("", value)
+
+		if isinstance(value, datetime.date | datetime.datetime):
+			number_format = date_format
+			if isinstance(value, datetime.datetime):
+				number_format = f"{date_format} {time_format}"
+
+			cell = WriteOnlyCell(ws, value=value)
+			cell.number_format = number_format
+			clean_row.append(cell)
+		else:
+			clean_row.append(value)
+
+	return clean_row
 
 
 def handle_html(data):
@@ -479,6 +479,10 @@ def make_layout(doc, meta, format_data=None):
 
 			df.print_hide = 0
 
+		elif df.fieldtype == "Table":
+			# rows of this document are set on the field below, don't modify the cached Meta
+			df = copy.copy(df)
+
 		if df.fieldtype == "Section Break" or page == []:
 			if len(page) > 1:
 				if not page[-1]["has_data"]:
@@ -1,6 +1,22 @@
 import frappe
 from frappe import _
-import random
+from frappe.rate_limiter import rate_limit
+from frappe.utils import cint
+
+from homesol_app.utils.bulk import get_docs_as_dict
+from homesol_app.utils.otp import send_otp, verify_otp
+from homesol_app.utils.pagination import get_page, stream_ndjson
+from homesol_app.utils.response_cache import cached_response
+from homesol_app.utils.sync import get_changes
+
+CATALOG_DOCTYPES = (
+    "Property Projects",
+    "Developer",
+    "Mandate",
+    "Site Visit",
+    "Channel Partner",
+    "Property Sales Team",
+)
 
 @frappe.whitelist()
 def get_my_lead():
@@ -16,93 +32,72 @@ def get_my_lead():
     return doc.as_dict()
 
 @frappe.whitelist(allow_guest=True)
+@cached_response("Property Projects")
 def get_all_projects():
-    project_list = frappe.get_all("Property Projects", fields=["name"])
-    full_data = []
-    for project in project_list:
-        doc = frappe.get_doc("Property Projects", project.name)
-        full_data.append(doc.as_dict())
-    return full_data
+    return get_docs_as_dict("Property Projects")
 
 @frappe.whitelist(allow_guest=True)
+@cached_response("Developer")
 def get_all_developers():
-    dev_list = frappe.get_all("Developer", fields=["name"])
-    full_data = []
-    for dev in dev_list:
-        doc = frappe.get_doc("Developer", dev.name)
-        full_data.append(doc.as_dict())
-    return full_data
+    return get_docs_as_dict("Developer")
 
 @frappe.whitelist(allow_guest=True)
+@cached_response("Mandate")
 def get_all_mandates():
-    mandate_list = frappe.get_all("Mandate", fields=["name"]) 
-    full_data = []
-    for item in mandate_list:
-        doc = frappe.get_doc("Mandate", item.name)
-        full_data.append(doc.as_dict())
-    return full_data
+    return get_docs_as_dict("Mandate")
 
 @frappe.whitelist(allow_guest=True) 
 def get_all_site_visits():
-    visit_list = frappe.get_all("Site Visit", fields=["name"])
-    full_data = []
-    for visit in visit_list:
-        doc = frappe.get_doc("Site Visit", visit.name)
-        full_data.append(doc.as_dict())
-    return full_data
+    return get_docs_as_dict("Site Visit")
 
 @frappe.whitelist(allow_guest=True)
 def get_all_channel_partners():
-    cp_list = frappe.get_all("Channel Partner", fields=["name"])
-    full_data = []
-    for cp in cp_list:
-        doc = frappe.get_doc("Channel Partner", cp.name)
-        full_data.append(doc.as_dict())
-    return full_data
+    return get_docs_as_dict("Channel Partner")
 
 @frappe.whitelist(allow_guest=True)
 def get_all_sales_team():
-    team_list = frappe.get_all("Property Sales Team", fields=["name"])
-    full_data = []
-    for team in team_list:
-        doc = frappe.get_doc("Property Sales Team", team.name)
-        full_data.append(doc.as_dict())
-    return full_data
+    return get_docs_as_dict("Property Sales Team")
+
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def get_catalog_page(doctype, cursor=None, limit=None, fields=None, stream=0):
+    """
+    Paginated variant of the get_all_* APIs, ordered by (modified, name).
+    - Pass `next_cursor` from the previous page as `cursor` to continue.
+    - `fields` (JSON list) limits the columns and child tables returned.
+    - `stream=1` returns all rows after `cursor` as NDJSON instead of a page.
+    """
+    if doctype not in CATALOG_DOCTYPES:
+        frappe.throw(_("{0} is not available through the catalog API").format(doctype), frappe.PermissionError)
+
+    if cint(stream):
+        return stream_ndjson(doctype, cursor=cursor, fields=fields)
+
+    return get_page(doctype, cursor=cursor, limit=limit, fields=fields)
+
+@frappe.whitelist(allow_guest=True)
+def sync_catalog(tokens=None, limit=None):
+    """
+    Delta sync for the mobile app.
+    - `tokens` (JSON) maps DocType to the `token` returned by the previous call.
+    - Returns only rows created, updated or deleted since then, per DocType.
+    """
+    return get_changes(tokens, limit=limit)
 
 
 
 
 @frappe.whitelist()
+@rate_limit(key="mobile_no", limit=10, seconds=60 * 60)
 def trigger_otp_lead(mobile_no, lead_name=None):
     """
-    Generates OTP.
+    Generates OTP and queues the SMS.
     - If Lead is new (no valid ID), uses Mobile No as the cache key.
     - If Lead is saved, uses Lead Name as the cache key.
     """
     if not mobile_no:
         frappe.throw(_("Mobile Number is required to send OTP"))
 
-    # Determine the unique Cache Key
-    # If lead_name is real (not None and not temporary 'new-lead-...'), use it.
-    if lead_name and not lead_name.startswith("new-lead"):
-        cache_key = f"lead_otp:{lead_name}"
-    else:
-        # New Unsaved Lead -> Use Mobile Number as key
-        cache_key = f"lead_otp:{mobile_no}"
-
-    # Generate 6-digit Random OTP
-    otp = str(random.randint(100000, 999999))
-
-    # Store OTP in Cache (Expires in 10 minutes)
-    frappe.cache().set_value(cache_key, otp, expires_in_sec=600)
-
-    # DEBUG: Show OTP on screen
-    frappe.msgprint(f"<b>DEBUG MODE:</b><br>Sending to: <b>{mobile_no}</b><br>OTP: <b>{otp}</b>")
-
-    # TODO: Uncomment for real SMS
-    # from frappe.core.doctype.sms_settings.sms_settings import send_sms
-    # send_sms([mobile_no], f"Your verification code is {otp}")
-    
+    send_otp(get_lead_otp_key(mobile_no, lead_name), mobile_no, "Your verification code is {otp}")
     return "success"
 
 
@@ -114,16 +109,14 @@ def verify_otp_lead(user_otp, mobile_no, lead_name=None):
     if not user_otp:
         return False
 
-    # Reconstruct the Key to find the OTP
-    if lead_name and not lead_name.startswith("new-lead"):
-        cache_key = f"lead_otp:{lead_name}"
-    else:
-        cache_key = f"lead_otp:{mobile_no}"
+    # The OTP is cleared on success so it can't be used twice
+    return bool(verify_otp(get_lead_otp_key(mobile_no, lead_name), user_otp))
+
 
-    cached_otp = frappe.cache().get_value(cache_key)
+def get_lead_otp_key(mobile_no, lead_name=None):
+    # If lead_name is real (not None and not temporary 'new-lead-...'), use it.
+    if lead_name and not lead_name.startswith("new-lead"):
+        return f"lead_otp:{lead_name}"
 
-    if cached_otp and str(user_otp) == str(cached_otp):
-        frappe.cache().delete_value(cache_key) # Clear cache so it can't be used twice
-        return True
-    else:
-        return False
\ No newline at end of file
+    # New Unsaved Lead -> Use Mobile Number as key
+    return f"lead_otp:{mobile_no}"
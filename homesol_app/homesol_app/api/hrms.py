@@ -2,8 +2,14 @@ import frappe
 from frappe.utils import now_datetime, getdate, today, flt
 import json
 
+from homesol_app.utils.checkin import ingest_checkins
+from homesol_app.utils.employee import get_employee_context, get_employee_name
+from homesol_app.utils.leave_balance import get_leave_balances
+from homesol_app.utils.response_cache import cached_response
+
 # --- Attendance & Check-in ---
 @frappe.whitelist(allow_guest=True)
+@cached_response("Shift Type")
 def get_shift_types():
     shifts = frappe.get_all("Shift Type", fields=["name", "start_time", "end_time", "holiday_list"])
     return shifts
@@ -14,7 +20,7 @@ def employee_checkin(log_type, latitude=None, longitude=None, device_id=None, de
     if user == "Guest":
         frappe.throw("Please log in to check in.")
 
-    employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+    employee = get_employee_name(user)
     if not employee:
         frappe.throw("No Employee record found linked to this user.")
 
@@ -38,6 +44,41 @@ def employee_checkin(log_type, latitude=None, longitude=None, device_id=None, de
         frappe.log_error(f"Checkin Error: {str(e)}")
         return {"status": "error", "message": str(e)}
 
+@frappe.whitelist(methods=["POST"])
+def employee_checkin_batch(punches):
+    """
+    Uploads punches queued on the device while offline.
+    - `punches`: list of {"idempotency_key", "log_type", "time", "latitude", "longitude", "device_id", "device_type"}
+    - Returns one {"idempotency_key", "status", "name", "message"} per punch,
+      status is "created", "duplicate" or "error". Safe to retry.
+    """
+    user = frappe.session.user
+    if user == "Guest":
+        frappe.throw("Please log in to check in.")
+
+    employee = get_employee_name(user)
+    if not employee:
+        frappe.throw("No Employee record found linked to this user.")
+
+    if isinstance(punches, str):
+        punches = json.loads(punches)
+
+    return {"status": "success", "data": ingest_checkins(employee, punches)}
+
+@frappe.whitelist()
+def tag_checkin_project_sites(from_date=None, to_date=None):
+    """Queues tagging of existing check-ins with the project site they were made at."""
+    frappe.only_for(("HR Manager", "System Manager"))
+    frappe.enqueue(
+        "homesol_app.utils.geofence.tag_checkins",
+        queue="long",
+        job_id=f"tag_checkin_project_sites::{from_date}::{to_date}",
+        deduplicate=True,
+        from_date=from_date,
+        to_date=to_date,
+    )
+    return {"status": "success", "message": "Tagging queued"}
+
 from frappe.utils import get_first_day, get_last_day
 
 @frappe.whitelist()
@@ -47,7 +88,7 @@ def get_my_attendance_history(month=None, year=None):
     If month/year not provided, defaults to current month.
     """
     user = frappe.session.user
-    employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+    employee = get_employee_name(user)
     
     if not employee:
         return {"status": "error", "message": "No Employee found"}
@@ -90,14 +131,13 @@ def get_my_holidays():
     if user == "Guest":
         frappe.throw("Please log in")
 
-    employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+    employee = get_employee_context(user)
     if not employee:
         return {"message": "No Employee found for this user"}
 
-    holiday_list_name = frappe.db.get_value("Employee", employee, "holiday_list")
+    holiday_list_name = employee.holiday_list
     if not holiday_list_name:
-        company = frappe.db.get_value("Employee", employee, "company")
-        holiday_list_name = frappe.db.get_value("Company", company, "default_holiday_list")
+        holiday_list_name = frappe.db.get_value("Company", employee.company, "default_holiday_list")
 
     if holiday_list_name:
         return frappe.get_doc("Holiday List", holiday_list_name).as_dict()
@@ -110,42 +150,29 @@ def get_my_leave_balance():
     if user == "Guest":
         frappe.throw("Please log in.")
 
-    employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+    employee = get_employee_name(user)
     if not employee:
         return {"status": "error", "message": "No Employee linked to this user."}
 
-    allocations = frappe.get_all(
-        "Leave Allocation",
-        filters={"employee": employee, "to_date": [">=", today()], "docstatus": 1},
-        fields=["name", "leave_type", "total_leaves_allocated", "new_leaves_allocated", "total_leaves_encashed"]
-    )
-
-    data = []
-    for alloc in allocations:
-        leaves_taken = frappe.get_all("Leave Application", 
-            filters={"employee": employee, "leave_type": alloc.leave_type, "status": "Approved", "docstatus": 1},
-            fields=["total_leave_days"]
-        )
-        used_count = sum([x.total_leave_days for x in leaves_taken])
-        total_allocated = flt(alloc.total_leaves_allocated) + flt(alloc.new_leaves_allocated)
-        remaining = total_allocated - used_count
-
-        data.append({
-            "leave_type": alloc.leave_type,
-            "allocated": total_allocated,
-            "used": used_count,
-            "remaining": remaining
-        })
+    data = get_leave_balances(employee)[employee]
 
     return {"status": "success", "employee": employee, "leaves": data}
 
+@frappe.whitelist()
+def get_department_leave_balances(department, date=None):
+    """Leave balances of every employee in a department the user can read, for HR dashboards."""
+    frappe.has_permission("Leave Ledger Entry", "read", throw=True)
+    frappe.has_permission("Department", "read", doc=department, throw=True)
+    employees = frappe.get_list("Employee", filters={"department": department, "status": "Active"}, pluck="name")
+    return {"status": "success", "balances": get_leave_balances(employees, date)}
+
 @frappe.whitelist()
 def apply_leave_by_employee(leave_type, from_date, to_date, reason, is_half_day=0, half_day_period=None):
     user = frappe.session.user
     if user == "Guest":
         frappe.throw("Please log in.")
 
-    employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+    employee = get_employee_name(user)
     if not employee:
         frappe.throw("No Employee linked to this user.")
 
@@ -190,7 +217,7 @@ def get_my_leave_applications():
         frappe.throw("Please log in.")
 
     # 1. Get Employee ID
-    employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+    employee = get_employee_name(user)
     if not employee:
         return {"status": "error", "message": "No Employee linked to this user."}
 
@@ -226,7 +253,7 @@ def get_my_leave_applications():
 def get_my_salary_slips():
     """Returns a list of salary slips for the logged-in employee."""
     user = frappe.session.user
-    employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+    employee = get_employee_name(user)
     
     if not employee:
         return {"status": "error", "message": "No Employee found"}
@@ -254,7 +281,7 @@ def download_salary_slip(salary_slip_id):
     """Returns the PDF URL for a specific salary slip."""
     # Security check: Ensure this slip belongs to the user
     user = frappe.session.user
-    employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+    employee = get_employee_name(user)
     
     slip_owner = frappe.db.get_value("Salary Slip", salary_slip_id, "employee")
     
@@ -274,7 +301,7 @@ def get_my_tax_info():
     Fetches the employee's Tax Regime (Old/New) and active Payroll Period.
     """
     user = frappe.session.user
-    employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+    employee = get_employee_name(user)
     
     if not employee:
         return {"status": "error", "message": "No Employee found"}
@@ -317,7 +344,7 @@ def submit_tax_declaration(payroll_period, declarations):
     declarations: List of JSON objects like [{"exemption_sub_category": "80C", "amount": 150000}]
     """
     user = frappe.session.user
-    employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+    employee = get_employee_name(user)
     
     if isinstance(declarations, str):
         declarations = json.loads(declarations)
@@ -362,7 +389,7 @@ def get_salary_breakdown():
     Fetches the Earnings and Deductions breakdown from the latest Salary Slip.
     """
     user = frappe.session.user
-    employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+    employee = get_employee_name(user)
     
     if not employee:
         return {"status": "error", "message": "No Employee found"}
@@ -410,4 +437,103 @@ def get_salary_breakdown():
         "total_deduction": doc.total_deduction,
         "earnings": earnings_list,
         "deductions": deductions_list
-    }
\ No newline at end of file
+    }
+
+#------Home Screen APIs------#
+
+HOME_SCREEN_VERSION = 1
+HOME_SCREEN_SECTIONS = ("profile", "attendance", "holidays", "leave_balance", "leave_applications", "salary_slips")
+
+@frappe.whitelist()
+def get_home_screen(sections=None, month=None, year=None):
+    """
+    Everything the HR app shows on launch, in one request.
+    - `sections` (JSON list or comma separated) picks what to include, all by default.
+    - Uses a compact, versioned schema instead of full documents.
+    """
+    user = frappe.session.user
+    if user == "Guest":
+        frappe.throw("Please log in.")
+
+    employee = get_employee_context(user)
+    if not employee:
+        return {"status": "error", "message": "No Employee linked to this user."}
+
+    if not sections:
+        sections = HOME_SCREEN_SECTIONS
+    elif isinstance(sections, str):
+        sections = json.loads(sections) if sections.startswith("[") else sections.split(",")
+
+    loaders = {
+        "profile": lambda: _get_profile_summary(employee),
+        "attendance": lambda: _get_attendance_summary(employee, month, year),
+        "holidays": lambda: _get_holiday_summary(employee),
+        "leave_balance": lambda: get_leave_balances(employee.name)[employee.name],
+        "leave_applications": lambda: _get_recent_leave_applications(employee),
+        "salary_slips": lambda: _get_recent_salary_slips(employee),
+    }
+
+    data = {"version": HOME_SCREEN_VERSION, "employee": employee.name}
+    for section in sections:
+        section = section.strip()
+        if section not in loaders:
+            frappe.throw(f"Unknown section: {section}")
+        data[section] = loaders[section]()
+
+    return {"status": "success", "data": data}
+
+def _get_profile_summary(employee):
+    return frappe.db.get_value(
+        "Employee",
+        employee.name,
+        ["employee_name", "designation", "department", "company", "image", "date_of_joining", "cell_number"],
+        as_dict=True,
+    )
+
+def _get_attendance_summary(employee, month=None, year=None):
+    current_date = getdate(today())
+    start_date = f"{year or current_date.year}-{int(month or current_date.month):02d}-01"
+
+    return frappe.get_all(
+        "Attendance",
+        filters={
+            "employee": employee.name,
+            "attendance_date": ["between", [start_date, get_last_day(start_date)]],
+            "docstatus": 1
+        },
+        fields=["attendance_date as date", "status"],
+        order_by="attendance_date asc"
+    )
+
+def _get_holiday_summary(employee):
+    holiday_list = employee.holiday_list or frappe.db.get_value("Company", employee.company, "default_holiday_list")
+    if not holiday_list:
+        return None
+
+    return {
+        "holiday_list": holiday_list,
+        "holidays": frappe.get_all(
+            "Holiday",
+            filters={"parent": holiday_list, "parenttype": "Holiday List"},
+            fields=["holiday_date as date", "description", "weekly_off"],
+            order_by="holiday_date asc"
+        ),
+    }
+
+def _get_recent_leave_applications(employee, limit=10):
+    return frappe.get_all(
+        "Leave Application",
+        filters={"employee": employee.name},
+        fields=["name", "leave_type", "from_date", "to_date", "total_leave_days", "status", "half_day"],
+        order_by="posting_date desc, creation desc",
+        limit=limit
+    )
+
+def _get_recent_salary_slips(employee, limit=6):
+    return frappe.get_all(
+        "Salary Slip",
+        filters={"employee": employee.name, "docstatus": 1},
+        fields=["name", "start_date", "end_date", "net_pay", "gross_pay"],
+        order_by="posting_date desc",
+        limit=limit
+    )
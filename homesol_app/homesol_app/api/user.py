@@ -1,12 +1,14 @@
 import frappe
 
+from homesol_app.utils.employee import get_employee_name
+
 @frappe.whitelist()
 def get_my_profile():
     logged_in_user = frappe.session.user
     if logged_in_user == "Guest":
         frappe.throw("You must be logged in to view your profile.")
 
-    employee_name = frappe.db.get_value("Employee", {"user_id": logged_in_user}, "name")
+    employee_name = get_employee_name(logged_in_user)
     if not employee_name:
         return {"status": "error", "message": "No Employee record found linked to this user."}
 
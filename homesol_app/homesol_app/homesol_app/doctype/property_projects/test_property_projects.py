@@ -1,9 +1,257 @@
 # Copyright (c) 2025, homesol_team and Contributors
 # See license.txt
 
-# import frappe
+import os
+import random
+import time
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from homesol_app.utils.bulk import get_docs_as_dict
+from homesol_app.utils.geofence import GeofenceIndex, clear_geofence_index, get_geofence_index
+from homesol_app.utils.pagination import get_page
+from homesol_app.utils.response_cache import (
+	acquire_lock,
+	clear_cache,
+	get_cache_key,
+	get_entry,
+	get_lock_key,
+	release_lock,
+)
+from homesol_app.utils.sync import get_doctype_changes
+
+
+def make_projects(count):
+	names = []
+	for _i in range(count):
+		doc = frappe.get_doc(
+			{
+				"doctype": "Property Projects",
+				"project_name": f"_Test Project {frappe.generate_hash(length=8)}",
+				"configurations": [
+					{"configuration_name": "2 BHK", "carpet_area": 650, "price": 7500000},
+					{"configuration_name": "3 BHK", "carpet_area": 900, "price": 11000000},
+				],
+				"amenities": [{"data": "Pool"}, {"data": "Gym"}],
+			}
+		).insert()
+		names.append(doc.name)
+	return names
+
+
+def sync_to_end(token=None):
+	while True:
+		changes = get_doctype_changes("Property Projects", token, limit=1000)
+		token = changes["token"]
+		if not changes["has_more"]:
+			return token
+
 
 class TestProjects(FrappeTestCase):
-	pass
+	def test_bulk_loader_matches_get_doc(self):
+		names = make_projects(3)
+		payload = {d.name: d for d in get_docs_as_dict("Property Projects", {"name": ("in", names)})}
+
+		for name in names:
+			self.assertEqual(payload[name], frappe.get_doc("Property Projects", name).as_dict())
+
+	def test_bulk_loader_query_count(self):
+		names = make_projects(5)
+		table_fields = frappe.get_meta("Property Projects").get_table_fields()
+
+		# one query for parents and one per child table, regardless of row count
+		with self.assertQueryCount(1 + len(table_fields)):
+			get_docs_as_dict("Property Projects", {"name": ("in", names)})
+
+	def test_keyset_pagination(self):
+		names = set(make_projects(5))
+
+		seen, cursor = [], None
+		while True:
+			page = get_page("Property Projects", cursor=cursor, limit=2, fields=["project_name", "amenities"])
+			seen.extend(page["data"])
+			cursor = page["next_cursor"]
+			if not cursor:
+				break
+
+		seen_names = [row.name for row in seen]
+		self.assertEqual(len(seen_names), len(set(seen_names)))
+		self.assertTrue(names.issubset(seen_names))
+
+		row = next(row for row in seen if row.name in names)
+		self.assertEqual(set(row), {"name", "modified", "project_name", "amenities"})
+		self.assertEqual(len(row.amenities), 2)
+
+	def test_delta_sync(self):
+		make_projects(2)
+		token = sync_to_end()
+
+		changed, deleted = make_projects(2)
+		frappe.get_doc("Property Projects", changed).save()
+		frappe.delete_doc("Property Projects", deleted)
+
+		changes = get_doctype_changes("Property Projects", token)
+		self.assertEqual([d.name for d in changes["upserted"]], [changed])
+		self.assertEqual(len(changes["upserted"][0].configurations), 2)
+		self.assertEqual(changes["deleted"], [deleted])
+
+		changes = get_doctype_changes("Property Projects", changes["token"])
+		self.assertEqual((changes["upserted"], changes["deleted"]), ([], []))
+
+	def test_response_cache_invalidation(self):
+		key = get_cache_key("test_response_cache", "Property Projects")
+		clear_cache("Property Projects")
+
+		entry = get_entry(key, lambda: "first", ttl=60)
+		self.assertEqual(get_entry(key, lambda: "second", ttl=60), entry)
+
+		# unrelated doctype leaves the entry alone, a child table drops it
+		clear_cache("Developer")
+		self.assertEqual(get_entry(key, lambda: "second", ttl=60), entry)
+		clear_cache("Project Amenity")
+		self.assertNotEqual(get_entry(key, lambda: "second", ttl=60)["etag"], entry["etag"])
+
+	def test_response_cache_lock(self):
+		key = get_cache_key("test_response_cache_lock", "Property Projects")
+		token = acquire_lock(key)
+		self.assertTrue(token)
+		self.assertIsNone(acquire_lock(key))
+
+		# a worker whose lock expired must not release the lock of the next holder
+		release_lock(key, "expired")
+		self.assertIsNone(acquire_lock(key))
+
+		release_lock(key, token)
+		self.assertTrue(acquire_lock(key))
+		frappe.cache.delete(get_lock_key(key))
+
+	def test_cached_response_outside_http_call(self):
+		from homesol_app.api.crm import get_all_projects
+
+		# python callers in a request for another method get the data, not the cached HTTP response
+		with (
+			patch.object(frappe.local, "request", frappe._dict(headers={}), create=True),
+			patch.dict(frappe.form_dict, {"cmd": "homesol_app.api.crm.get_catalog_page"}),
+		):
+			self.assertIsInstance(get_all_projects(), list)
+
+	def test_geofence_index(self):
+		index = GeofenceIndex(
+			[
+				{
+					"doctype": "Property Projects",
+					"name": "A",
+					"latitude": 19.0760,
+					"longitude": 72.8777,
+					"radius": 500,
+				},
+				{
+					"doctype": "Property Projects",
+					"name": "B",
+					"latitude": 19.0800,
+					"longitude": 72.8777,
+					"radius": 500,
+				},
+				{
+					"doctype": "Shift Location",
+					"name": "HQ",
+					"latitude": 19.0760,
+					"longitude": 72.8777,
+					"radius": 100,
+				},
+			]
+		)
+
+		# ~110m north of A, within both A and B's radius
+		project, distance = index.nearest(19.0770, 72.8777, "Property Projects")
+		self.assertEqual(project["name"], "A")
+		self.assertAlmostEqual(distance, 111, delta=2)
+
+		self.assertEqual(index.nearest(19.0770, 72.8777, "Shift Location"), (None, None))
+		self.assertEqual(index.nearest(19.2000, 72.8777), (None, None))
+
+	def test_geofence_index_cache(self):
+		index = get_geofence_index()
+		with self.assertQueryCount(0):
+			self.assertIs(get_geofence_index(), index)
+
+		# rebuilt once the change is committed
+		clear_geofence_index()
+		self.assertIs(get_geofence_index(), index)
+		frappe.db.after_commit.run()
+		self.assertIsNot(get_geofence_index(), index)
+
+	def test_geofence_benchmark(self):
+		"""Run with HOMESOL_BENCHMARK=1, 10k check-in lookups against 5k project sites."""
+		if not os.environ.get("HOMESOL_BENCHMARK"):
+			self.skipTest("set HOMESOL_BENCHMARK=1 to run")
+
+		rng = random.Random(0)
+		index = GeofenceIndex(
+			[
+				{
+					"doctype": "Property Projects",
+					"name": f"P{i}",
+					"latitude": rng.uniform(18.8, 19.4),
+					"longitude": rng.uniform(72.7, 73.1),
+					"radius": 500,
+				}
+				for i in range(5_000)
+			]
+		)
+		points = [(rng.uniform(18.8, 19.4), rng.uniform(72.7, 73.1)) for i in range(10_000)]
+
+		start = time.monotonic()
+		for lat, lng in points:
+			index.nearest(lat, lng, "Property Projects")
+		elapsed = time.monotonic() - start
+
+		self.assertLess(elapsed, 5)
+
+	def test_delta_sync_benchmark(self):
+		"""Run with HOMESOL_BENCHMARK=1, compares full and delta sync payload size and time."""
+		if not os.environ.get("HOMESOL_BENCHMARK"):
+			self.skipTest("set HOMESOL_BENCHMARK=1 to run")
+
+		make_projects(5_000)
+		start = time.monotonic()
+		full = frappe.as_json(get_docs_as_dict("Property Projects"), indent=None)
+		full_time = time.monotonic() - start
+
+		token = sync_to_end()
+		for name in make_projects(50):
+			frappe.get_doc("Property Projects", name).save()
+
+		start = time.monotonic()
+		delta = frappe.as_json(get_doctype_changes("Property Projects", token, limit=1000), indent=None)
+		delta_time = time.monotonic() - start
+
+		self.assertLess(len(delta), len(full))
+		self.assertLess(delta_time, full_time)
+
+	def test_bulk_loader_benchmark(self):
+		"""Run with HOMESOL_BENCHMARK=1, compares per-row get_doc with the bulk loader."""
+		if not os.environ.get("HOMESOL_BENCHMARK"):
+			self.skipTest("set HOMESOL_BENCHMARK=1 to run")
+
+		table_fields = frappe.get_meta("Property Projects").get_table_fields()
+		created = 0
+		for size in (1_000, 10_000, 50_000):
+			make_projects(size - created)
+			created = size
+			filters = {"project_name": ("like", "_Test Project %")}
+
+			start = time.monotonic()
+			for d in frappe.get_all("Property Projects", filters=filters):
+				frappe.get_doc("Property Projects", d.name).as_dict()
+			get_doc_time = time.monotonic() - start
+
+			# one query for parents and one per child table, regardless of row count
+			start = time.monotonic()
+			with self.assertQueryCount(1 + len(table_fields)):
+				get_docs_as_dict("Property Projects", filters)
+			bulk_time = time.monotonic() - start
+
+			self.assertLess(bulk_time, get_doc_time)
@@ -4,7 +4,9 @@
 import frappe
 from frappe.model.document import Document
 from frappe import _
-import random
+from frappe.rate_limiter import rate_limit
+
+from homesol_app.utils.otp import send_otp, verify_otp
 
 class SiteVisit(Document):
     @frappe.whitelist()
@@ -20,53 +22,31 @@ class SiteVisit(Document):
         if not mobile_number:
             frappe.throw(_("The selected Lead ({0}) does not have a Mobile Number saved.").format(self.lead))
 
-        # 3. Generate a 6-digit Random OTP
-        otp = str(random.randint(100000, 999999))
-
-        # 4. Store OTP in Cache (Key is specific to this Lead)
-        # Expires in 600 seconds (10 minutes)
-        cache_key = f"site_visit_otp:{self.lead}"
-        frappe.cache().set_value(cache_key, otp, expires_in_sec=600)
-
-        # 5. Send the Message
-        message = f"Hello! Your Verification Code for the Site Visit is {otp}. Valid for 10 mins."
-
-        try:
-            # --- OPTION A: REAL SMS (Uncomment if you have SMS Settings configured) ---
-            # from frappe.core.doctype.sms_settings.sms_settings import send_sms
-            # send_sms([mobile_number], message)
-            
-            # --- OPTION B: DEBUGGING (Pop-up on screen for testing) ---
-            # This allows you to test without spending money on SMS credits
-            frappe.msgprint(f"<b>DEBUG MODE:</b><br>Sending to Lead: <b>{mobile_number}</b><br>OTP: <b>{otp}</b>")
-            
-            return "success"
-        except Exception as e:
-            frappe.log_error(message=str(e), title="OTP Send Error")
-            return "failed"
+        # 3. Generate the OTP and queue the SMS (rate limited, stored hashed for 10 minutes)
+        send_otp(
+            f"site_visit_otp:{self.lead}",
+            mobile_number,
+            "Hello! Your Verification Code for the Site Visit is {otp}. Valid for 10 mins.",
+        )
+        return "success"
 
     @frappe.whitelist()
     def verify_client_otp(self, user_otp):
         if not self.lead:
             frappe.throw(_("Lead information is missing."))
 
-        # 1. Retrieve the OTP from Cache using the Lead ID
-        cache_key = f"site_visit_otp:{self.lead}"
-        cached_otp = frappe.cache().get_value(cache_key)
+        # 1. Compare User Input vs the pending OTP, which is cleared on success
+        #    so it cannot be used twice
+        result = verify_otp(f"site_visit_otp:{self.lead}", user_otp)
 
-        if not cached_otp:
+        if result is None:
             frappe.throw(_("The OTP has expired or is invalid. Please generate a new one."))
 
-        # 2. Compare User Input vs Cached OTP
-        if str(user_otp) == str(cached_otp):
-            # Success: Clear the cache so the OTP cannot be used twice
-            frappe.cache().delete_value(cache_key)
-            return True
-        else:
-            return False
+        return result
 
 
 @frappe.whitelist()
+@rate_limit(key="site_visit_name", limit=10, seconds=60 * 60)
 def flutter_trigger_otp(site_visit_name):
     """
     API Endpoint for Mobile App to trigger OTP.
@@ -90,15 +70,21 @@ def flutter_verify_otp(site_visit_name, user_otp):
     if not site_visit_name:
         frappe.throw(_("Site Visit Name is required"))
         
-    doc = frappe.get_doc("Site Visit", site_visit_name)
-    
-    # Call the existing function
-    result = doc.verify_client_otp(user_otp)
-    
+    # Marking the visit verified needs the same permission as saving it did
+    frappe.has_permission("Site Visit", "write", site_visit_name, throw=True)
+
+    lead = frappe.db.get_value("Site Visit", site_visit_name, "lead")
+    if not lead:
+        frappe.throw(_("Lead information is missing."))
+
+    result = verify_otp(f"site_visit_otp:{lead}", user_otp)
+
+    if result is None:
+        frappe.throw(_("The OTP has expired or is invalid. Please generate a new one."))
+
     if result is True:
-        # If verified, we also update the document status immediately for the App
-        doc.db_set("is_verified", 1)
-        doc.save()
+        # If verified, mark the document with a single UPDATE instead of a full save
+        frappe.db.set_value("Site Visit", site_visit_name, "is_verified", 1)
         return "success"
     else:
-        return "failed"
\ No newline at end of file
+        return "failed"
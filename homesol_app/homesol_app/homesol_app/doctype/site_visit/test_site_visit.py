@@ -1,9 +1,73 @@
 # Copyright (c) 2025, homesol_team and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from homesol_app.homesol_app.doctype.property_projects.test_property_projects import make_projects
+from homesol_app.homesol_app.doctype.site_visit.site_visit import flutter_verify_otp
+from homesol_app.utils.otp import (
+	MAX_ATTEMPTS,
+	SEND_LIMIT,
+	get_cache_key,
+	hash_otp,
+	send_otp,
+	verify_otp,
+)
+
 
 class TestSiteVisit(FrappeTestCase):
-	pass
+	def setUp(self):
+		self.key = f"site_visit_otp:{frappe.generate_hash()}"
+
+	def issue_otp(self):
+		"""Send an OTP for `self.key` and return it by replacing the stored hash with a known one."""
+		send_otp(self.key, "9999999999", "Your code is {otp}")
+		frappe.cache.set(get_cache_key(self.key), hash_otp(self.key, "123456"))
+		return "123456"
+
+	def test_otp_is_stored_hashed(self):
+		send_otp(self.key, "9999999999", "Your code is {otp}")
+		stored = frappe.cache.get(get_cache_key(self.key)).decode()
+		self.assertEqual(len(stored), 64)
+		self.assertFalse(stored.isdigit())
+
+	def test_otp_is_single_use(self):
+		otp = self.issue_otp()
+		self.assertIs(verify_otp(self.key, "000000"), False)
+		self.assertIs(verify_otp(self.key, otp), True)
+		self.assertIsNone(verify_otp(self.key, otp))
+
+	def test_otp_dropped_after_max_attempts(self):
+		otp = self.issue_otp()
+		for _i in range(MAX_ATTEMPTS):
+			self.assertIs(verify_otp(self.key, "000000"), False)
+
+		self.assertIsNone(verify_otp(self.key, otp))
+
+	def test_send_rate_limit(self):
+		for _i in range(SEND_LIMIT):
+			send_otp(self.key, "9999999999", "Your code is {otp}")
+
+		self.assertRaises(
+			frappe.RateLimitExceededError, send_otp, self.key, "9999999999", "Your code is {otp}"
+		)
+
+	def test_verified_visit_is_marked(self):
+		lead = frappe.get_doc(
+			{"doctype": "Lead", "first_name": "_Test Site Visit Lead", "mobile_no": "9999999999"}
+		).insert()
+		visit = frappe.get_doc(
+			{
+				"doctype": "Site Visit",
+				"lead": lead.name,
+				"project": make_projects(1)[0],
+				"status": "Scheduled",
+			}
+		).insert()
+
+		self.key = f"site_visit_otp:{lead.name}"
+		otp = self.issue_otp()
+		self.assertEqual(flutter_verify_otp(visit.name, "000000"), "failed")
+		self.assertEqual(flutter_verify_otp(visit.name, otp), "success")
+		self.assertEqual(frappe.db.get_value("Site Visit", visit.name, "is_verified"), 1)
@@ -83,7 +83,8 @@ app_license = "mit"
 # ------------
 
 # before_install = "homesol_app.install.before_install"
-# after_install = "homesol_app.install.after_install"
+after_install = "homesol_app.install.after_install"
+after_migrate = "homesol_app.install.make_custom_fields"
 
 # Uninstallation
 # ------------
@@ -133,6 +134,15 @@ app_license = "mit"
 # 	"ToDo": "custom_app.overrides.CustomToDo"
 # }
 
+# Naming
+# ------
+# Check-ins are inserted by every field employee's app at shift start, reserve their
+# series numbers in blocks instead of locking the series row per check-in
+
+naming_series_block_size = {
+	"Employee Checkin": 100,
+}
+
 # Document Events
 # ---------------
 # Hook on document methods and events
@@ -145,6 +155,51 @@ app_license = "mit"
 # 	}
 # }
 
+doc_events = {
+	"Employee": {
+		"on_update": "homesol_app.utils.employee.clear_employee_context",
+		"on_trash": "homesol_app.utils.employee.clear_employee_context",
+		"after_rename": "homesol_app.utils.employee.clear_employee_context",
+	},
+	"Employee Checkin": {
+		"before_insert": "homesol_app.utils.geofence.tag_project_site",
+	},
+	"Shift Location": {
+		"on_update": "homesol_app.utils.geofence.clear_geofence_index",
+		"on_trash": "homesol_app.utils.geofence.clear_geofence_index",
+		"after_rename": "homesol_app.utils.geofence.clear_geofence_index",
+	},
+	"Property Projects": {
+		"on_update": [
+			"homesol_app.utils.response_cache.invalidate",
+			"homesol_app.utils.geofence.clear_geofence_index",
+		],
+		"on_trash": [
+			"homesol_app.utils.response_cache.invalidate",
+			"homesol_app.utils.geofence.clear_geofence_index",
+		],
+		"after_rename": [
+			"homesol_app.utils.response_cache.invalidate",
+			"homesol_app.utils.geofence.clear_geofence_index",
+		],
+	},
+	"Developer": {
+		"on_update": "homesol_app.utils.response_cache.invalidate",
+		"on_trash": "homesol_app.utils.response_cache.invalidate",
+		"after_rename": "homesol_app.utils.response_cache.invalidate",
+	},
+	"Mandate": {
+		"on_update": "homesol_app.utils.response_cache.invalidate",
+		"on_trash": "homesol_app.utils.response_cache.invalidate",
+		"after_rename": "homesol_app.utils.response_cache.invalidate",
+	},
+	"Shift Type": {
+		"on_update": "homesol_app.utils.response_cache.invalidate",
+		"on_trash": "homesol_app.utils.response_cache.invalidate",
+		"after_rename": "homesol_app.utils.response_cache.invalidate",
+	},
+}
+
 # Scheduled Tasks
 # ---------------
 
@@ -0,0 +1,27 @@
+# Copyright (c) 2025, homesol_team and contributors
+# For license information, please see license.txt
+
+from frappe.custom.doctype.custom_field.custom_field import create_custom_fields
+
+from homesol_app.utils.geofence import PROJECT_SITE_FIELD
+
+
+def after_install():
+	make_custom_fields()
+
+
+def make_custom_fields():
+	create_custom_fields(
+		{
+			"Employee Checkin": [
+				{
+					"fieldname": PROJECT_SITE_FIELD,
+					"label": "Project Site",
+					"fieldtype": "Link",
+					"options": "Property Projects",
+					"insert_after": "device_id",
+					"read_only": 1,
+				}
+			]
+		}
+	)
@@ -0,0 +1,169 @@
+# Copyright (c) 2025, homesol_team and Contributors
+# See license.txt
+
+import frappe
+from erpnext.setup.doctype.employee.test_employee import make_employee
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_months, add_to_date, now_datetime, nowdate
+from hrms.hr.doctype.leave_allocation.test_leave_allocation import create_leave_allocation
+from hrms.hr.doctype.leave_application.leave_application import get_leave_balance_on
+from hrms.hr.doctype.leave_type.test_leave_type import create_leave_type
+
+from homesol_app.api.hrms import HOME_SCREEN_SECTIONS, get_department_leave_balances, get_home_screen
+from homesol_app.utils.checkin import get_processed_keys, ingest_checkins
+from homesol_app.utils.employee import EMPLOYEE_CONTEXT_CACHE, get_employee_context
+from homesol_app.utils.leave_balance import get_leave_balances
+
+
+class TestEmployeeContext(FrappeTestCase):
+	def setUp(self):
+		self.user = "test_employee_context@example.com"
+		self.employee = make_employee(self.user)
+		frappe.cache.hdel(EMPLOYEE_CONTEXT_CACHE, self.user)
+
+	def test_context_is_cached(self):
+		context = get_employee_context(self.user)
+		self.assertEqual(context.name, self.employee)
+
+		with self.assertQueryCount(0):
+			self.assertEqual(get_employee_context(self.user), context)
+
+		self.assertIsNone(get_employee_context("Guest"))
+
+	def test_context_cleared_after_commit(self):
+		get_employee_context(self.user)
+		employee = frappe.get_doc("Employee", self.employee)
+		employee.save()
+
+		# cleared only once the change is committed
+		self.assertTrue(frappe.cache.hget(EMPLOYEE_CONTEXT_CACHE, self.user))
+		frappe.db.after_commit.run()
+		self.assertIsNone(frappe.cache.hget(EMPLOYEE_CONTEXT_CACHE, self.user))
+
+	def test_context_cleared_on_rename(self):
+		get_employee_context(self.user)
+		frappe.rename_doc("Employee", self.employee, f"{self.employee}-renamed", force=True)
+		frappe.db.after_commit.run()
+
+		self.assertEqual(get_employee_context(self.user).name, f"{self.employee}-renamed")
+
+
+class TestLeaveBalances(FrappeTestCase):
+	def setUp(self):
+		self.leave_type = create_leave_type(leave_type_name="_Test Homesol Leave").name
+		self.employees = [make_employee(f"test_leave_balance_{i}@example.com") for i in range(2)]
+		for employee, leaves in zip(self.employees, (10, 4), strict=True):
+			create_leave_allocation(
+				employee=employee,
+				leave_type=self.leave_type,
+				from_date=add_months(nowdate(), -1),
+				to_date=add_months(nowdate(), 11),
+				new_leaves_allocated=leaves,
+			).submit()
+
+	def test_leave_balances(self):
+		balances = get_leave_balances(self.employees)
+		self.assertEqual(set(balances), set(self.employees))
+
+		for employee, leaves in zip(self.employees, (10, 4), strict=True):
+			balance = next(row for row in balances[employee] if row["leave_type"] == self.leave_type)
+			self.assertEqual(balance["allocated"], leaves)
+			self.assertEqual(balance["used"], 0)
+			self.assertEqual(balance["pending"], 0)
+			self.assertEqual(balance["remaining"], leaves)
+			self.assertEqual(balance["remaining"], get_leave_balance_on(employee, self.leave_type, nowdate()))
+
+		self.assertEqual(get_leave_balances([]), {})
+
+	def test_leave_balances_query_count(self):
+		# float precision, ledger totals per allocation period and pending applications
+		with self.assertQueryCount(3):
+			get_leave_balances(self.employees)
+
+	def test_department_leave_balances(self):
+		department = frappe.db.get_value("Employee", self.employees[0], "department")
+		balances = get_department_leave_balances(department)["balances"]
+		self.assertTrue(set(self.employees[:1]).issubset(balances))
+
+	def test_department_leave_balances_permission(self):
+		department = frappe.db.get_value("Employee", self.employees[0], "department")
+
+		# employees can read the leave ledger, but not other employees' balances
+		frappe.set_user("test_leave_balance_1@example.com")
+		self.addCleanup(frappe.set_user, "Administrator")
+		self.assertRaises(frappe.PermissionError, get_department_leave_balances, department)
+
+
+class TestHomeScreen(FrappeTestCase):
+	def setUp(self):
+		self.user = "test_home_screen@example.com"
+		self.employee = make_employee(self.user)
+		frappe.set_user(self.user)
+		self.addCleanup(frappe.set_user, "Administrator")
+
+	def test_home_screen(self):
+		response = get_home_screen()
+		self.assertEqual(response["status"], "success")
+
+		data = response["data"]
+		self.assertEqual(data["employee"], self.employee)
+		self.assertEqual(set(data), {"version", "employee", *HOME_SCREEN_SECTIONS})
+		self.assertEqual(
+			data["profile"].department, frappe.db.get_value("Employee", self.employee, "department")
+		)
+		self.assertIsInstance(data["attendance"], list)
+		self.assertIsInstance(data["leave_balance"], list)
+
+	def test_home_screen_sections(self):
+		data = get_home_screen(sections="profile,leave_balance")["data"]
+		self.assertEqual(set(data), {"version", "employee", "profile", "leave_balance"})
+
+		data = get_home_screen(sections='["holidays"]')["data"]
+		self.assertEqual(set(data), {"version", "employee", "holidays"})
+
+		self.assertRaises(frappe.ValidationError, get_home_screen, sections="payroll")
+
+	def test_home_screen_without_employee(self):
+		frappe.set_user("Administrator")
+		self.assertEqual(get_home_screen()["status"], "error")
+
+
+class TestCheckinIngestion(FrappeTestCase):
+	def setUp(self):
+		self.employee = make_employee("test_checkin_ingestion@example.com")
+		self.prefix = frappe.generate_hash(length=8)
+		start = add_to_date(now_datetime(), hours=-3).replace(microsecond=0)
+		self.punches = [
+			{
+				"idempotency_key": f"{self.prefix}-{i}",
+				"log_type": "IN" if i % 2 == 0 else "OUT",
+				"time": str(add_to_date(start, minutes=i)),
+			}
+			for i in range(4)
+		]
+
+	def test_batch_is_idempotent(self):
+		results = ingest_checkins(self.employee, self.punches)
+		self.assertEqual({result.status for result in results}, {"created"})
+		frappe.db.after_commit.run()
+
+		replayed = ingest_checkins(self.employee, self.punches)
+		self.assertEqual({result.status for result in replayed}, {"duplicate"})
+		self.assertEqual([result.name for result in replayed], [result.name for result in results])
+
+	def test_keys_stored_after_commit(self):
+		ingest_checkins(self.employee, self.punches)
+		keys = [punch["idempotency_key"] for punch in self.punches]
+
+		self.assertEqual(get_processed_keys(self.employee, keys), {})
+		frappe.db.after_commit.run()
+		self.assertEqual(len(get_processed_keys(self.employee, keys)), len(keys))
+
+	def test_invalid_punches_fail_alone(self):
+		self.punches[1]["time"] = "not a time"
+		self.punches[2]["log_type"] = "BREAK"
+		self.punches[3]["time"] = str(add_to_date(now_datetime(), hours=1))
+
+		results = ingest_checkins(self.employee, self.punches)
+		self.assertEqual([result.status for result in results], ["created", "error", "error", "error"])
+		self.assertTrue(all(result.message for result in results[1:]))
@@ -0,0 +1,63 @@
+# Copyright (c) 2025, homesol_team and contributors
+# For license information, please see license.txt
+
+from collections import defaultdict
+
+import frappe
+from frappe.model.utils import is_virtual_doctype
+
+
+def get_docs_as_dict(doctype, filters=None, order_by=None):
+	"""Return `frappe.get_doc(doctype, name).as_dict()` for every matching record.
+
+	Parents are fetched in one query and each child table in one more query
+	(grouped by `parent`), instead of one `get_doc` per row.
+	"""
+	parents = frappe.get_all(doctype, filters=filters, fields=["*"], order_by=order_by)
+	return rows_as_dict(doctype, parents)
+
+
+def rows_as_dict(doctype, parents):
+	"""Attach all child tables to `parents` (full rows) and return their `as_dict()` payloads."""
+	attach_child_tables(doctype, parents)
+	return [frappe.get_doc(dict(parent, doctype=doctype)).as_dict() for parent in parents]
+
+
+def attach_child_tables(doctype, parents, fieldnames=None):
+	"""Set child rows on each parent row in place, one query per child table.
+
+	:param fieldnames: table fields to load, all table fields if not set.
+	"""
+	if not parents:
+		return parents
+
+	names = [parent.name for parent in parents]
+	for df in frappe.get_meta(doctype).get_table_fields():
+		if fieldnames is not None and df.fieldname not in fieldnames:
+			continue
+
+		children_by_parent = get_child_rows(doctype, df, names)
+		for parent in parents:
+			parent[df.fieldname] = children_by_parent.get(parent.name, [])
+
+	return parents
+
+
+def get_child_rows(parenttype, df, names):
+	"""Return rows of the child table `df` for all `names`, keyed by parent."""
+	if is_virtual_doctype(df.options):
+		return {}
+
+	rows = frappe.db.get_values(
+		df.options,
+		{"parent": ("in", names), "parenttype": parenttype, "parentfield": df.fieldname},
+		"*",
+		as_dict=True,
+		order_by="idx asc",
+	)
+
+	children_by_parent = defaultdict(list)
+	for row in rows:
+		children_by_parent[row.parent].append(row)
+
+	return children_by_parent
@@ -0,0 +1,274 @@
+# Copyright (c) 2025, homesol_team and contributors
+# For license information, please see license.txt
+
+from datetime import timedelta
+from functools import partial
+
+import frappe
+from frappe import _
+from frappe.model.naming import set_new_name
+from frappe.utils import add_days, get_datetime, now_datetime
+from hrms.hr.doctype.employee_checkin.employee_checkin import CheckinRadiusExceededError
+from hrms.hr.doctype.shift_assignment.shift_assignment import (
+	get_exact_shift,
+	get_shift_details,
+	get_shift_for_time,
+)
+from hrms.hr.utils import get_distance_between_coordinates, validate_active_employee
+
+from homesol_app.utils.geofence import get_geofence_index, tag_project_site
+
+IDEMPOTENCY_CACHE = "homesol_checkin_idempotency"
+IDEMPOTENCY_TTL = 30 * 24 * 60 * 60
+MAX_BATCH_SIZE = 500
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
+
+def ingest_checkins(employee, punches):
+	"""Insert a batch of queued punches for `employee` and return a status per punch.
+
+	Each punch is a dict with `idempotency_key`, `log_type`, `time` (client
+	timestamp) and optionally `latitude`, `longitude`, `device_id` and
+	`device_type`. Replayed keys and punches that already exist for the same
+	time and log type are reported as duplicates with the existing log's name.
+
+	Shift assignments for the whole batch are fetched once
+	and the new logs are written with a single multi-row insert. This applies
+	the same rules as `EmployeeCheckin.validate`, but controller and doc event
+	hooks of Employee Checkin are not run.
+	"""
+	if len(punches) > MAX_BATCH_SIZE:
+		frappe.throw(_("A batch can contain at most {0} punches").format(MAX_BATCH_SIZE))
+
+	validate_active_employee(employee)
+
+	results, valid = [], []
+	for punch in punches:
+		result = frappe._dict(idempotency_key=punch.get("idempotency_key"), status="error")
+		results.append(result)
+		try:
+			valid.append((result, parse_punch(punch)))
+		except frappe.ValidationError as e:
+			result.message = str(e)
+
+	seen = get_processed_keys(employee, [result.idempotency_key for result, punch in valid])
+	seen_logs = get_existing_logs(employee, [punch.time for result, punch in valid])
+
+	employee_name = frappe.db.get_value("Employee", employee, "employee_name")
+	resolver = ShiftResolver(employee, [punch.time for result, punch in valid])
+	docs = []
+	for result, punch in valid:
+		name = seen.get(result.idempotency_key) or seen_logs.get((punch.time, punch.log_type))
+		if name:
+			result.update(status="duplicate", name=name)
+			continue
+
+		try:
+			doc = make_checkin(employee, employee_name, punch, resolver)
+		except frappe.ValidationError as e:
+			result.message = str(e)
+			continue
+
+		result.update(status="created", name=doc.name)
+		seen[result.idempotency_key] = seen_logs[(punch.time, punch.log_type)] = doc.name
+		docs.append(doc)
+
+	if docs:
+		insert_checkins(docs)
+		# keys of a batch that is rolled back must not report its punches as duplicates on retry
+		created = {r.idempotency_key: r.name for r in results if r.status == "created"}
+		frappe.db.after_commit.add(partial(set_processed_keys, employee, created))
+
+	return results
+
+
+def parse_punch(punch):
+	if not punch.get("idempotency_key"):
+		frappe.throw(_("Idempotency key is required"))
+
+	if punch.get("log_type") not in ("IN", "OUT"):
+		frappe.throw(_("Log Type must be IN or OUT"))
+
+	if not punch.get("time"):
+		frappe.throw(_("Time is required"))
+
+	try:
+		time = get_datetime(punch["time"]).replace(microsecond=0)
+	except (ValueError, TypeError, OverflowError):
+		frappe.throw(_("Invalid time {0}").format(punch["time"]))
+
+	if time > now_datetime() + MAX_CLOCK_SKEW:
+		frappe.throw(_("Punch time {0} is in the future").format(time))
+
+	return frappe._dict(punch, time=time)
+
+
+def make_checkin(employee, employee_name, punch, resolver):
+	doc = frappe.new_doc("Employee Checkin")
+	doc.update(
+		{
+			"employee": employee,
+			"employee_name": employee_name,
+			"log_type": punch.log_type,
+			"time": punch.time,
+			"latitude": punch.latitude,
+			"longitude": punch.longitude,
+			"device_id": punch.device_id,
+		}
+	)
+	if punch.device_type and doc.meta.has_field("custom_device_type"):
+		doc.custom_device_type = punch.device_type
+
+	resolver.set_shift(doc)
+	resolver.validate_distance(doc)
+	doc.set_geolocation()
+	tag_project_site(doc)
+
+	set_new_name(doc)
+	doc.owner = doc.modified_by = frappe.session.user
+	doc.creation = doc.modified = now_datetime()
+	return doc
+
+
+def insert_checkins(docs):
+	rows = [doc.get_valid_dict(convert_dates_to_str=True) for doc in docs]
+	fields = list(rows[0])
+	frappe.db.bulk_insert("Employee Checkin", fields, [[row.get(f) for f in fields] for row in rows])
+
+
+def get_existing_logs(employee, times):
+	"""Return names of logs already recorded at `times`, keyed by (time, log type)."""
+	if not times:
+		return {}
+
+	logs = frappe.get_all(
+		"Employee Checkin",
+		filters={"employee": employee, "time": ("in", list(set(times)))},
+		fields=["name", "time", "log_type"],
+	)
+	return {(log.time, log.log_type): log.name for log in logs}
+
+
+def get_processed_keys(employee, keys):
+	"""Return names of logs created earlier for idempotency `keys`."""
+	if not keys:
+		return {}
+
+	names = frappe.cache.hmget(get_idempotency_key(employee), keys)
+	return {key: name.decode() for key, name in zip(keys, names, strict=True) if name}
+
+
+def set_processed_keys(employee, names):
+	cache_key = get_idempotency_key(employee)
+	pipeline = frappe.cache.pipeline()
+	pipeline.hset(cache_key, mapping=names)
+	pipeline.expire(cache_key, IDEMPOTENCY_TTL)
+	pipeline.execute()
+
+
+def get_idempotency_key(employee):
+	return frappe.cache.make_key(f"{IDEMPOTENCY_CACHE}:{employee}")
+
+
+class ShiftResolver:
+	"""Resolves shifts and shift locations for many timestamps of one employee.
+
+	Mirrors `EmployeeCheckin.fetch_shift` and `validate_distance_from_shift_location`,
+	with every Shift Assignment in the batch's date range loaded up front and
+	shift locations read from the geofence index instead of queried per log.
+	"""
+
+	def __init__(self, employee, times):
+		self.employee = employee
+		self.default_shift = frappe.db.get_value("Employee", employee, "default_shift", cache=True)
+		self.geolocation_tracking = frappe.db.get_single_value("HR Settings", "allow_geolocation_tracking")
+		self.assignments = self.get_assignments(times) if times else []
+		self.locations = self.get_locations()
+
+	def get_assignments(self, times):
+		assignment = frappe.qb.DocType("Shift Assignment")
+		return (
+			frappe.qb.from_(assignment)
+			.select(
+				assignment.name,
+				assignment.shift_type,
+				assignment.start_date,
+				assignment.end_date,
+				assignment.shift_location,
+			)
+			.where(
+				(assignment.employee == self.employee)
+				& (assignment.docstatus == 1)
+				& (assignment.status == "Active")
+				& (assignment.start_date <= add_days(max(times).date(), 1))
+				& (assignment.end_date.isnull() | (assignment.end_date >= add_days(min(times).date(), -1)))
+			)
+		).run(as_dict=True)
+
+	def get_locations(self):
+		if not self.geolocation_tracking:
+			return {}
+
+		index = get_geofence_index()
+		locations = (index.get("Shift Location", d.shift_location) for d in self.assignments)
+		return {location["name"]: location for location in locations if location}
+
+	def get_shift(self, for_timestamp):
+		prev_day, next_day = add_days(for_timestamp.date(), -1), add_days(for_timestamp.date(), 1)
+		assignments = [
+			d
+			for d in self.assignments
+			if d.start_date <= next_day and (not d.end_date or prev_day <= d.end_date)
+		]
+
+		shift = get_shift_for_time(assignments, for_timestamp) if assignments else {}
+		if not shift and self.default_shift:
+			shift = get_exact_shift([get_shift_details(self.default_shift, for_timestamp)], for_timestamp)
+
+		return shift
+
+	def set_shift(self, doc):
+		shift = self.get_shift(doc.time)
+		if not shift:
+			doc.shift = None
+			doc.offshift = 1
+			return
+
+		doc.offshift = 0
+		doc.shift = shift.shift_type.name
+		doc.shift_actual_start = shift.actual_start
+		doc.shift_actual_end = shift.actual_end
+		doc.shift_start = shift.start_datetime
+		doc.shift_end = shift.end_datetime
+
+	def validate_distance(self, doc):
+		if not self.geolocation_tracking:
+			return
+
+		if not (doc.latitude or doc.longitude):
+			frappe.throw(_("Latitude and longitude values are required for checking in."))
+
+		location = next(
+			(
+				self.locations[d.shift_location]
+				for d in self.assignments
+				if d.shift_type == doc.shift
+				and d.shift_location in self.locations
+				and d.start_date <= doc.time.date()
+				and (not d.end_date or d.end_date >= doc.time.date())
+			),
+			None,
+		)
+		if not location or location["radius"] <= 0:
+			return
+
+		distance = get_distance_between_coordinates(
+			location["latitude"], location["longitude"], doc.latitude, doc.longitude
+		)
+		if distance > location["radius"]:
+			frappe.throw(
+				_("You must be within {0} meters of your shift location to check in.").format(
+					location["radius"]
+				),
+				exc=CheckinRadiusExceededError,
+			)
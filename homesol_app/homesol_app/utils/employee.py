@@ -0,0 +1,48 @@
+# Copyright (c) 2025, homesol_team and contributors
+# For license information, please see license.txt
+
+from functools import partial
+
+import frappe
+
+EMPLOYEE_CONTEXT_CACHE = "homesol_employee_context"
+EMPLOYEE_CONTEXT_FIELDS = ["name", "company", "holiday_list", "department", "default_shift"]
+
+
+def get_employee_context(user=None):
+	"""Return name, company, holiday list, department and default shift of the user's Employee.
+
+	Cached in Redis per user and in `frappe.local.cache` for the rest of the request,
+	cleared by `clear_employee_context` whenever an Employee changes.
+	"""
+	user = user or frappe.session.user
+	if user == "Guest":
+		return None
+
+	context = frappe.cache.hget(EMPLOYEE_CONTEXT_CACHE, user, generator=lambda: load_employee_context(user))
+	return frappe._dict(context) if context else None
+
+
+def get_employee_name(user=None):
+	context = get_employee_context(user)
+	return context.name if context else None
+
+
+def load_employee_context(user):
+	# an empty dict is cached for users without an Employee, so they don't query every time
+	return frappe.db.get_value("Employee", {"user_id": user}, EMPLOYEE_CONTEXT_FIELDS, as_dict=True) or {}
+
+
+def clear_employee_context(doc, *args, **kwargs):
+	"""doc_events handler for Employee, drops the context of its current and previous user after commit."""
+	users = {doc.get("user_id")}
+	if doc_before_save := doc.get_doc_before_save():
+		users.add(doc_before_save.get("user_id"))
+
+	# clearing before commit would let concurrent requests cache the old values again
+	frappe.db.after_commit.add(partial(clear_users, [user for user in users if user]))
+
+
+def clear_users(users):
+	for user in users:
+		frappe.cache.hdel(EMPLOYEE_CONTEXT_CACHE, user)
@@ -0,0 +1,204 @@
+# Copyright (c) 2025, homesol_team and contributors
+# For license information, please see license.txt
+
+import json
+import math
+from collections import defaultdict
+from functools import partial
+
+import frappe
+from frappe.utils import flt
+from hrms.hr.utils import get_distance_between_coordinates
+
+GEOFENCE_VERSION_CACHE = "homesol_geofence_index_version"
+CELL_SIZE = 0.01  # degrees, about 1.1 km of latitude
+METERS_PER_DEGREE = 111_320
+PROJECT_SITE_RADIUS = 500  # meters
+PROJECT_SITE_FIELD = "custom_project_site"
+TAG_BATCH_SIZE = 5000
+
+
+class GeofenceIndex:
+	"""Grid index of allowed check-in locations.
+
+	Every location is registered in each grid cell its radius overlaps, so a
+	lookup only has to measure the few locations registered in the cell of the
+	point being checked, however many locations there are.
+	"""
+
+	def __init__(self, locations):
+		self.locations = {}
+		self.cells = defaultdict(list)
+		for location in locations:
+			self.add(location)
+
+	def add(self, location):
+		"""Register a `{"doctype", "name", "latitude", "longitude", "radius"}` location."""
+		key = (location["doctype"], location["name"])
+		self.locations[key] = location
+
+		lat, lng, radius = location["latitude"], location["longitude"], location["radius"]
+		lat_span = radius / METERS_PER_DEGREE
+		lng_span = radius / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+
+		for i in range(cell_of(lat - lat_span), cell_of(lat + lat_span) + 1):
+			for j in range(cell_of(lng - lng_span), cell_of(lng + lng_span) + 1):
+				self.cells[(i, j)].append(key)
+
+	def get(self, doctype, name):
+		return self.locations.get((doctype, name))
+
+	def nearest(self, latitude, longitude, doctype=None):
+		"""Return `(location, distance)` of the closest location covering the point, or `(None, None)`."""
+		match, match_distance = None, None
+		for key in self.cells.get((cell_of(latitude), cell_of(longitude)), ()):
+			location = self.locations[key]
+			if doctype and location["doctype"] != doctype:
+				continue
+
+			distance = get_distance_between_coordinates(
+				location["latitude"], location["longitude"], latitude, longitude
+			)
+			if distance <= location["radius"] and (match_distance is None or distance < match_distance):
+				match, match_distance = location, distance
+
+		return match, match_distance
+
+
+def cell_of(degrees):
+	return math.floor(degrees / CELL_SIZE)
+
+
+# site -> (version, index), built once per process
+_indexes: dict[str, tuple[str, GeofenceIndex]] = {}
+
+
+def get_geofence_index():
+	"""Return the site's geofence index.
+
+	The index is kept in the process and rebuilt when `clear_geofence_index`
+	changes the version stored in Redis, so a lookup only reads that version.
+	"""
+	version = frappe.cache.get_value(GEOFENCE_VERSION_CACHE, generator=frappe.generate_hash)
+	cached = _indexes.get(frappe.local.site)
+	if cached and cached[0] == version:
+		return cached[1]
+
+	index = build_geofence_index()
+	_indexes[frappe.local.site] = (version, index)
+	return index
+
+
+def build_geofence_index():
+	locations = [
+		{
+			"doctype": "Shift Location",
+			"name": d.name,
+			"latitude": flt(d.latitude),
+			"longitude": flt(d.longitude),
+			"radius": d.checkin_radius,
+		}
+		for d in frappe.get_all(
+			"Shift Location",
+			filters={"latitude": ("is", "set"), "longitude": ("is", "set")},
+			fields=["name", "latitude", "longitude", "checkin_radius"],
+		)
+	]
+
+	for project in frappe.get_all(
+		"Property Projects", filters={"location": ("is", "set")}, fields=["name", "location"]
+	):
+		if coordinates := get_point(project.location):
+			locations.append(
+				{
+					"doctype": "Property Projects",
+					"name": project.name,
+					"latitude": coordinates[1],
+					"longitude": coordinates[0],
+					"radius": PROJECT_SITE_RADIUS,
+				}
+			)
+
+	return GeofenceIndex(locations)
+
+
+def get_point(geolocation):
+	"""Return `[longitude, latitude]` of the first point in a Geolocation field's GeoJSON."""
+	try:
+		features = json.loads(geolocation).get("features") or []
+	except (TypeError, ValueError, AttributeError):
+		return None
+
+	for feature in features:
+		geometry = feature.get("geometry") or {}
+		if geometry.get("type") == "Point":
+			return [flt(value) for value in geometry["coordinates"][:2]]
+
+
+def clear_geofence_index(doc=None, *args, **kwargs):
+	"""doc_events handler for Shift Location and Property Projects, rebuilds the index after commit."""
+	frappe.db.after_commit.add(
+		partial(frappe.cache.set_value, GEOFENCE_VERSION_CACHE, frappe.generate_hash())
+	)
+
+
+def tag_project_site(doc, method=None):
+	"""doc_events handler, sets the project site an Employee Checkin was made at."""
+	if not (doc.latitude and doc.longitude) or not doc.meta.has_field(PROJECT_SITE_FIELD):
+		return
+
+	project, _distance = get_geofence_index().nearest(doc.latitude, doc.longitude, "Property Projects")
+	doc.set(PROJECT_SITE_FIELD, project["name"] if project else None)
+
+
+def tag_checkins(from_date=None, to_date=None):
+	"""Set the project site of existing check-ins that don't have one yet.
+
+	Check-ins are read in batches and written with one UPDATE per project site
+	and batch. Returns the number of tagged check-ins.
+	"""
+	if not frappe.get_meta("Employee Checkin").has_field(PROJECT_SITE_FIELD):
+		return 0
+
+	index = get_geofence_index()
+	filters = {
+		PROJECT_SITE_FIELD: ("is", "not set"),
+		"latitude": ("is", "set"),
+		"longitude": ("is", "set"),
+	}
+	if from_date and to_date:
+		filters["time"] = ("between", (from_date, to_date))
+	elif from_date:
+		filters["time"] = (">=", from_date)
+	elif to_date:
+		filters["time"] = ("<=", to_date)
+
+	tagged, last_name = 0, ""
+	while True:
+		checkins = frappe.get_all(
+			"Employee Checkin",
+			filters={**filters, "name": (">", last_name)},
+			fields=["name", "latitude", "longitude"],
+			order_by="name asc",
+			limit=TAG_BATCH_SIZE,
+		)
+		if not checkins:
+			break
+
+		by_project = defaultdict(list)
+		for checkin in checkins:
+			project, _distance = index.nearest(checkin.latitude, checkin.longitude, "Property Projects")
+			if project:
+				by_project[project["name"]].append(checkin.name)
+
+		Checkin = frappe.qb.DocType("Employee Checkin")
+		for project, names in by_project.items():
+			frappe.qb.update(Checkin).set(Checkin[PROJECT_SITE_FIELD], project).where(
+				Checkin.name.isin(names)
+			).run()
+			tagged += len(names)
+
+		frappe.db.commit()
+		last_name = checkins[-1].name
+
+	return tagged
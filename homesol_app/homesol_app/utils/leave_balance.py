@@ -0,0 +1,136 @@
+# Copyright (c) 2025, homesol_team and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.query_builder.functions import Max, Min, Sum
+from frappe.query_builder.terms import Case
+from frappe.utils import cint, flt, getdate, today
+
+
+def get_leave_balances(employees, date=None):
+	"""Return the leave balance of every leave type for one or many employees.
+
+	Balances come from the Leave Ledger Entry model HRMS maintains for each
+	submitted allocation, application, encashment and expiry, for the allocation
+	period running on `date`. Each ledger bucket (allocated, used, encashed,
+	expired) is summed by one grouped query and pending applications by one
+	more, regardless of the number of employees and leave types.
+
+	Returns `{employee: [{"leave_type", "from_date", "to_date", "allocated", "used",
+	"encashed", "expired", "pending", "remaining"}, ...]}`.
+	"""
+	if isinstance(employees, str):
+		employees = [employees]
+
+	if not employees:
+		return {}
+
+	date = getdate(date or today())
+	precision = cint(frappe.db.get_single_value("System Settings", "float_precision")) or 2
+
+	allocation = get_allocation_periods(employees, date)
+	pending = get_pending_leaves(allocation)
+
+	balances = {employee: [] for employee in employees}
+	for row in get_ledger_totals(allocation):
+		row.pending = pending.get((row.employee, row.leave_type), 0)
+		row.remaining = row.allocated - row.used - row.encashed - row.expired
+
+		balances[row.employee].append(
+			{
+				"leave_type": row.leave_type,
+				"from_date": row.from_date,
+				"to_date": row.to_date,
+				**{
+					key: flt(row[key], precision)
+					for key in ("allocated", "used", "encashed", "expired", "pending", "remaining")
+				},
+			}
+		)
+
+	return balances
+
+
+def get_allocation_periods(employees, date):
+	"""Return a sub query with the allocation period per employee and leave type running on `date`."""
+	Ledger = frappe.qb.DocType("Leave Ledger Entry")
+
+	return (
+		frappe.qb.from_(Ledger)
+		.select(
+			Ledger.employee,
+			Ledger.leave_type,
+			Min(Ledger.from_date).as_("from_date"),
+			Max(Ledger.to_date).as_("to_date"),
+		)
+		.where(
+			Ledger.employee.isin(employees)
+			& (Ledger.docstatus == 1)
+			& (Ledger.transaction_type == "Leave Allocation")
+			& (Ledger.is_expired == 0)
+			& (Ledger.is_lwp == 0)
+			& (Ledger.from_date <= date)
+			& (Ledger.to_date >= date)
+		)
+		.groupby(Ledger.employee, Ledger.leave_type)
+	).as_("allocation")
+
+
+def get_ledger_totals(allocation):
+	Ledger = frappe.qb.DocType("Leave Ledger Entry")
+
+	def total(condition, sign=1):
+		return Sum(Case().when(condition, sign * Ledger.leaves).else_(0))
+
+	is_allocation = Ledger.transaction_type == "Leave Allocation"
+
+	return (
+		frappe.qb.from_(allocation)
+		.inner_join(Ledger)
+		.on(
+			(Ledger.employee == allocation.employee)
+			& (Ledger.leave_type == allocation.leave_type)
+			& (Ledger.docstatus == 1)
+			& (Ledger.from_date >= allocation.from_date)
+			& (Ledger.to_date <= allocation.to_date)
+		)
+		.select(
+			allocation.employee,
+			allocation.leave_type,
+			allocation.from_date,
+			allocation.to_date,
+			total(is_allocation & (Ledger.is_expired == 0) & (Ledger.leaves > 0)).as_("allocated"),
+			total(Ledger.transaction_type == "Leave Application", -1).as_("used"),
+			total(Ledger.transaction_type == "Leave Encashment", -1).as_("encashed"),
+			total(is_allocation & (Ledger.is_expired == 1), -1).as_("expired"),
+		)
+		.groupby(allocation.employee, allocation.leave_type, allocation.from_date, allocation.to_date)
+		.orderby(allocation.employee)
+		.orderby(allocation.leave_type)
+	).run(as_dict=True)
+
+
+def get_pending_leaves(allocation):
+	"""Return open leave applications within each allocation period, keyed by (employee, leave type)."""
+	LeaveApplication = frappe.qb.DocType("Leave Application")
+
+	pending = (
+		frappe.qb.from_(allocation)
+		.inner_join(LeaveApplication)
+		.on(
+			(LeaveApplication.employee == allocation.employee)
+			& (LeaveApplication.leave_type == allocation.leave_type)
+			& (LeaveApplication.status == "Open")
+			& (LeaveApplication.docstatus < 2)
+			& (LeaveApplication.from_date <= allocation.to_date)
+			& (LeaveApplication.to_date >= allocation.from_date)
+		)
+		.select(
+			allocation.employee,
+			allocation.leave_type,
+			Sum(LeaveApplication.total_leave_days).as_("leaves"),
+		)
+		.groupby(allocation.employee, allocation.leave_type)
+	).run(as_dict=True)
+
+	return {(d.employee, d.leave_type): flt(d.leaves) for d in pending}
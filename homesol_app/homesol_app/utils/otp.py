@@ -0,0 +1,135 @@
+# Copyright (c) 2025, homesol_team and contributors
+# For license information, please see license.txt
+
+import hashlib
+import hmac
+import secrets
+import time
+
+import frappe
+from frappe import _
+from frappe.utils.password import get_encryption_key
+
+OTP_CACHE = "homesol_otp"
+OTP_LENGTH = 6
+OTP_TTL = 600  # seconds
+MAX_ATTEMPTS = 5  # wrong guesses before the OTP is dropped
+SEND_LIMIT = 3  # OTPs sent per key within SEND_WINDOW
+SEND_WINDOW = 15 * 60  # seconds
+SMS_SENDER_HOOK = "homesol_otp_sms_sender"
+DEFAULT_SMS_SENDER = "frappe.core.doctype.sms_settings.sms_settings.send_sms"
+
+
+def send_otp(key, mobile_no, message):
+	"""Generate an OTP for `key` and queue an SMS with it to `mobile_no`.
+
+	`key` identifies what is being verified (e.g. `site_visit_otp:<lead>`) and
+	`message` is formatted with `otp`. Only a keyed hash of the OTP is kept in
+	Redis, it expires after OTP_TTL and allows MAX_ATTEMPTS guesses. Sending is
+	limited to SEND_LIMIT OTPs per key within a sliding SEND_WINDOW.
+
+	The SMS is sent by a background job through the last method registered for
+	the `homesol_otp_sms_sender` hook, SMS Settings' `send_sms` by default (a
+	custom sender takes the same `receiver_list, msg, success_msg` arguments). In
+	developer mode the OTP is also shown in a message for testing.
+	"""
+	check_send_limit(key)
+
+	otp = "".join(secrets.choice("0123456789") for i in range(OTP_LENGTH))
+	pipeline = frappe.cache.pipeline()
+	pipeline.setex(get_cache_key(key), OTP_TTL, hash_otp(key, otp))
+	pipeline.delete(get_attempts_key(key))
+	pipeline.execute()
+
+	frappe.enqueue(
+		"homesol_app.utils.otp.send_sms",
+		queue="short",
+		enqueue_after_commit=True,
+		mobile_no=mobile_no,
+		message=message.format(otp=otp),
+	)
+
+	if frappe.conf.developer_mode:
+		frappe.msgprint(f"<b>DEBUG MODE:</b><br>Sending to: <b>{mobile_no}</b><br>OTP: <b>{otp}</b>")
+
+
+def verify_otp(key, otp):
+	"""Return True if `otp` matches the pending OTP of `key` and consume it.
+
+	Returns None if no OTP is pending (never sent, expired, used or dropped
+	after too many wrong attempts) and False for a wrong OTP.
+	"""
+	cache_key, attempts_key = get_cache_key(key), get_attempts_key(key)
+
+	pipeline = frappe.cache.pipeline()
+	pipeline.get(cache_key)
+	pipeline.incr(attempts_key)
+	pipeline.expire(attempts_key, OTP_TTL)
+	otp_hash, attempts, _expire = pipeline.execute()
+
+	if not otp_hash:
+		return None
+
+	if attempts > MAX_ATTEMPTS:
+		frappe.cache.delete(cache_key, attempts_key)
+		return None
+
+	if not otp or not hmac.compare_digest(otp_hash.decode(), hash_otp(key, str(otp).strip())):
+		return False
+
+	# a concurrent request may have consumed the same OTP, only one delete wins
+	consumed = frappe.cache.delete(cache_key)
+	frappe.cache.delete(attempts_key)
+	return bool(consumed)
+
+
+def check_send_limit(key):
+	"""Throw `frappe.RateLimitExceededError` if SEND_LIMIT OTPs were sent to `key` within SEND_WINDOW.
+
+	Send times are kept in a sorted set, so the window slides with every
+	request instead of resetting at fixed intervals like `frappe.rate_limiter`.
+	"""
+	cache_key = frappe.cache.make_key(f"{OTP_CACHE}_sent:{key}")
+	now = time.time()
+
+	pipeline = frappe.cache.pipeline()
+	pipeline.zremrangebyscore(cache_key, 0, now - SEND_WINDOW)
+	pipeline.zrange(cache_key, 0, 0, withscores=True)
+	pipeline.zcard(cache_key)
+	_removed, oldest, sent = pipeline.execute()
+
+	if sent >= SEND_LIMIT:
+		retry_after = int(oldest[0][1] + SEND_WINDOW - now) + 1
+		frappe.throw(
+			_("Too many OTP requests. Please try again in {0} seconds.").format(retry_after),
+			frappe.RateLimitExceededError,
+		)
+
+	pipeline = frappe.cache.pipeline()
+	pipeline.zadd(cache_key, {secrets.token_hex(8): now})
+	pipeline.expire(cache_key, SEND_WINDOW)
+	pipeline.execute()
+
+
+def hash_otp(key, otp):
+	return hmac.new(get_encryption_key().encode(), f"{key}:{otp}".encode(), hashlib.sha256).hexdigest()
+
+
+def get_cache_key(key):
+	return frappe.cache.make_key(f"{OTP_CACHE}:{key}")
+
+
+def get_attempts_key(key):
+	return frappe.cache.make_key(f"{OTP_CACHE}_attempts:{key}")
+
+
+def send_sms(mobile_no, message):
+	"""Background job, sends an OTP SMS through the configured sender."""
+	senders = frappe.get_hooks(SMS_SENDER_HOOK)
+	sender = frappe.get_attr(senders[-1] if senders else DEFAULT_SMS_SENDER)
+
+	try:
+		sender([mobile_no], message, success_msg=False)
+	except Exception:
+		frappe.log_error(title="OTP Send Error")
+		raise
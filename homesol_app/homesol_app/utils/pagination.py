@@ -0,0 +1,119 @@
+# Copyright (c) 2025, homesol_team and contributors
+# For license information, please see license.txt
+
+import base64
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import cint, get_datetime, get_datetime_str
+from werkzeug.wrappers import Response
+
+from homesol_app.utils.bulk import attach_child_tables, rows_as_dict
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+
+def get_page(doctype, cursor=None, limit=None, fields=None):
+	"""Return one page of `doctype` ordered by `(modified, name)`.
+
+	Without `fields` every row is the full `as_dict()` payload. With `fields`
+	only those columns (plus `name` and `modified`) and table fields are returned.
+	Pass the returned `next_cursor` back to fetch the following page.
+	"""
+	limit = min(cint(limit) or DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT)
+	columns, table_fields = get_projection(doctype, fields)
+
+	after = decode_cursor(cursor) if cursor else None
+	rows = get_keyset_query(doctype, columns, after).limit(limit + 1).run(as_dict=True)
+
+	next_cursor = None
+	if len(rows) > limit:
+		rows = rows[:limit]
+		next_cursor = encode_cursor(rows[-1])
+
+	if columns is None:
+		data = rows_as_dict(doctype, rows)
+	else:
+		data = attach_child_tables(doctype, rows, table_fields)
+
+	return {"data": data, "next_cursor": next_cursor}
+
+
+def stream_ndjson(doctype, cursor=None, fields=None):
+	"""Return a response streaming every row after `cursor` as newline delimited JSON.
+
+	Rows are read through an unbuffered cursor while the response is being sent,
+	so memory use does not grow with the table. Child tables are not included.
+	"""
+	columns, table_fields = get_projection(doctype, fields)
+	if table_fields:
+		frappe.throw(_("Child tables can not be streamed, fetch them with paginated requests"))
+
+	query = get_keyset_query(doctype, columns, decode_cursor(cursor) if cursor else None)
+
+	def generate():
+		with frappe.db.unbuffered_cursor():
+			for row in query.run(as_dict=True, as_iterator=True):
+				yield frappe.as_json(row, indent=None, separators=(",", ":")) + "\n"
+
+	return Response(generate(), mimetype="application/x-ndjson")
+
+
+def get_keyset_query(doctype, columns=None, after=None):
+	"""Return a query over `doctype` ordered by `(modified, name)`, starting after the `after` key."""
+	table = frappe.qb.DocType(doctype)
+	query = (
+		frappe.qb.from_(table)
+		.select(*([table[column] for column in columns] if columns else [table.star]))
+		.orderby(table.modified)
+		.orderby(table.name)
+	)
+
+	if after:
+		modified, name = after
+		query = query.where(
+			(table.modified > modified) | ((table.modified == modified) & (table.name > name))
+		)
+
+	return query
+
+
+def get_projection(doctype, fields=None):
+	"""Split requested `fields` into parent columns and table fieldnames.
+
+	Returns `(None, None)` when no projection is requested.
+	"""
+	if not fields:
+		return None, None
+
+	if isinstance(fields, str):
+		fields = frappe.parse_json(fields)
+
+	meta = frappe.get_meta(doctype)
+	valid_columns = meta.get_valid_columns()
+	table_fieldnames = [df.fieldname for df in meta.get_table_fields()]
+
+	invalid_fields = [f for f in fields if f not in valid_columns and f not in table_fieldnames]
+	if invalid_fields:
+		frappe.throw(_("Invalid fields for {0}: {1}").format(_(doctype), ", ".join(invalid_fields)))
+
+	columns = ["name", "modified"] + [
+		f for f in fields if f in valid_columns and f not in ("name", "modified")
+	]
+	return columns, [f for f in fields if f in table_fieldnames]
+
+
+def encode_cursor(row):
+	"""Return an opaque cursor pointing after `row`."""
+	key = json.dumps([get_datetime_str(row.modified), row.name])
+	return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def decode_cursor(cursor):
+	try:
+		modified, name = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+		return get_datetime(modified), name
+	except Exception:
+		frappe.throw(_("Invalid cursor"))
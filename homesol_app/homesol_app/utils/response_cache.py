@@ -0,0 +1,151 @@
+# Copyright (c) 2025, homesol_team and contributors
+# For license information, please see license.txt
+
+import hashlib
+import json
+import time
+from functools import partial, wraps
+
+import frappe
+from frappe.utils.response import json_handler
+from werkzeug.wrappers import Response
+
+CACHE_PREFIX = "homesol_response"
+LOCK_TIMEOUT = 30  # seconds a worker may hold the rebuild lock
+LOCK_POLL_INTERVAL = 0.05
+
+# delete the lock only if it still holds our token, it may have expired and been taken by another worker
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+	return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def cached_response(doctype, ttl=3600):
+	"""Cache the serialized response of a whitelisted method in Redis.
+
+	The entry is dropped by `invalidate` whenever a `doctype` document changes,
+	which needs a matching `doc_events` entry in hooks.py. Child rows are saved
+	with their parent, so child tables need no entries of their own.
+	Responses carry an ETag so clients can revalidate with If-None-Match, and
+	only one worker rebuilds an entry at a time.
+
+	Only the HTTP call of the method itself gets the cached response, other
+	callers run the method and get its return value.
+
+	Usage:
+	        @frappe.whitelist(allow_guest=True)
+	        @cached_response("Property Projects")
+	        def get_all_projects():
+	                ...
+	"""
+
+	def decorator(func):
+		func_key = f"{func.__module__}.{func.__qualname__}"
+
+		@wraps(func)
+		def wrapper(*args, **kwargs):
+			if not is_http_call(func_key):
+				return func(*args, **kwargs)
+
+			key = get_cache_key(func_key, doctype)
+			entry = get_entry(key, partial(func, *args, **kwargs), ttl)
+			return make_response(entry)
+
+		return wrapper
+
+	return decorator
+
+
+def is_http_call(func_key):
+	"""Whether the current request is a call of the whitelisted method `func_key`."""
+	return bool(getattr(frappe.local, "request", None)) and frappe.form_dict.get("cmd") == func_key
+
+
+def get_cache_key(func_key, doctype):
+	"""Return the cache key of `func_key`, tagged with every DocType it is built from."""
+	doctypes = [doctype] + [df.options for df in frappe.get_meta(doctype).get_table_fields()]
+	return f"{CACHE_PREFIX}::{func_key}::|{'|'.join(doctypes)}|"
+
+
+def get_entry(key, build, ttl):
+	"""Return the cached entry for `key`, rebuilding it in at most one worker.
+
+	Expired entries keep being served to other workers while the lock holder
+	rebuilds them; on a cold miss the other workers wait for the rebuild.
+	"""
+	entry = frappe.cache.get_value(key, expires=True)
+	if entry and entry["expires_at"] > time.time():
+		return entry
+
+	if token := acquire_lock(key):
+		try:
+			entry = make_entry(build(), ttl)
+			# keep serving the stale copy for another ttl while it is rebuilt
+			frappe.cache.set_value(key, entry, expires_in_sec=2 * ttl)
+			return entry
+		finally:
+			release_lock(key, token)
+
+	if entry:
+		return entry
+
+	deadline = time.time() + LOCK_TIMEOUT
+	while time.time() < deadline:
+		time.sleep(LOCK_POLL_INTERVAL)
+		if entry := frappe.cache.get_value(key, expires=True):
+			return entry
+
+	return make_entry(build(), ttl)
+
+
+def make_entry(data, ttl):
+	body = json.dumps({"message": data}, default=json_handler, separators=(",", ":"))
+	return {
+		"body": body,
+		"etag": f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"',
+		"expires_at": time.time() + ttl,
+	}
+
+
+def make_response(entry):
+	if entry["etag"] in get_if_none_match():
+		response = Response(status=304)
+	else:
+		response = Response(entry["body"], mimetype="application/json")
+
+	response.headers["ETag"] = entry["etag"]
+	response.headers["Cache-Control"] = "no-cache"
+	return response
+
+
+def get_if_none_match():
+	header = frappe.request.headers.get("If-None-Match") or ""
+	return [etag.strip().removeprefix("W/") for etag in header.split(",")]
+
+
+def acquire_lock(key):
+	"""Return a token to release the lock with, None if another worker holds it."""
+	token = frappe.generate_hash()
+	if frappe.cache.set(get_lock_key(key), token, nx=True, ex=LOCK_TIMEOUT):
+		return token
+
+
+def release_lock(key, token):
+	frappe.cache.eval(RELEASE_LOCK_SCRIPT, 1, get_lock_key(key), token)
+
+
+def get_lock_key(key):
+	# kept outside CACHE_PREFIX so that invalidation never drops a held lock
+	return frappe.cache.make_key(key.replace(CACHE_PREFIX, f"{CACHE_PREFIX}_lock", 1))
+
+
+def invalidate(doc, *args, **kwargs):
+	"""doc_events handler, drops cached responses built from `doc.doctype` after commit."""
+	frappe.db.after_commit.add(partial(clear_cache, doc.doctype))
+
+
+def clear_cache(doctype):
+	frappe.cache.delete_keys(f"{CACHE_PREFIX}::*|{doctype}|")
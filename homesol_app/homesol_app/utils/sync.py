@@ -0,0 +1,114 @@
+# Copyright (c) 2025, homesol_team and contributors
+# For license information, please see license.txt
+
+import base64
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import cint, get_datetime, get_datetime_str
+
+from homesol_app.utils.bulk import rows_as_dict
+from homesol_app.utils.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, get_keyset_query
+
+SYNC_DOCTYPES = ("Property Projects", "Developer", "Mandate", "Channel Partner")
+
+
+def get_changes(tokens=None, limit=None):
+	"""Return rows of every sync DocType changed or deleted since the client's token.
+
+	`tokens` maps DocType to the `token` returned by the previous sync, DocTypes
+	without a token are sent in full. Child tables are saved along with their
+	parent (which bumps the parent's `modified`), so changed rows always carry
+	their complete child tables. Clients should apply `deleted` before `upserted`
+	and call again while `has_more` is set.
+	"""
+	tokens = frappe.parse_json(tokens) if isinstance(tokens, str) else (tokens or {})
+	limit = min(cint(limit) or DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT)
+
+	changes = {}
+	for doctype in SYNC_DOCTYPES:
+		changes[doctype] = get_doctype_changes(doctype, tokens.get(doctype), limit)
+
+	return changes
+
+
+def get_doctype_changes(doctype, token=None, limit=DEFAULT_PAGE_LIMIT):
+	modified_after, deleted_after = decode_token(token) if token else (None, None)
+
+	rows = get_keyset_query(doctype, after=modified_after).limit(limit + 1).run(as_dict=True)
+	deleted = get_deletions(doctype, deleted_after, limit + 1)
+	has_more = len(rows) > limit or len(deleted) > limit
+	rows, deleted = rows[:limit], deleted[:limit]
+
+	if rows:
+		modified_after = (rows[-1].modified, rows[-1].name)
+	if deleted:
+		deleted_after = (deleted[-1].creation, deleted[-1].name)
+	elif not token:
+		# nothing was deleted yet, start tracking deletions from now on
+		deleted_after = get_latest_deletion(doctype)
+
+	return {
+		"upserted": rows_as_dict(doctype, rows),
+		"deleted": [d.deleted_name for d in deleted],
+		"token": encode_token(modified_after, deleted_after),
+		"has_more": has_more,
+	}
+
+
+def get_deletions(doctype, after=None, limit=None):
+	"""Return `Deleted Document` tombstones of `doctype` ordered by `(creation, name)`."""
+	if after is None:
+		# a full sync only contains existing rows
+		return []
+
+	table = frappe.qb.DocType("Deleted Document")
+	query = (
+		frappe.qb.from_(table)
+		.select(table.name, table.creation, table.deleted_name)
+		.where(table.deleted_doctype == doctype)
+		.orderby(table.creation)
+		.orderby(table.name)
+		.limit(limit)
+	)
+
+	if after:
+		creation, name = after
+		query = query.where(
+			(table.creation > creation) | ((table.creation == creation) & (table.name > name))
+		)
+
+	return query.run(as_dict=True)
+
+
+def get_latest_deletion(doctype):
+	latest = frappe.db.get_value(
+		"Deleted Document",
+		{"deleted_doctype": doctype},
+		["creation", "name"],
+		order_by="creation desc, name desc",
+	)
+	return tuple(latest) if latest else ()
+
+
+def encode_token(modified_after=None, deleted_after=None):
+	"""Return an opaque high-water mark for the next sync."""
+	positions = [encode_position(modified_after), encode_position(deleted_after)]
+	return base64.urlsafe_b64encode(json.dumps(positions).encode()).decode()
+
+
+def encode_position(position):
+	if not position:
+		return []
+
+	timestamp, name = position
+	return [get_datetime_str(timestamp), name]
+
+
+def decode_token(token):
+	try:
+		positions = json.loads(base64.urlsafe_b64decode(token.encode()))
+		return tuple((get_datetime(p[0]), p[1]) if p else () for p in positions)
+	except Exception:
+		frappe.throw(_("Invalid sync token"))